@@ -0,0 +1,89 @@
+"""
+pytest-benchmark Front End for the Toolbox Benchmarks
+
+Runs the cases of run_benchmarks.py as pytest-benchmark tests. Each case is
+timed with the benchmark fixture and fails when its best time exceeds the
+baseline in baseline.json by more than the threshold stored with it.
+
+Unlike run_benchmarks.py, every case runs in the same interpreter.
+
+Example:
+    python -m pytest benchmarks --max-faces 100000
+    python -m pytest benchmarks -k hysteresis --save-baseline
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict
+
+import pytest
+
+from run_benchmarks import (
+    DEFAULT_BASELINE, DEFAULT_THRESHOLD, FAST_CALL_S, FAST_CALL_THRESHOLD, MESH_FACES, collect_benchmarks,
+    load_baseline, machine_info, save_baseline,
+)
+
+
+class BaselineCheck:
+    """Results of the session and the baseline they are compared with."""
+
+    def __init__(self, path: str, save: bool, threshold):
+        self.path = path
+        self.save = save
+        self.threshold = threshold
+        self.baseline = load_baseline(path)
+        self.results: Dict[str, Dict[str, float]] = {}
+        self.thresholds: Dict[str, float] = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("toolbox benchmarks")
+    group.addoption("--max-faces", type=int, default=MESH_FACES[-1],
+                    help=f"Largest generated OBJ mesh in faces (default: {MESH_FACES[-1]})")
+    group.addoption("--mesh-dir", help="Keep generated meshes in this directory and reuse them")
+    group.addoption("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON (default: benchmarks/baseline.json)")
+    group.addoption("--save-baseline", action="store_true",
+                    help="Write the results into the baseline, keeping entries that were not run")
+    group.addoption("--threshold", type=float, default=None,
+                    help=f"Allowed slowdown stored with saved results (default: {DEFAULT_THRESHOLD}, "
+                         f"{FAST_CALL_THRESHOLD} for calls under {FAST_CALL_S * 1e6:.0f} µs)")
+
+
+def pytest_configure(config):
+    mesh_dir = config.getoption("--mesh-dir")
+    config.toolbox_mesh_tmp = None if mesh_dir else tempfile.mkdtemp(prefix="toolbox_meshes_")
+    config.toolbox_mesh_dir = mesh_dir or config.toolbox_mesh_tmp
+    os.makedirs(config.toolbox_mesh_dir, exist_ok=True)
+    config.toolbox_baseline = BaselineCheck(config.getoption("--baseline"), config.getoption("--save-baseline"),
+                                            config.getoption("--threshold"))
+
+
+def pytest_unconfigure(config):
+    if getattr(config, "toolbox_mesh_tmp", None):
+        shutil.rmtree(config.toolbox_mesh_tmp, ignore_errors=True)
+
+
+def pytest_generate_tests(metafunc):
+    if "case" in metafunc.fixturenames:
+        config = metafunc.config
+        cases = collect_benchmarks(config.getoption("--max-faces"), config.toolbox_mesh_dir)
+        metafunc.parametrize("case", cases, ids=[case.name for case in cases])
+
+
+@pytest.fixture(scope="session")
+def baseline_check(pytestconfig) -> BaselineCheck:
+    return pytestconfig.toolbox_baseline
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    check = getattr(config, "toolbox_baseline", None)
+    if check is None or not check.results:
+        return
+    if check.save:
+        save_baseline(check.path, check.results, check.thresholds)
+        terminalreporter.write_line(f"Baseline written to {check.path}")
+    elif machine_info() != check.baseline.get("machine", machine_info()):
+        terminalreporter.write_line("Note: the baseline was recorded on a different machine or environment",
+                                    file=sys.stderr)
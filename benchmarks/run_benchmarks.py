@@ -0,0 +1,477 @@
+"""
+Benchmarks for the Toolbox Hot Paths
+
+Times the hot path of every tool on fixed-seed synthetic inputs and compares
+the results with a JSON baseline:
+
+- MechScalerApp.load_data and the draw_canvas projection: scaling_model.load_obj
+  and project on generated OBJ meshes of 1k to 5M faces
+- the Auto-Fit Skeleton button without a cached grid: skeleton_fit.fit_skeleton
+- the model measurement in MechScalerApp.prepare_model: mesh_measure.measure_mesh
+- Export Slices: mesh_slicer.scaled_layers at 60 cm in 9.6 mm layers
+- Export Bricks: brick_voxels.voxelize_bricks at 60 cm in 3.2 mm plate layers
+- one orbit view frame: mesh_render.MeshRenderer.render at 60 cm, 450 x 700 px
+- the skeleton update of every joint drag: scaling_model.Skeleton positions,
+  bone lengths and limb label text for the default rig and 1000 joints
+- TensileSpecimen.get_profile_coordinates and stress_distribution (the math of
+  TensileAnalyzer.plot_stress_distribution)
+- calculate_hysteresis_loop
+- the chain radius solvers solve_chain_radius and solve_chain_radii
+- bridge_response and WheatstoneBridgeApp.update_calculations (offscreen Qt;
+  skipped if PyQt6 is not installed)
+
+Each benchmark runs in a fresh interpreter, so its timing does not depend on
+which benchmarks ran before it (allocator state, caches), and reports the
+best and median time per call over several rounds. A benchmark regresses
+when its best time exceeds the baseline by more than the threshold stored
+with it. The same cases run as pytest-benchmark tests from conftest.py and
+test_benchmarks.py, against the same baseline.
+
+Example:
+    python benchmarks/run_benchmarks.py --max-faces 100000
+    python benchmarks/run_benchmarks.py --save-baseline
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolbox_core.bridge_model import BridgeConfig, bridge_response, QUARTER_BRIDGE, HALF_BRIDGE, FULL_BRIDGE  # noqa: E402
+from toolbox_core.chain_model import ChainDimensions, chain_lengths_counts, solve_chain_radius, solve_chain_radii  # noqa: E402
+from toolbox_core.hysteresis_model import calculate_hysteresis_loop, params_from_sliders  # noqa: E402
+from toolbox_core.scaling_model import (  # noqa: E402
+    DEFAULT_BONES, DEFAULT_SKELETON_RATIOS, STUD_MM, Skeleton, load_obj, model_bounds, project, sample_edges,
+    scale_factor,
+)
+from toolbox_core.skeleton_fit import fit_skeleton  # noqa: E402
+from toolbox_core.mesh_measure import measure_mesh  # noqa: E402
+from toolbox_core.mesh_slicer import scaled_layers  # noqa: E402
+from toolbox_core.brick_voxels import voxelize_bricks  # noqa: E402
+from toolbox_core.mesh_render import MeshRenderer, orbit_matrix  # noqa: E402
+from toolbox_core.specimen_model import TensileSpecimen, GeometricProperties, MaterialProperties  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+SEED = 1234
+MESH_FACES = (1_000, 10_000, 100_000, 1_000_000, 5_000_000)
+DEFAULT_THRESHOLD = 0.25
+# Calls faster than FAST_CALL_S are dominated by timer and scheduler noise
+FAST_CALL_S = 100e-6
+FAST_CALL_THRESHOLD = 0.5
+# Default timing: up to ROUNDS rounds of at least MIN_ROUND_S each, no new round after MAX_CASE_S
+ROUNDS = 7
+MIN_ROUND_S = 0.05
+MAX_CASE_S = 10.0
+
+
+@dataclass
+class Benchmark:
+    """
+    One timed case. setup() prepares the inputs and returns the callable to time,
+    or None to skip the case (e.g. an optional dependency is missing).
+    """
+    name: str
+    setup: Callable[[], Optional[Callable[[], object]]]
+    threshold: float = DEFAULT_THRESHOLD
+
+
+def torus_mesh(n_faces: int, seed: int = SEED) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Triangulated, slightly noisy torus with about n_faces faces: vertices (n, 3)
+    in mm-like model units (Y up) and 0-based triangle indices (m, 3).
+    """
+    cols = max(int(math.sqrt(n_faces / 2)), 3)
+    rows = max(n_faces // (2 * cols), 3)
+    u = np.linspace(0, 2 * np.pi, rows, endpoint=False)[:, None]
+    v = np.linspace(0, 2 * np.pi, cols, endpoint=False)[None, :]
+    ring = 100.0 + 30.0 * np.cos(v)
+    vertices = np.stack(np.broadcast_arrays(ring * np.cos(u), 30.0 * np.sin(v) + 30.0, ring * np.sin(u)), axis=-1)
+    vertices = vertices.reshape(-1, 3) + np.random.default_rng(seed).normal(0.0, 0.5, (rows * cols, 3))
+
+    i = np.arange(rows)[:, None]
+    j = np.arange(cols)[None, :]
+    a = i * cols + j
+    b = ((i + 1) % rows) * cols + j
+    c = ((i + 1) % rows) * cols + (j + 1) % cols
+    d = i * cols + (j + 1) % cols
+    faces = np.concatenate([np.stack([a, b, c], axis=-1).reshape(-1, 3), np.stack([a, c, d], axis=-1).reshape(-1, 3)])
+    return vertices, faces
+
+
+def write_obj(path: str, vertices: np.ndarray, faces: np.ndarray) -> None:
+    with open(path, "w") as f:
+        np.savetxt(f, vertices, fmt="v %.5f %.5f %.5f")
+        np.savetxt(f, faces + 1, fmt="f %d %d %d")
+
+
+def mesh_file(mesh_dir: str, n_faces: int) -> str:
+    """Path of the generated OBJ mesh with n_faces faces, written on first use."""
+    path = os.path.join(mesh_dir, f"torus_{n_faces}_seed{SEED}.obj")
+    if not os.path.exists(path):
+        write_obj(path, *torus_mesh(n_faces))
+    return path
+
+
+def size_label(n: int) -> str:
+    for div, suffix in ((1_000_000, "M"), (1_000, "k")):
+        if n >= div and n % div == 0:
+            return f"{n // div}{suffix}"
+    return str(n)
+
+
+def scaler_benchmarks(max_faces: int, mesh_dir: str) -> List[Benchmark]:
+    benchmarks = []
+    for n in (n for n in MESH_FACES if n <= max_faces):
+        def load_setup(n=n):
+            path = mesh_file(mesh_dir, n)
+
+            # Same steps as MechScalerApp.load_data
+            def load_data():
+                vertices, edges = load_obj(path)
+                model_bounds(vertices)
+                return sample_edges(edges, 5000, np.random.default_rng(SEED))
+            return load_data
+
+        def project_setup(n=n, view="side"):
+            vertices, _ = torus_mesh(n)
+            mins, maxs = model_bounds(vertices)
+            scale = scale_factor(600.0, mins, maxs)
+            return lambda: project(vertices, view, mins, maxs, scale, 0.5, 100.0, 750.0)
+
+        def fit_setup(n=n):
+            vertices, faces = torus_mesh(n)
+            return lambda: fit_skeleton(vertices, faces)
+
+        def measure_setup(n=n):
+            vertices, faces = torus_mesh(n)
+            return lambda: measure_mesh(vertices, faces)
+
+        def slice_setup(n=n):
+            vertices, faces = torus_mesh(n)
+            return lambda: scaled_layers(vertices, faces, 600.0)
+
+        def bricks_setup(n=n):
+            vertices, faces = torus_mesh(n)
+            return lambda: voxelize_bricks(vertices, faces, 600.0)
+
+        def render_setup(n=n):
+            # The orbit pane of MechScalerApp at its default size, 60 cm and rotation
+            vertices, faces = torus_mesh(n)
+            mins, maxs = model_bounds(vertices)
+            renderer = MeshRenderer(vertices, faces, closed=True)
+            matrix = orbit_matrix(30.0, 20.0)
+            scale = scale_factor(600.0, mins, maxs)
+            return lambda: renderer.render(matrix, 450, 700, scale * 0.5, opacity=0.5)
+
+        benchmarks.append(Benchmark(f"scaling_model.load_obj[{size_label(n)} faces]", load_setup))
+        for view in ("side", "front"):
+            benchmarks.append(Benchmark(f"scaling_model.project[{view}, {size_label(n)} faces]",
+                                        lambda n=n, view=view: project_setup(n, view)))
+        benchmarks.append(Benchmark(f"skeleton_fit.fit_skeleton[{size_label(n)} faces]", fit_setup))
+        benchmarks.append(Benchmark(f"mesh_measure.measure_mesh[{size_label(n)} faces]", measure_setup))
+        benchmarks.append(Benchmark(f"mesh_slicer.scaled_layers[{size_label(n)} faces]", slice_setup))
+        benchmarks.append(Benchmark(f"brick_voxels.voxelize_bricks[{size_label(n)} faces]", bricks_setup))
+        benchmarks.append(Benchmark(f"mesh_render.render[{size_label(n)} faces]", render_setup))
+
+    def skeleton_setup(joints):
+        # The default rig, or a chain of joints at random ratios
+        if joints == len(DEFAULT_SKELETON_RATIOS):
+            skeleton = Skeleton(DEFAULT_SKELETON_RATIOS, DEFAULT_BONES)
+        else:
+            rng = np.random.default_rng(SEED)
+            skeleton = Skeleton({f"J{i}": tuple(rng.random(3)) for i in range(joints)},
+                                [(f"B{i}", f"J{i}", f"J{i + 1}") for i in range(joints - 1)])
+        mins, maxs = np.zeros(3), np.array([2.0, 1.0, 0.5])
+        scale = scale_factor(600.0, mins, maxs)
+
+        # Same steps as MechScalerApp.update_skeleton
+        def update():
+            bone_mm = skeleton.lengths(skeleton.positions(mins, maxs)) * scale
+            return "".join(f"{bone}: {mm/10:.1f}cm ({mm/STUD_MM:.1f}s)\n"
+                           for bone, mm in zip(skeleton.bone_names, bone_mm.tolist()))
+        return update
+
+    for joints in (len(DEFAULT_SKELETON_RATIOS), 1000):
+        benchmarks.append(Benchmark(f"scaling_model.Skeleton[{joints} joints]", lambda joints=joints: skeleton_setup(joints)))
+    return benchmarks
+
+
+def specimen_benchmarks() -> List[Benchmark]:
+    specimen = TensileSpecimen(GeometricProperties(), MaterialProperties())
+    benchmarks = []
+    for points in (200, 10_000):
+        benchmarks.append(Benchmark(f"TensileSpecimen.get_profile_coordinates[{points}]",
+                                    lambda points=points: lambda: specimen.get_profile_coordinates(points)))
+        benchmarks.append(Benchmark(f"TensileSpecimen.stress_distribution[{points}]",
+                                    lambda points=points: lambda: specimen.stress_distribution(50000.0, points)))
+    return benchmarks
+
+
+def hysteresis_benchmarks() -> List[Benchmark]:
+    Ms, Hc, a, k = params_from_sliders(7, 500, 1000, 200)
+    return [
+        Benchmark(f"calculate_hysteresis_loop[{points}]",
+                  lambda points=points: lambda: calculate_hysteresis_loop(Ms, Hc, a, k, num_points=points))
+        for points in (200, 10_000)
+    ]
+
+
+def chain_benchmarks() -> List[Benchmark]:
+    dims = ChainDimensions()
+    lengths, counts = chain_lengths_counts(22, 6.35, 6.35, dims)
+
+    def radii_setup(n=100_000):
+        rng = np.random.default_rng(SEED)
+        batch_lengths = np.column_stack([np.full(n, lengths[0]), rng.uniform(3.0, 20.0, n), rng.uniform(3.0, 20.0, n)])
+        batch_counts = np.column_stack([rng.integers(10, 200, n), np.ones(n), np.ones(n)])
+        return lambda: solve_chain_radii(batch_lengths, batch_counts)
+
+    return [
+        Benchmark("solve_chain_radius[22 links]", lambda: lambda: solve_chain_radius(lengths, counts)),
+        Benchmark("solve_chain_radii[100k configurations]", radii_setup),
+    ]
+
+
+def bridge_benchmarks() -> List[Benchmark]:
+    benchmarks = []
+    for label, active in (("quarter", QUARTER_BRIDGE), ("half", HALF_BRIDGE), ("full", FULL_BRIDGE)):
+        config = BridgeConfig(active_gauges=active, shunt_connected=True, lead_resistance=0.5)
+        benchmarks.append(Benchmark(f"bridge_response[{label}, shunt]",
+                                    lambda config=config: lambda: bridge_response(0.001, config)))
+
+    def app_setup():
+        try:
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+            from PyQt6.QtWidgets import QApplication
+        except ImportError:
+            return None
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+        spec = importlib.util.spec_from_file_location(
+            "wheatstone_bridge", os.path.join(ROOT, "wheatstone_bridge", "wheatstone_bridge.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        window = module.WheatstoneBridgeApp()
+        window.strain_percent = 0.1
+
+        def update_calculations(app=app, window=window):
+            window.update_calculations()
+        return update_calculations
+
+    # Includes the label update and repaint scheduling, so it is noisier than the math alone
+    benchmarks.append(Benchmark("WheatstoneBridgeApp.update_calculations", app_setup, threshold=0.5))
+    return benchmarks
+
+
+def collect_benchmarks(max_faces: int, mesh_dir: str) -> List[Benchmark]:
+    return (scaler_benchmarks(max_faces, mesh_dir) + specimen_benchmarks() + hysteresis_benchmarks()
+            + chain_benchmarks() + bridge_benchmarks())
+
+
+def calibrate(fn: Callable[[], object], min_time: float) -> Tuple[int, float]:
+    """Calls per round so that a round takes at least min_time, from one warm-up call, and that call's time."""
+    start = time.perf_counter()
+    fn()
+    warmup = time.perf_counter() - start
+    return (max(1, math.ceil(min_time / warmup)) if warmup > 0 else 1000), warmup
+
+
+def time_call(fn: Callable[[], object], rounds: int, min_time: float, max_time: float) -> Dict[str, float]:
+    """
+    Seconds per call of fn: a warm-up call sizes each round to take at least
+    min_time, then up to rounds rounds run, stopping early after max_time.
+    """
+    number, _ = calibrate(fn, min_time)
+
+    times = []
+    total = 0.0
+    while len(times) < rounds and (not times or total < max_time):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed / number)
+        total += elapsed
+    return {"min": min(times), "median": statistics.median(times), "rounds": len(times), "number": number}
+
+
+def run_one(name: str, args) -> Optional[Dict[str, float]]:
+    """Time one benchmark in this process; None if its setup skips it."""
+    bench = next(b for b in collect_benchmarks(args.max_faces, args.mesh_dir) if b.name == name)
+    # Silences the progress prints of the code under test
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn = bench.setup()
+        if fn is None:
+            return None
+        return time_call(fn, args.rounds, args.min_time, args.max_time)
+
+
+def run_isolated(name: str, args, mesh_dir: str) -> Optional[Dict[str, float]]:
+    """Time one benchmark in a fresh interpreter."""
+    cmd = [sys.executable, os.path.abspath(__file__), "--run-one", name, "--mesh-dir", mesh_dir,
+           "--max-faces", str(args.max_faces), "--rounds", str(args.rounds),
+           "--min-time", str(args.min_time), "--max-time", str(args.max_time)]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{name} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout)
+
+
+def case_threshold(bench: Benchmark, best: float, override: Optional[float] = None) -> float:
+    """Allowed slowdown stored with a result: override, or the case threshold, raised for fast calls."""
+    if override is not None:
+        return override
+    return max(bench.threshold, FAST_CALL_THRESHOLD) if best < FAST_CALL_S else bench.threshold
+
+
+def load_baseline(path: str) -> Dict[str, Dict]:
+    if not os.path.exists(path):
+        return {"machine": {}, "benchmarks": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]], thresholds: Dict[str, float]) -> None:
+    """Merge results into the baseline at path, keeping the entries that were not run."""
+    baseline = load_baseline(path)
+    for name, result in results.items():
+        baseline["benchmarks"][name] = {"min": result["min"], "median": result["median"],
+                                        "threshold": thresholds[name]}
+    baseline["machine"] = machine_info()
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def machine_info() -> Dict[str, str]:
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": str(os.cpu_count()),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, object]]:
+    """Best time of each result relative to its baseline, with a verdict against the baseline threshold."""
+    rows = {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            rows[name] = {"ratio": None, "status": "new"}
+            continue
+        ratio = result["min"] / base["min"]
+        threshold = base.get("threshold", DEFAULT_THRESHOLD)
+        if ratio > 1.0 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1.0 / (1.0 + threshold):
+            status = "faster"
+        else:
+            status = "ok"
+        rows[name] = {"ratio": ratio, "status": status}
+    return rows
+
+
+def format_time(seconds: float) -> str:
+    for scale, unit in ((1.0, "s"), (1e-3, "ms"), (1e-6, "µs")):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def format_report(results: Dict[str, Dict[str, float]], comparison: Dict[str, Dict[str, object]]) -> str:
+    width = max([len(name) for name in results] + [9])
+    lines = [f"{'Benchmark':<{width}} {'Best':>11} {'Median':>11} {'Rounds':>6} {'vs base':>8}  Status"]
+    for name, result in results.items():
+        row = comparison.get(name, {"ratio": None, "status": ""})
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        lines.append(f"{name:<{width}} {format_time(result['min']):>11} {format_time(result['median']):>11} "
+                     f"{result['rounds']:>6} {ratio:>8}  {row['status']}")
+    regressions = sum(row["status"] == "REGRESSION" for row in comparison.values())
+    lines.append(f"{len(results)} benchmarks, {regressions} regressions")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every tool's hot path against a JSON baseline.")
+    parser.add_argument("-k", "--filter", metavar="TEXT", action="append",
+                        help="Only run benchmarks whose name contains TEXT (repeatable)")
+    parser.add_argument("--max-faces", type=int, default=MESH_FACES[-1],
+                        help=f"Largest generated OBJ mesh in faces (default: {MESH_FACES[-1]})")
+    parser.add_argument("--mesh-dir", help="Keep generated meshes in this directory and reuse them")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help=f"Rounds per benchmark (default: {ROUNDS})")
+    parser.add_argument("--min-time", type=float, default=MIN_ROUND_S,
+                        help=f"Minimum round length in s (default: {MIN_ROUND_S})")
+    parser.add_argument("--max-time", type=float, default=MAX_CASE_S,
+                        help=f"Stop adding rounds after this many s per benchmark (default: {MAX_CASE_S:.0f})")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write the results into the baseline, keeping entries that were not run")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help=f"Allowed slowdown stored with saved results (default: {DEFAULT_THRESHOLD}, "
+                             f"{FAST_CALL_THRESHOLD} for calls under {FAST_CALL_S * 1e6:.0f} µs)")
+    parser.add_argument("-o", "--output", help="Also write the results to this JSON file")
+    parser.add_argument("--run-one", metavar="NAME", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_one(args.run_one, args)))
+        return 0
+
+    mesh_dir = args.mesh_dir or tempfile.mkdtemp(prefix="toolbox_meshes_")
+    os.makedirs(mesh_dir, exist_ok=True)
+    try:
+        benchmarks = collect_benchmarks(args.max_faces, mesh_dir)
+        if args.filter:
+            benchmarks = [b for b in benchmarks if any(text in b.name for text in args.filter)]
+
+        results = {}
+        thresholds = {}
+        for bench in benchmarks:
+            result = run_isolated(bench.name, args, mesh_dir)
+            if result is None:
+                print(f"skipped {bench.name}", file=sys.stderr)
+                continue
+            results[bench.name] = result
+            thresholds[bench.name] = case_threshold(bench, result["min"], args.threshold)
+            print(f"{bench.name}: {format_time(result['min'])}", file=sys.stderr)
+    finally:
+        if args.mesh_dir is None:
+            shutil.rmtree(mesh_dir, ignore_errors=True)
+
+    baseline = load_baseline(args.baseline)
+    comparison = compare(results, baseline["benchmarks"])
+    print(format_report(results, comparison))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"machine": machine_info(), "benchmarks": results}, f, indent=2)
+    if args.save_baseline:
+        save_baseline(args.baseline, results, thresholds)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    if machine_info() != baseline.get("machine", machine_info()):
+        print("Note: the baseline was recorded on a different machine or environment", file=sys.stderr)
+    return 1 if any(row["status"] == "REGRESSION" for row in comparison.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+import contextlib
+import io
+import math
+
+import pytest
+
+from run_benchmarks import (
+    DEFAULT_THRESHOLD, MAX_CASE_S, MIN_ROUND_S, ROUNDS, calibrate, case_threshold, compare, format_time,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_hot_path(case, benchmark, baseline_check):
+    # Silences the progress prints of the code under test
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn = case.setup()
+        if fn is None:
+            pytest.skip("optional dependency not installed")
+        # Rounds sized as in run_benchmarks.time_call, so both runners agree with the baseline
+        iterations, warmup = calibrate(fn, MIN_ROUND_S)
+        rounds = min(ROUNDS, max(1, math.ceil(MAX_CASE_S / max(warmup * iterations, 1e-9))))
+        benchmark.pedantic(fn, rounds=rounds, iterations=iterations)
+    if benchmark.disabled:
+        return
+
+    stats = benchmark.stats.stats
+    result = {"min": stats.min, "median": stats.median}
+    baseline_check.results[case.name] = result
+    baseline_check.thresholds[case.name] = case_threshold(case, stats.min, baseline_check.threshold)
+    if baseline_check.save:
+        return
+    row = compare({case.name: result}, baseline_check.baseline["benchmarks"])[case.name]
+    if row["status"] == "REGRESSION":
+        base = baseline_check.baseline["benchmarks"][case.name]
+        pytest.fail(f"{format_time(stats.min)} is {row['ratio']:.2f}x the baseline {format_time(base['min'])} "
+                    f"(threshold {base.get('threshold', DEFAULT_THRESHOLD):.0%})")
@@ -0,0 +1,175 @@
+"""
+Chain Design Table Generator
+
+Headless batch version of the Chainlink Mechanics closure solve. Builds tables
+of inner diameter versus green/red link length for a grid of link counts and
+wire sizes, and exports them as CSV or Parquet.
+
+Example:
+    python chain_tables.py --links 2 200 --green 3 20 0.05 --red 6.35 \\
+        --wire 6.35:6.0:3.0 --wire 8.0:7.5:4.0 -o chain_table.csv
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolbox_core.chain_model import ChainDimensions, inner_diameter_for_green_length  # noqa: E402
+
+
+TABLE_COLUMNS = (
+    "d_standard", "d_interlink", "r_small",
+    "total_links", "l_red", "l_green",
+    "r_chain", "d_inner", "inner_circumference",
+)
+
+
+def design_table(link_counts: Sequence[int], green_lengths: Sequence[float], red_lengths: Sequence[float],
+                 wire_sizes: Sequence[ChainDimensions] = (ChainDimensions(),)) -> Dict[str, np.ndarray]:
+    """
+    Solve the closure for every combination of wire size, link count, red and green length.
+
+    Args:
+        link_counts: Total link counts to tabulate.
+        green_lengths: Green link lengths (mm).
+        red_lengths: Red link lengths (mm).
+        wire_sizes: Link dimension sets to tabulate.
+
+    Returns:
+        dict: Flat column arrays keyed by TABLE_COLUMNS, one row per combination,
+        ordered by wire size, link count, red length then green length.
+        d_inner is NaN where the chain cannot close.
+    """
+    d_standard = np.array([w.d_standard for w in wire_sizes], dtype=float)
+    d_interlink = np.array([w.d_interlink for w in wire_sizes], dtype=float)
+    r_small = np.array([w.r_small for w in wire_sizes], dtype=float)
+
+    # Axes: wire, links, red, green
+    dims = ChainDimensions(
+        d_standard=d_standard[:, None, None, None],
+        d_interlink=d_interlink[:, None, None, None],
+        r_small=r_small[:, None, None, None],
+    )
+    links = np.asarray(link_counts, dtype=float)[None, :, None, None]
+    red = np.asarray(red_lengths, dtype=float)[None, None, :, None]
+    green = np.asarray(green_lengths, dtype=float)[None, None, None, :]
+
+    r_chain, d_inner = inner_diameter_for_green_length(links, green, red, dims)
+    shape = r_chain.shape
+
+    table = {
+        "d_standard": np.broadcast_to(dims.d_standard, shape),
+        "d_interlink": np.broadcast_to(dims.d_interlink, shape),
+        "r_small": np.broadcast_to(dims.r_small, shape),
+        "total_links": np.broadcast_to(links, shape).astype(int),
+        "l_red": np.broadcast_to(red, shape),
+        "l_green": np.broadcast_to(green, shape),
+        "r_chain": r_chain,
+        "d_inner": d_inner,
+        "inner_circumference": d_inner * np.pi,
+    }
+    return {name: np.ravel(table[name]) for name in TABLE_COLUMNS}
+
+
+def _design_table_chunk(args):
+    """Process pool entry point: one chunk of link counts for one wire size."""
+    link_counts, green_lengths, red_lengths, wire = args
+    return design_table(link_counts, green_lengths, red_lengths, [wire])
+
+
+def design_table_parallel(link_counts: Sequence[int], green_lengths: Sequence[float], red_lengths: Sequence[float],
+                          wire_sizes: Sequence[ChainDimensions] = (ChainDimensions(),),
+                          workers: int = None, chunk_links: int = 16) -> Dict[str, np.ndarray]:
+    """
+    design_table spread over a process pool for very large grids.
+
+    The grid is split per wire size and into chunks of chunk_links link counts.
+    Row order matches design_table.
+    """
+    link_counts = list(link_counts)
+    tasks = [
+        (link_counts[i:i + chunk_links], green_lengths, red_lengths, wire)
+        for wire in wire_sizes
+        for i in range(0, len(link_counts), chunk_links)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_design_table_chunk, tasks))
+    return {name: np.concatenate([p[name] for p in parts]) for name in TABLE_COLUMNS}
+
+
+def write_csv(table: Dict[str, np.ndarray], path: str) -> None:
+    """Write a design table as CSV; unsolvable diameters are written as nan."""
+    data = np.column_stack([table[name] for name in TABLE_COLUMNS])
+    fmt = ["%.4f"] * 3 + ["%d"] + ["%.4f"] * 5
+    np.savetxt(path, data, fmt=fmt, delimiter=",", header=",".join(TABLE_COLUMNS), comments="")
+
+
+def write_parquet(table: Dict[str, np.ndarray], path: str) -> None:
+    """Write a design table as Parquet (requires pyarrow)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as err:
+        raise ImportError("Parquet export requires pyarrow: pip install pyarrow") from err
+    pq.write_table(pa.table({name: table[name] for name in TABLE_COLUMNS}), path)
+
+
+def parse_wire(text: str) -> ChainDimensions:
+    """Parse a 'd_standard:d_interlink:r_small' wire size argument."""
+    try:
+        d_standard, d_interlink, r_small = (float(v) for v in text.split(':'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected d_standard:d_interlink:r_small, got '{text}'")
+    return ChainDimensions(d_standard, d_interlink, r_small)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate chain design tables (inner diameter vs link lengths).")
+    parser.add_argument("--links", nargs=2, type=int, default=[2, 200], metavar=("MIN", "MAX"),
+                        help="Inclusive range of total link counts (default: 2 200)")
+    parser.add_argument("--green", nargs=3, type=float, default=[3.0, 20.0, 0.05], metavar=("MIN", "MAX", "STEP"),
+                        help="Green link length range in mm (default: 3 20 0.05)")
+    parser.add_argument("--red", nargs='+', type=float, default=[6.35], metavar="MM",
+                        help="Red link lengths in mm (default: 6.35)")
+    parser.add_argument("--wire", action='append', type=parse_wire, metavar="DS:DI:RS",
+                        help="Wire size as d_standard:d_interlink:r_small in mm; repeat for several (default: 6.35:6.0:3.0)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; more than 1 uses a process pool (default: 1)")
+    parser.add_argument("-o", "--output", default="chain_table.csv",
+                        help="Output file, .csv or .parquet (default: chain_table.csv)")
+    args = parser.parse_args()
+    parquet = os.path.splitext(args.output)[1].lower() == ".parquet"
+    if parquet:
+        # Checked before the table is computed, which can take minutes
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("writing .parquet requires pyarrow: pip install pyarrow")
+
+    link_counts = np.arange(args.links[0], args.links[1] + 1)
+    g_min, g_max, g_step = args.green
+    green_lengths = np.round(np.arange(g_min, g_max + g_step / 2, g_step), 6)
+    wire_sizes: List[ChainDimensions] = args.wire or [ChainDimensions()]
+
+    if args.workers > 1:
+        table = design_table_parallel(link_counts, green_lengths, args.red, wire_sizes, workers=args.workers)
+    else:
+        table = design_table(link_counts, green_lengths, args.red, wire_sizes)
+
+    if parquet:
+        write_parquet(table, args.output)
+    else:
+        write_csv(table, args.output)
+
+    closed = np.count_nonzero(~np.isnan(table["d_inner"]))
+    print(f"Wrote {len(table['d_inner'])} rows ({closed} closed chains) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
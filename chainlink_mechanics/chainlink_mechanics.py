@@ -1,20 +1,44 @@
 
+import argparse
+import os
 import sys
-import numpy as np
-from PyQt6.QtWidgets import (
-    QApplication,
-    QMainWindow,
-    QWidget,
-    QVBoxLayout,
-    QHBoxLayout,
-    QSlider,
-    QLabel,
-    QLineEdit,
-    QGridLayout,
-)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor
-import pyqtgraph as pg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolbox_core.hotpath import HotPathProfiler  # noqa: E402
+from toolbox_core.startup import StartupProfiler  # noqa: E402
+
+STARTUP = StartupProfiler("chainlink_mechanics")
+HOTPATH = HotPathProfiler("chainlink_mechanics")
+
+with STARTUP.phase("import NumPy"):
+    import numpy as np
+with STARTUP.phase("import PyQt6"):
+    from PyQt6.QtWidgets import (
+        QApplication,
+        QMainWindow,
+        QWidget,
+        QVBoxLayout,
+        QHBoxLayout,
+        QSlider,
+        QLabel,
+        QLineEdit,
+        QGridLayout,
+        QCheckBox,
+        QGroupBox,
+        QPushButton,
+        QTableWidget,
+        QTableWidgetItem,
+    )
+    from PyQt6.QtCore import Qt, QTimer
+    from PyQt6.QtGui import QColor
+with STARTUP.phase("import pyqtgraph"):
+    import pyqtgraph as pg
+with STARTUP.phase("import toolbox_core"):
+    from toolbox_core.chain_model import (
+        ChainDimensions, chain_lengths_counts, green_length_for_diameter, solve_chain_radius,
+    )
+    from toolbox_core.chain_geometry import build_chain_geometry
 
 class ChainlinkMechanics(QMainWindow):
     """
@@ -70,16 +94,50 @@ class ChainlinkMechanics(QMainWindow):
         self.inner_circ_box = QLineEdit()
         self.inner_circ_box.setReadOnly(True)
         grid_layout.addWidget(self.inner_circ_box, row, 1); row += 1
+
+        self.animate_checkbox = QCheckBox("Animate Link Count Changes")
+        self.animate_checkbox.setChecked(True)
+        grid_layout.addWidget(self.animate_checkbox, row, 0, 1, 2); row += 1
         
         controls_layout.addLayout(grid_layout)
+
+        # --- Inverse Design: target diameter -> link count and lengths ---
+        design_group = QGroupBox("Inverse Design")
+        design_layout = QGridLayout()
+        design_layout.addWidget(QLabel("Target Inner Diameter (mm):"), 0, 0)
+        self.target_diameter_box = QLineEdit("80.00")
+        design_layout.addWidget(self.target_diameter_box, 0, 1)
+        design_layout.addWidget(QLabel("Tolerance (mm):"), 1, 0)
+        self.target_tolerance_box = QLineEdit("0.10")
+        design_layout.addWidget(self.target_tolerance_box, 1, 1)
+        self.find_designs_btn = QPushButton("Find Designs")
+        design_layout.addWidget(self.find_designs_btn, 2, 0, 1, 2)
+        self.designs_table = QTableWidget(0, 5)
+        self.designs_table.setHorizontalHeaderLabels(["Links", "Red", "Green", "Inner Ø", "Error"])
+        self.designs_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.designs_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.designs_table.verticalHeader().setVisible(False)
+        design_layout.addWidget(self.designs_table, 3, 0, 1, 2)
+        design_group.setLayout(design_layout)
+        self.designs = {}
+        controls_layout.addWidget(design_group)
         controls_layout.addStretch()
 
-        self.n_links_input.editingFinished.connect(lambda: self.recalculate_and_draw(sender="n_links"))
+        # Steps the drawn link count one link per frame towards the entered value
+        self.displayed_links = None
+        self.target_links = None
+        self.link_anim_timer = QTimer(self)
+        self.link_anim_timer.setInterval(30)
+        self.link_anim_timer.timeout.connect(self.step_link_animation)
+
+        self.n_links_input.editingFinished.connect(self.update_from_n_links_input)
         self.inner_diameter_slider.valueChanged.connect(self.update_from_diameter_slider)
         self.inner_diameter_box.editingFinished.connect(self.update_from_diameter_box)
         self.green_len_slider.valueChanged.connect(self.update_from_green_len_slider)
         self.green_len_box.editingFinished.connect(self.update_from_green_len_box)
         self.red_len_box.editingFinished.connect(lambda: self.recalculate_and_draw(sender="diameter"))
+        self.find_designs_btn.clicked.connect(self.find_designs)
+        self.designs_table.cellDoubleClicked.connect(self.apply_design)
 
         self.inner_diameter_slider.setValue(800)
         self.green_len_slider.setValue(635)
@@ -99,6 +157,54 @@ class ChainlinkMechanics(QMainWindow):
         self.inner_circle_item = pg.PlotDataItem(pen={'color': 'y', 'width': 2, 'style': Qt.PenStyle.DashLine})
         self.plot_widget.addItem(self.inner_circle_item)
 
+    def update_from_n_links_input(self):
+        try: target = max(int(self.n_links_input.text()), 2)
+        except ValueError: target = None
+        if target is None or self.displayed_links is None or not self.animate_checkbox.isChecked():
+            self.link_anim_timer.stop()
+            self.recalculate_and_draw(sender="n_links")
+            return
+        self.target_links = target
+        self.link_anim_timer.start()
+
+    def step_link_animation(self):
+        if self.displayed_links == self.target_links:
+            self.link_anim_timer.stop()
+            return
+        step = 1 if self.target_links > self.displayed_links else -1
+        self.n_links_input.setText(str(self.displayed_links + step))
+        self.recalculate_and_draw(sender="n_links")
+
+    def find_designs(self):
+        """Fills the designs table with the Pareto set for the target diameter."""
+        try:
+            target = float(self.target_diameter_box.text())
+            tolerance = abs(float(self.target_tolerance_box.text()))
+        except ValueError: return
+        # The design search is only needed once asked for, so it is not imported at startup
+        from toolbox_core.chain_designer import inverse_design
+        self.designs = inverse_design(target, tolerance)
+
+        rows = len(self.designs["error"])
+        self.designs_table.setRowCount(rows)
+        for i in range(rows):
+            values = [f"{self.designs['total_links'][i]}", f"{self.designs['l_red'][i]:.2f}",
+                      f"{self.designs['l_green'][i]:.2f}", f"{self.designs['d_inner'][i]:.3f}",
+                      f"{self.designs['error'][i]:.3f}"]
+            for j, text in enumerate(values):
+                self.designs_table.setItem(i, j, QTableWidgetItem(text))
+        self.find_designs_btn.setText(f"Find Designs ({rows} found)")
+
+    def apply_design(self, row, column):
+        """Loads a design from the table into the controls."""
+        self.link_anim_timer.stop()
+        self.n_links_input.setText(str(self.designs["total_links"][row]))
+        self.red_len_box.setText(f"{self.designs['l_red'][row]:.2f}")
+        self.green_len_slider.blockSignals(True)
+        self.green_len_slider.setValue(int(round(self.designs["l_green"][row] * 100)))
+        self.green_len_slider.blockSignals(False)
+        self.recalculate_and_draw(sender="green_len")
+
     def update_from_diameter_slider(self, value):
         self.inner_diameter_box.setText(f"{value / 10.0:.2f}")
         self.recalculate_and_draw(sender="diameter")
@@ -125,40 +231,28 @@ class ChainlinkMechanics(QMainWindow):
             self.recalculate_and_draw(sender="green_len")
         except ValueError: pass
 
+    @HOTPATH.handler
     def recalculate_and_draw(self, sender=None):
         try:
             total_links = int(self.n_links_input.text())
             if total_links < 2: total_links = 2; self.n_links_input.setText("2")
         except ValueError: total_links = 22; self.n_links_input.setText("22")
+        self.displayed_links = total_links
         
         n_standard_links = total_links - 2
         if n_standard_links < 0: n_standard_links = 0
 
-        d_standard = 6.35
-        d_interlink = 6.0
-        r_small = 3.0
-        d_interlink = 6.0
-        r_small = 3.0
+        dims = ChainDimensions()
+        d_standard, d_interlink, r_small = dims.d_standard, dims.d_interlink, dims.r_small
         try: l_red = float(self.red_len_box.text())
         except ValueError: l_red = 10.0
         
         if sender == "diameter":
             d_inner = self.inner_diameter_slider.value() / 10.0
-            r_chain = (d_inner / 2.0) + r_small
-            if r_chain > 0:
-                def angle_from_chord(length, R):
-                    ratio = length / (2 * R)
-                    return 2 * np.arcsin(ratio) if ratio <= 1 else float('nan')
-                
-                angle_d_std = angle_from_chord(d_standard, r_chain)
-                angle_l_red = angle_from_chord(l_red, r_chain)
-                angle_d_inter = angle_from_chord(d_interlink, r_chain)
-
-                if any(np.isnan(a) for a in [angle_d_std, angle_l_red, angle_d_inter]):
-                    l_green = -1
-                else:
-                    angle_l_green = 2 * np.pi - (n_standard_links * angle_d_std + angle_l_red + total_links * angle_d_inter)
-                    l_green = 2 * r_chain * np.sin(angle_l_green / 2.0) if angle_l_green > 0 else -1
+            if (d_inner / 2.0) + r_small > 0:
+                with HOTPATH.span("green_length_for_diameter"):
+                    l_green = green_length_for_diameter(d_inner, total_links, l_red, dims)
+                if np.isnan(l_green): l_green = -1
                 
                 self.green_len_slider.blockSignals(True)
                 self.green_len_slider.setValue(int(np.clip(l_green, 3, 20) * 100))
@@ -166,22 +260,11 @@ class ChainlinkMechanics(QMainWindow):
         else: # sender is "green_len" or n_links
             l_green = self.green_len_slider.value() / 100.0
             
-            def get_angle_sum(R):
-                if R <= 0: return float('inf')
-                lengths = [d_standard, l_green, l_red, d_interlink]
-                ratios = [l / (2*R) for l in lengths]
-                if any(r > 1 for r in ratios): return float('inf')
-                angles = [2 * np.arcsin(r) for r in ratios]
-                return n_standard_links * angles[0] + angles[1] + angles[2] + total_links * angles[3]
-
-            low_r = max(d_standard, l_green, l_red, d_interlink) / 2.0
-            high_r = 1000
-            for _ in range(100):
-                mid_r = (low_r + high_r) / 2
-                if mid_r <= 0: break
-                if get_angle_sum(mid_r) > 2 * np.pi: low_r = mid_r
-                else: high_r = mid_r
-            r_chain = (low_r + high_r) / 2
+            with HOTPATH.span("solve_chain_radius"):
+                lengths, counts = chain_lengths_counts(total_links, l_green, l_red, dims)
+                r_chain = solve_chain_radius(lengths, counts)
+            if np.isnan(r_chain): # Chain cannot close; fall back to the tightest radius
+                r_chain = max(d_standard, l_green, l_red, d_interlink) / 2.0
             
             d_inner = (r_chain - r_small) * 2
             self.inner_diameter_slider.blockSignals(True)
@@ -201,58 +284,48 @@ class ChainlinkMechanics(QMainWindow):
         self.standard_circles_plot.clear(); self.green_circles_plot.clear(); self.red_circles_plot.clear()
         self.standard_links_lines.clear(); self.green_link_line.clear(); self.red_link_line.clear()
         
-        def angle(length, R):
-            ratio = length / (2*R)
-            return 2 * np.arcsin(ratio) if R > 0 and ratio <=1 else 0
-
-        angle_d_std = angle(d_standard, r_chain)
-        angle_l_green = angle(l_green_val, r_chain)
-        angle_l_red = angle(l_red, r_chain)
-        angle_d_inter = angle(d_interlink, r_chain)
-
         if l_green_val <= 0 : # Don't draw if geometry is impossible
             return
 
-        red_link_index = total_links // 2
-        circ_t = np.linspace(0, 2 * np.pi, 50)
-        circ_x, circ_y = r_small * np.cos(circ_t), r_small * np.sin(circ_t)
-        
+        # All endpoints, circles and link lines in one vectorized pass
+        with HOTPATH.span("build_chain_geometry"):
+            geometry = build_chain_geometry(total_links, r_chain, l_green_val, l_red, dims)
         plots = {'std': self.standard_circles_plot, 'green': self.green_circles_plot, 'red': self.red_circles_plot}
         lines = {'std': self.standard_links_lines, 'green': self.green_link_line, 'red': self.red_link_line}
-        data = {k: {'x': [], 'y': []} for k in plots}; line_data = {'x': [], 'y': []}
-
-        current_angle = 0
-        for i in range(total_links):
-            p1 = (r_chain * np.cos(current_angle), r_chain * np.sin(current_angle))
-            link_type, ang = 'std', angle_d_std
-            if i == 0: link_type, ang = 'green', angle_l_green
-            elif i == red_link_index: link_type, ang = 'red', angle_l_red
-            current_angle += ang
-            p2 = (r_chain * np.cos(current_angle), r_chain * np.sin(current_angle))
-
-            for p in [p1, p2]:
-                data[link_type]['x'].extend(p[0] + circ_x); data[link_type]['x'].append(np.nan)
-                data[link_type]['y'].extend(p[1] + circ_y); data[link_type]['y'].append(np.nan)
-            
-            if link_type == 'std':
-                line_data['x'].extend([p1[0], p2[0], np.nan]); line_data['y'].extend([p1[1], p2[1], np.nan])
-            else:
-                lines[link_type].setData(x=[p1[0], p2[0]], y=[p1[1], p2[1]])
+        with HOTPATH.span("setData", "plot"):
+            for k, geo in geometry.items():
+                plots[k].setData(x=geo['circles_x'], y=geo['circles_y'])
+                lines[k].setData(x=geo['lines_x'], y=geo['lines_y'], connect='finite')
             
-            current_angle += angle_d_inter
-
-        for k in data: plots[k].setData(x=data[k]['x'], y=data[k]['y'])
-        lines['std'].setData(x=line_data['x'], y=line_data['y'], connect='all')
-        
-        theta = np.linspace(0, 2 * np.pi, 200)
-        self.inner_circle_item.setData(r_inner * np.cos(theta), r_inner * np.sin(theta))
+            theta = np.linspace(0, 2 * np.pi, 200)
+            self.inner_circle_item.setData(r_inner * np.cos(theta), r_inner * np.sin(theta))
 
 def main():
     """Main function to run the application."""
-    app = QApplication(sys.argv)
-    window = ChainlinkMechanics()
+    parser = argparse.ArgumentParser(description="Chainlink Mechanics")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print an import-time and first-paint breakdown, then exit "
+                             "(exit status 1 if time-to-interactive is over budget)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Time compute, plot and paint per update and show a frame-time overlay (F12 toggles it)")
+    parser.add_argument("--trace", metavar="JSON",
+                        help="Instrument and write a Chrome trace-event file on exit")
+    args, qt_args = parser.parse_known_args()
+
+    with STARTUP.phase("QApplication"):
+        app = QApplication(sys.argv[:1] + qt_args)
+    with STARTUP.phase("build window"):
+        window = ChainlinkMechanics()
+    if args.profile_startup:
+        STARTUP.watch_qt(window, app)
+    if args.instrument or args.trace:
+        HOTPATH.attach(window, app, (window.plot_widget,), trace_path=args.trace)
     window.show()
-    sys.exit(app.exec())
+    status = app.exec()
+    if args.profile_startup:
+        window.close()
+        status = STARTUP.finish()
+    sys.exit(status)
 
 if __name__ == "__main__":
     main()
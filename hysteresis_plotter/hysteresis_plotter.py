@@ -1,63 +1,57 @@
 
 import sys
-import numpy as np
-from PyQt6.QtWidgets import (
-    QApplication,
-    QMainWindow,
-    QWidget,
-    QVBoxLayout,
-    QHBoxLayout,
-    QSlider,
-    QLabel,
-    QLineEdit,
-)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor
-import pyqtgraph as pg
-
-def calculate_hysteresis_loop(Ms, Hc, a, k, C_max=-250, T_max=550, num_points=200):
-    """
-    Calculates the x and y coordinates for a stress-strain hysteresis loop using a tanh model.
-
-    Args:
-        Ms (float): Yield strength (peak stress extent).
-        Hc (float): Plastic slip (permanent deformation offset).
-        a (float): Transition sharpness (yielding abruptness).
-        k (float): Elastic compliance (derived from Young's Modulus).
-        C_max (float): Maximum compression stress.
-        T_max (float): Maximum tension stress.
-        num_points (int): Number of points for each branch of the loop.
-
-    Returns:
-        tuple: A tuple containing two numpy arrays (x_loop, y_loop) representing strain and stress.
-    """
-    # Prevent division by zero if 'a' is zero
-    if a == 0:
-        a = 1e-9
+import argparse
+import os
 
-    # Generate the stress values (y-axis) for the two branches
-    y_asc = np.linspace(C_max, T_max, num_points)  # Ascending branch (compression → tension)
-    y_desc = np.linspace(T_max, C_max, num_points) # Descending branch (tension → compression)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-    # Calculate the strain values (x-axis) for each branch
-    x_asc = Ms * np.tanh((y_asc + Hc) / a) + k * y_asc  # Loading curve
-    x_desc = Ms * np.tanh((y_desc - Hc) / a) + k * y_desc  # Unloading curve
+from toolbox_core.hotpath import HotPathProfiler  # noqa: E402
+from toolbox_core.startup import StartupProfiler  # noqa: E402
 
-    # Concatenate the branches to form a closed loop
-    x_loop = np.concatenate([x_asc, x_desc])
-    y_loop = np.concatenate([y_asc, y_desc])
+STARTUP = StartupProfiler("hysteresis_plotter")
+HOTPATH = HotPathProfiler("hysteresis_plotter")
 
-    return x_loop, y_loop
+with STARTUP.phase("import PyQt6"):
+    from PyQt6.QtWidgets import (
+        QApplication,
+        QMainWindow,
+        QWidget,
+        QVBoxLayout,
+        QHBoxLayout,
+        QSlider,
+        QLabel,
+        QLineEdit,
+        QCheckBox,
+    )
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtGui import QColor
+with STARTUP.phase("import pyqtgraph + NumPy"):
+    import pyqtgraph as pg
+with STARTUP.phase("import toolbox_core"):
+    from toolbox_core.hysteresis_model import calculate_hysteresis_loop, params_from_sliders, LoopCache
+
+# Slider offsets used for the ghost overlays of neighbouring parameter values
+GHOST_OFFSETS = {
+    "ms": (-2, -1, 1, 2),
+    "hc": (-100, -50, 50, 100),
+    "a": (-200, -100, 100, 200),
+    "e": (-40, -20, 20, 40),
+}
 
 class HysteresisPlotter(QMainWindow):
     """
     A PyQt application that displays a hysteresis loop with interactive sliders.
     """
-    def __init__(self):
+    def __init__(self, loop_cache=None):
         super().__init__()
         self.setWindowTitle("Interactive Hysteresis Plotter")
         self.setGeometry(100, 100, 1200, 800)
 
+        # Lookup table of precomputed loops over the integer slider grid
+        self.loop_cache = loop_cache if loop_cache is not None else LoopCache()
+        self.cache_path = None # Set to an .npz path to persist the table on close
+        self.active_axis = "ms" # Slider most recently moved, used for ghost overlays
+
         # --- Main Widget and Layout ---
         main_widget = QWidget()
         main_layout = QVBoxLayout()
@@ -81,11 +75,16 @@ class HysteresisPlotter(QMainWindow):
         self.plot_widget.addItem(pg.InfiniteLine(pos=0, angle=90, pen=pg.mkPen('k', width=1.5))) # Vertical line at x=0 (Y-axis)
         self.plot_widget.addItem(pg.InfiniteLine(pos=0, angle=0, pen=pg.mkPen('k', width=1.5)))  # Horizontal line at y=0 (X-axis)
 
+        # --- Ghost Overlays of neighbouring parameter values ---
+        # Hidden until enabled, so the curves are only created on first use (see update_ghosts)
+        self.ghost_items = []
+
         # --- Hysteresis Loop PlotDataItem ---
         # We use a PlotDataItem which can be updated with new x,y data points.
         self.loop_item = self.plot_widget.plot(
             pen={'color': QColor(5, 150, 255), 'width': 1.5} # Thinner line
         )
+        self.loop_item.setZValue(1) # Above ghost curves added later
 
         # --- Controls Layout (Sliders and Value Boxes) ---
         controls_widget = QWidget()
@@ -153,31 +152,44 @@ class HysteresisPlotter(QMainWindow):
         
         controls_layout.addLayout(sliders_layout)
 
+        # --- Lookup Table / Ghost Overlay Toggles ---
+        mode_layout = QHBoxLayout()
+        self.lookup_checkbox = QCheckBox("Precomputed Lookup Table")
+        self.lookup_checkbox.setChecked(True)
+        self.ghost_checkbox = QCheckBox("Ghost Overlays")
+        mode_layout.addWidget(self.lookup_checkbox)
+        mode_layout.addWidget(self.ghost_checkbox)
+        mode_layout.addStretch()
+        controls_layout.addLayout(mode_layout)
+
         # --- Connect Signals to Slots ---
-        self.ms_slider.valueChanged.connect(self.update_loop)
-        self.hc_slider.valueChanged.connect(self.update_loop)
-        self.a_slider.valueChanged.connect(self.update_loop)
-        self.e_slider.valueChanged.connect(self.update_loop)
+        self.slider_axes = {
+            self.ms_slider: "ms",
+            self.hc_slider: "hc",
+            self.a_slider: "a",
+            self.e_slider: "e",
+        }
+        for slider in self.slider_axes:
+            slider.valueChanged.connect(self.update_loop)
+        self.lookup_checkbox.toggled.connect(self.update_loop)
+        self.ghost_checkbox.toggled.connect(self.update_loop)
 
         # --- Initial Plot ---
         self.update_loop()
 
+    @HOTPATH.handler
     def update_loop(self):
         """
         This function is called whenever a slider's value changes.
         It recalculates the loop and updates the plot.
         """
-        # Get values from sliders, scaling them appropriately
-        ms_val = self.ms_slider.value() / 10.0
-        hc_val = self.hc_slider.value() / 10.0
-        a_val = self.a_slider.value() / 10.0
-        e_val_gpa = self.e_slider.value()
-
-        # Calculate the slope k from Young's Modulus E
-        # Strain = 100 * Stress / E_MPa
-        # k = dx/dy = 100 / (E_GPa * 1000)
-        e_val_mpa = e_val_gpa * 1000
-        k_val = 100 / e_val_mpa if e_val_mpa > 0 else 0
+        # Raw integer slider positions double as the lookup table key
+        key = (self.ms_slider.value(), self.hc_slider.value(), self.a_slider.value(), self.e_slider.value())
+        self.active_axis = self.slider_axes.get(self.sender(), self.active_axis)
+
+        # Scale the slider values; k = dx/dy = 100 / (E_GPa * 1000)
+        ms_val, hc_val, a_val, k_val = params_from_sliders(*key)
+        e_val_gpa = key[3]
 
         # Update the read-only value boxes
         self.ms_value_box.setText(f"{ms_val:.1f}")
@@ -185,21 +197,83 @@ class HysteresisPlotter(QMainWindow):
         self.a_value_box.setText(f"{a_val:.1f}")
         self.e_value_box.setText(f"{e_val_gpa} GPa")
 
-        # Calculate the new loop data
-        x_data, y_data = calculate_hysteresis_loop(ms_val, hc_val, a_val, k_val)
+        # Look up (or calculate) the new loop data
+        with HOTPATH.span("loop"):
+            if self.lookup_checkbox.isChecked():
+                # A miss fills the whole row along the slider being scrubbed
+                x_data, y_data = self.loop_cache.get(key, prefetch_axis=self.active_axis)
+            else:
+                x_data, y_data = calculate_hysteresis_loop(ms_val, hc_val, a_val, k_val)
 
         # Update the plot with the new data
-        self.loop_item.setData(x_data, y_data)
+        with HOTPATH.span("loop_item.setData", "plot"):
+            self.loop_item.setData(x_data, y_data)
+        self.update_ghosts(key)
+
+    @HOTPATH.timed("plot")
+    def update_ghosts(self, key):
+        """
+        Draws faint loops at neighbouring values of the most recently moved slider.
+        """
+        if not self.ghost_checkbox.isChecked():
+            for ghost in self.ghost_items:
+                ghost.clear()
+            return
+
+        if not self.ghost_items:
+            for _ in range(len(GHOST_OFFSETS["ms"])):
+                ghost = self.plot_widget.plot(pen={'color': QColor(5, 150, 255, 60), 'width': 1})
+                self.ghost_items.append(ghost)
+
+        with HOTPATH.span("ghost loops"):
+            loops = self.loop_cache.neighbours(key, self.active_axis, GHOST_OFFSETS[self.active_axis])
+        for i, ghost in enumerate(self.ghost_items):
+            if i < len(loops):
+                ghost.setData(*loops[i])
+            else:
+                ghost.clear()
+
+    def closeEvent(self, event):
+        if self.cache_path:
+            self.loop_cache.save(self.cache_path)
+        super().closeEvent(event)
 
 
 def main():
     """
     Main function to run the application.
     """
-    app = QApplication(sys.argv)
-    window = HysteresisPlotter()
+    parser = argparse.ArgumentParser(description="Interactive Hysteresis Plotter")
+    parser.add_argument("--loop-cache", metavar="NPZ",
+                        help="Load precomputed loops from this .npz file and save them back on exit")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print an import-time and first-paint breakdown, then exit "
+                             "(exit status 1 if time-to-interactive is over budget)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Time compute, plot and paint per update and show a frame-time overlay (F12 toggles it)")
+    parser.add_argument("--trace", metavar="JSON",
+                        help="Instrument and write a Chrome trace-event file on exit")
+    args, qt_args = parser.parse_known_args()
+
+    with STARTUP.phase("QApplication"):
+        app = QApplication(sys.argv[:1] + qt_args)
+    with STARTUP.phase("build window"):
+        window = HysteresisPlotter()
+    if args.loop_cache:
+        with STARTUP.phase("load loop cache"):
+            window.cache_path = args.loop_cache
+            window.loop_cache.load(args.loop_cache)
+            window.update_loop()
+    if args.profile_startup:
+        STARTUP.watch_qt(window, app)
+    if args.instrument or args.trace:
+        HOTPATH.attach(window, app, (window.plot_widget,), trace_path=args.trace)
     window.show()
-    sys.exit(app.exec())
+    status = app.exec()
+    if args.profile_startup:
+        window.close()
+        status = STARTUP.finish()
+    sys.exit(status)
 
 
 if __name__ == "__main__":
@@ -1,63 +1,85 @@
 
-import tkinter as tk
-from tkinter import ttk, Canvas
 import sys
 import os
-import math
-import json
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolbox_core.eventloop import EventLoopProfiler  # noqa: E402
+from toolbox_core.startup import StartupProfiler  # noqa: E402
+
+STARTUP = StartupProfiler("mech_scaler")
+EVENTS = EventLoopProfiler("mech_scaler")
+
+with STARTUP.phase("import Tkinter"):
+    import tkinter as tk
+    from tkinter import ttk, Canvas
+with STARTUP.phase("import toolbox_core + NumPy"):
+    import numpy as np
+    from toolbox_core.scaling_model import (
+        DEFAULT_SKELETON_RATIOS, DEFAULT_BONES, STUD_MM, sample_edges, model_bounds, scale_factor,
+        Skeleton, project, unproject, skeleton_config_path, read_skeleton_config, write_skeleton_config,
+    )
+    from toolbox_core.model_session import ModelSession, format_bone_table
+    from toolbox_core.skeleton_fit import cached_grid, fit_skeleton, format_report
+    from toolbox_core.mesh_slicer import scaled_layers, write_csv, write_svg
+    from toolbox_core.brick_voxels import PIECES, voxelize_bricks, write_pieces_csv
+    from toolbox_core.mesh_render import MeshRenderer, orbit_matrix, orbit_project, orbit_unproject, to_ppm
+    from toolbox_core.mesh_measure import (
+        FILAMENT_DENSITY, DEFAULT_WALL_MM, DEFAULT_INFILL, measure_mesh, print_estimate, brick_estimate,
+    )
+
+# How often the main thread checks whether the mesh has been measured
+PREPARE_POLL_MS = 50
+
 
 class MechScalerApp:
-    def __init__(self, root, obj_path):
+    def __init__(self, root, obj_path, compare_paths=()):
         self.root = root
         self.root.title("Mechagodzilla Scaler v2.0 - 3D Dual View")
         self.root.geometry("1400x800")
         
         self.obj_path = obj_path
-        self.vertices = []
+        # Models compared with this one; all are loaded into one session
+        self.compare_paths = list(compare_paths)
+        self.session = None
+        self.vertices = None
+        self.edges = None
+        self.triangles = None
         self.model_dims = (0, 0, 0) # w, h, d
-        self.model_bounds = (0, 0, 0, 0, 0, 0) # min_x, max_x, etc
         
         # Scale Settings
         self.target_height_cm = tk.DoubleVar(value=60.0)
         self.mesh_visibility = tk.IntVar(value=50) # 0-100
+        self.filament = tk.StringVar(value="PLA")
         self.pixels_per_mm = 0.5
         self.dragged_joint = None
         
+        # Orbit view: rotation in degrees, the pointer while rotating, and the last rendered mesh
+        self.orbit_yaw, self.orbit_pitch = 30.0, 20.0
+        self.orbit_anchor = None
+        self.orbit_key, self.orbit_photo = None, None
+        
         self.load_data()
         
-        # Skeleton Definitions: (x_ratio, y_ratio, z_ratio)
-        # Ratios 0.0-1.0 relative to bounding box
-        self.skeleton_ratios = {
-            "Hip": (0.45, 0.45, 0.5),
-            "Knee": (0.55, 0.25, 0.5),
-            "Ankle": (0.45, 0.05, 0.5),
-            "Shoulder": (0.60, 0.70, 0.5),
-            "Elbow": (0.65, 0.55, 0.5),
-            "Wrist": (0.75, 0.50, 0.5),
-            "Head": (0.85, 0.85, 0.5),
-            "NeckBase": (0.65, 0.75, 0.5),
-            "TailBase": (0.35, 0.45, 0.5),
-            "TailMid": (0.20, 0.30, 0.5),
-            "TailTip": (0.05, 0.10, 0.5)
-        }
+        # Skeleton Definitions: one (x_ratio, y_ratio, z_ratio) row per joint
+        # Ratios 0.0-1.0 relative to bounding box; bones are pairs of joint rows
+        self.bones = list(DEFAULT_BONES)
+        self.skeleton = Skeleton(DEFAULT_SKELETON_RATIOS, self.bones)
         
         self.load_config() 
         
-        self.bones = [
-            ("Femur", "Hip", "Knee"),
-            ("Tibia", "Knee", "Ankle"),
-            ("Spine", "Hip", "Shoulder"),
-            ("Neck", "Shoulder", "Head"),
-            ("Humerus", "Shoulder", "Elbow"),
-            ("Radius", "Elbow", "Wrist"),
-            ("Tail Upper", "Hip", "TailMid"),
-            ("Tail Lower", "TailMid", "TailTip")
-        ]
-        
-        self.current_joints = {} # Stores real-world Model Unit coords (x,y,z)
+        self.current_joints = np.zeros((0, 3)) # Real-world Model Unit coords (x,y,z), one row per joint
+        # Per view: (canvas, joint oval ids, bone line ids), moved in place while dragging
+        self.skeleton_items = {}
         
         self.setup_ui()
         self.update_calculations()
+        
+        # The mesh is measured and prepared for the orbit view on a worker thread once the
+        # window is on screen; the main thread polls for the result every PREPARE_POLL_MS
+        self.prepare_pending = True
+        self.root.bind("<Expose>", self.on_first_expose, add="+")
 
     def setup_ui(self):
         main_frame = ttk.Frame(self.root)
@@ -73,6 +95,12 @@ class MechScalerApp:
         ttk.Label(control_panel, text="Mesh Visibility", font=("Arial", 10, "bold")).pack(anchor=tk.W, pady=(10,0))
         ttk.Scale(control_panel, from_=0, to=100, variable=self.mesh_visibility, command=self.on_slider_change).pack(fill=tk.X, pady=5)
         
+        ttk.Button(control_panel, text="Auto-Fit Skeleton", command=self.auto_fit_skeleton).pack(fill=tk.X, pady=5)
+        ttk.Button(control_panel, text="Export Slices", command=self.export_slices).pack(fill=tk.X, pady=5)
+        ttk.Button(control_panel, text="Export Bricks", command=self.export_bricks).pack(fill=tk.X, pady=5)
+        ttk.Button(control_panel, text="Compare Models", command=self.compare_models).pack(fill=tk.X, pady=5)
+        ttk.Button(control_panel, text="Retarget Skeleton", command=self.retarget_skeleton).pack(fill=tk.X, pady=5)
+        
         self.lbl_dims = ttk.Label(control_panel, text="", font=("Consolas", 10), justify=tk.LEFT)
         self.lbl_dims.pack(anchor=tk.W, pady=10)
         
@@ -80,6 +108,13 @@ class MechScalerApp:
         self.lbl_limbs = ttk.Label(control_panel, text="", font=("Consolas", 10), justify=tk.LEFT)
         self.lbl_limbs.pack(anchor=tk.W)
         
+        ttk.Label(control_panel, text="MATERIAL:", font=("Arial", 10, "bold")).pack(anchor=tk.W, pady=(10,5))
+        material = ttk.Combobox(control_panel, textvariable=self.filament, values=list(FILAMENT_DENSITY), state="readonly", width=8)
+        material.pack(anchor=tk.W)
+        material.bind("<<ComboboxSelected>>", self.on_material_change)
+        self.lbl_material = ttk.Label(control_panel, text="", font=("Consolas", 10), justify=tk.LEFT)
+        self.lbl_material.pack(anchor=tk.W)
+        
         # --- Visualization Area ---
         viz_frame = ttk.Frame(main_frame)
         viz_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
@@ -100,9 +135,16 @@ class MechScalerApp:
         self.canvas_front = Canvas(f_front, bg="#e0e0e0")
         self.canvas_front.pack(fill=tk.BOTH, expand=True)
         
+        # Orbit View Frame
+        f_orbit = ttk.Labelframe(self.paned, text="Orbit View (drag to rotate)")
+        self.paned.add(f_orbit, weight=1)
+        self.canvas_orbit = Canvas(f_orbit, bg="#e0e0e0")
+        self.canvas_orbit.pack(fill=tk.BOTH, expand=True)
+        
         # Bind Events
-        self.canvas_side.bind("<Configure>", self.on_resize)
-        self.canvas_front.bind("<Configure>", self.on_resize)
+        self.canvas_side.bind("<Configure>", lambda e: self.on_resize(e, "side"))
+        self.canvas_front.bind("<Configure>", lambda e: self.on_resize(e, "front"))
+        self.canvas_orbit.bind("<Configure>", lambda e: self.on_resize(e, "orbit"))
         
         # Mouse Interaction
         # We need to know WHICH canvas
@@ -113,82 +155,96 @@ class MechScalerApp:
         self.canvas_front.bind("<ButtonPress-1>", lambda e: self.on_click(e, "front"))
         self.canvas_front.bind("<B1-Motion>", lambda e: self.on_drag(e, "front"))
         self.canvas_front.bind("<ButtonRelease-1>", self.on_release)
+        
+        self.canvas_orbit.bind("<ButtonPress-1>", lambda e: self.on_click(e, "orbit"))
+        self.canvas_orbit.bind("<B1-Motion>", lambda e: self.on_drag(e, "orbit"))
+        self.canvas_orbit.bind("<ButtonRelease-1>", self.on_release)
 
     def load_data(self):
-        print(f"Loading {self.obj_path}...")
-        self.edges = set() # Store tuples of (v1_idx, v2_idx)
+        print(f"Loading {', '.join([self.obj_path] + self.compare_paths)}...")
         
         try:
-            with open(self.obj_path, 'r') as f:
-                for line in f:
-                    parts = line.split()
-                    if not parts: continue
-                    
-                    if parts[0] == 'v':
-                        try:
-                            # OBJ: v x y z
-                            self.vertices.append((float(parts[1]), float(parts[2]), float(parts[3])))
-                        except ValueError: continue
-                    
-                    elif parts[0] == 'f':
-                        # f v1 v2 v3 ...
-                        # OBJ indices are 1-based
-                        v_indices = []
-                        for p in parts[1:]:
-                            # format can be v/vt/vn or just v
-                            v_idx = int(p.split('/')[0]) - 1
-                            v_indices.append(v_idx)
-                        
-                        # Create edges
-                        for i in range(len(v_indices)):
-                            i1 = v_indices[i]
-                            i2 = v_indices[(i+1) % len(v_indices)] # Wrap around
-                            # Store unordered tuple
-                            edge = tuple(sorted((i1, i2)))
-                            self.edges.add(edge)
-                            
+            # The files are parsed concurrently, once per process; the arrays are shared and read-only
+            with STARTUP.phase("load model"):
+                self.session = ModelSession([self.obj_path] + self.compare_paths)
+            model = self.session.models[0]
+            self.vertices, self.edges, self.triangles = model.vertices, model.edges, model.triangles
         except FileNotFoundError:
             # Dummy
-            self.vertices = [(0,0,0), (100,100,50), (200,50,-50)]
+            self.vertices = np.array([(0, 0, 0), (100, 100, 50), (200, 50, -50)], dtype=float)
+            self.edges = np.empty((0, 2), dtype=np.int64)
+            self.triangles = np.empty((0, 3), dtype=np.int64)
 
-        if not self.vertices: sys.exit(1)
+        if not len(self.vertices): sys.exit(1)
             
-        xs = [v[0] for v in self.vertices]
-        ys = [v[1] for v in self.vertices]
-        zs = [v[2] for v in self.vertices]
-
-        self.min_x, self.max_x = min(xs), max(xs)
-        self.min_y, self.max_y = min(ys), max(ys)
-        self.min_z, self.max_z = min(zs), max(zs)
+        self.mins, self.maxs = model_bounds(self.vertices)
+        self.model_dims = tuple(self.maxs - self.mins)
+        # The orbit view turns about the bounding box centre
+        self.orbit_center = (self.mins + self.maxs) / 2
         
-        self.model_dims = (self.max_x-self.min_x, self.max_y-self.min_y, self.max_z-self.min_z)
+        # Both take seconds on large meshes, so prepare_model fills them in after the first paint
+        self.measures = None
+        self.renderer = None
+        self.prepared = None
         
         # Optimization: if too many edges, sample them to avoid freezing Tkinter
         print(f"Loaded {len(self.vertices)} vertices and {len(self.edges)} edges.")
         if len(self.edges) > 5000:
-            import random
             print("Reducing edges for display performance...")
-            self.edges = random.sample(list(self.edges), 5000)
+            self.edges = sample_edges(self.edges, 5000)
+
+    def on_first_expose(self, event):
+        # NumPy releases the GIL in the voxelizing and rendering kernels, so the window
+        # stays responsive while the worker measures
+        if self.prepare_pending:
+            self.prepare_pending = False
+            threading.Thread(target=self.prepare_model, daemon=True).start()
+            self.root.after(PREPARE_POLL_MS, self.poll_prepared)
 
+    def prepare_model(self):
+        # Runs on the worker thread: no Tk calls. Measured once in model units; update_calculations
+        # only rescales. The voxel estimate reuses the Auto-Fit voxel cache but never writes it
+        try:
+            measures = measure_mesh(self.vertices, self.triangles, self.obj_path)
+            # Shaded mesh for the orbit view; back faces are skipped only for a single closed shell
+            renderer = MeshRenderer(self.vertices, self.triangles, closed=measures.method == "closed mesh")
+            self.prepared = (measures, renderer)
+        except Exception as err:
+            self.prepared = err
+
+    def poll_prepared(self):
+        prepared = self.prepared
+        if prepared is None:
+            self.root.after(PREPARE_POLL_MS, self.poll_prepared)
+            return
+        if isinstance(prepared, Exception):
+            self.lbl_material.config(text="Measuring failed")
+            raise prepared
+        self.measures, self.renderer = prepared
+        self.update_calculations()
+
+    @EVENTS.handler("slider")
     def on_slider_change(self, event):
         self.update_calculations()
         
-    def on_resize(self, event):
-        self.draw_views()
+    @EVENTS.handler("material")
+    def on_material_change(self, event):
+        self.update_calculations()
+        
+    @EVENTS.handler("<Configure>")
+    def on_resize(self, event, view_type):
+        # Only the resized view needs redrawing
+        self.draw_canvas(event.widget, view_type)
 
     def update_calculations(self):
         target_mm = self.target_height_cm.get() * 10
         _, model_h, _ = self.model_dims
         if model_h == 0: return
 
-        self.scale_factor = target_mm / model_h
+        self.scale_factor = scale_factor(target_mm, self.mins, self.maxs)
         
-        # Calculate real-world joint positions (Model Units)
-        for name, (rx, ry, rz) in self.skeleton_ratios.items():
-            mx = self.min_x + (rx * (self.max_x - self.min_x))
-            my = self.min_y + (ry * (self.max_y - self.min_y))
-            mz = self.min_z + (rz * (self.max_z - self.min_z))
-            self.current_joints[name] = (mx, my, mz)
+        # Real-world joint positions (Model Units) and limb lengths
+        self.update_skeleton()
 
         # Update Labels
         scaled_h = model_h * self.scale_factor
@@ -197,268 +253,360 @@ class MechScalerApp:
         
         self.lbl_dims.config(text=f"Height: {scaled_h/10:.1f} cm\nLength: {scaled_w/10:.1f} cm\nWidth:  {scaled_d/10:.1f} cm")
         
-        # Limb Lengths
-        txt = ""
-        for bone, start, end in self.bones:
-            p1 = self.current_joints[start]
-            p2 = self.current_joints[end]
-            dist = math.sqrt((p1[0]-p2[0])**2 + (p1[1]-p2[1])**2 + (p1[2]-p2[2])**2)
-            dist_mm = dist * self.scale_factor
-            txt += f"{bone}: {dist_mm/10:.1f}cm ({dist_mm/8:.1f}s)\n"
-        self.lbl_limbs.config(text=txt)
+        # Volume scales with scale^3, surface with scale^2
+        if self.measures is None:
+            self.lbl_material.config(text="Measuring...")
+        else:
+            approx = "~" if self.measures.method == "voxels" else ""
+            volume_cm3 = self.measures.volume_mm3(self.scale_factor) / 1000
+            area_cm2 = self.measures.area_mm2(self.scale_factor) / 100
+            printed = print_estimate(self.measures, self.scale_factor, self.filament.get())
+            bricks, brick_g = brick_estimate(self.measures, self.scale_factor)
+            self.lbl_material.config(text=(
+                f"Volume:  {approx}{volume_cm3:.0f} cm³\nSurface: {area_cm2:.0f} cm²\n"
+                f"Print:   {printed.mass_g:.0f} g, {printed.filament_m:.1f} m\n"
+                f"  ({DEFAULT_WALL_MM} mm walls, {DEFAULT_INFILL:.0%} infill)\n"
+                f"Bricks:  {bricks:.0f} 1x1 ({brick_g:.0f} g)"))
         
         self.draw_views()
 
+    def update_skeleton(self):
+        # Every joint and bone in one step; the limb lengths are all a joint drag changes
+        self.current_joints = self.skeleton.positions(self.mins, self.maxs)
+        bone_mm = self.skeleton.lengths(self.current_joints) * self.scale_factor
+        self.lbl_limbs.config(text="".join(f"{bone}: {mm/10:.1f}cm ({mm/STUD_MM:.1f}s)\n"
+                                           for bone, mm in zip(self.skeleton.bone_names, bone_mm.tolist())))
+
     def draw_views(self):
-        self.draw_canvas(self.canvas_side, "side")
-        self.draw_canvas(self.canvas_front, "front")
+        # Views not laid out yet are drawn by their first <Configure> instead
+        for canvas, view_type in ((self.canvas_side, "side"), (self.canvas_front, "front"), (self.canvas_orbit, "orbit")):
+            if canvas.winfo_ismapped():
+                self.draw_canvas(canvas, view_type)
 
     def draw_canvas(self, canvas, view_type):
+        deleted = len(canvas.find_all()) if EVENTS.enabled else 0
         canvas.delete("all")
         w = canvas.winfo_width()
         h = canvas.winfo_height()
-        floor_y = h - 50
-        origin_x = w/2 if view_type == "front" else 100
+        origin_x, floor_y = self.view_origin(canvas, view_type)
         
-        # Calculate Mesh Color based on visibility
-        # 0 = Invisible, 100 = #8888ff
-        vis = self.mesh_visibility.get()
-        if vis <= 5:
-            mesh_color = None # Don't draw
+        if view_type == "orbit":
+            # Shaded mesh only; floor, grid and minifig belong to the flat views
+            self.draw_orbit_mesh(canvas, w, h)
         else:
-            # Interpolate alpha? Tkinter doesn't do alpha easily.
-            # We interpolate color towards background (#eaeaea or #e0e0e0)
-            # Simple hex lerp
-            bg_val = 234 if view_type == 'side' else 224 # eaeaea vs e0e0e0
-            target_r, target_g, target_b = 136, 136, 255 # 8888ff
+            # Calculate Mesh Color based on visibility
+            # 0 = Invisible, 100 = #8888ff
+            vis = self.mesh_visibility.get()
+            if vis <= 5:
+                mesh_color = None # Don't draw
+            else:
+                # Interpolate alpha? Tkinter doesn't do alpha easily.
+                # We interpolate color towards background (#eaeaea or #e0e0e0)
+                # Simple hex lerp
+                bg_val = 234 if view_type == 'side' else 224 # eaeaea vs e0e0e0
+                target_r, target_g, target_b = 136, 136, 255 # 8888ff
             
-            # alpha 0.0 to 1.0
-            alpha = vis / 100.0
+                # alpha 0.0 to 1.0
+                alpha = vis / 100.0
             
-            r = int(bg_val + (target_r - bg_val) * alpha)
-            g = int(bg_val + (target_g - bg_val) * alpha)
-            b = int(bg_val + (target_b - bg_val) * alpha)
+                r = int(bg_val + (target_r - bg_val) * alpha)
+                g = int(bg_val + (target_g - bg_val) * alpha)
+                b = int(bg_val + (target_b - bg_val) * alpha)
             
-            mesh_color = f"#{r:02x}{g:02x}{b:02x}"
+                mesh_color = f"#{r:02x}{g:02x}{b:02x}"
             
-        # Floor
-        canvas.create_line(0, floor_y, w, floor_y, width=2)
+            # Floor
+            canvas.create_line(0, floor_y, w, floor_y, width=2)
         
-        # --- Grid ---
-        grid_mm = 16 * 8.0
-        grid_px = grid_mm * self.pixels_per_mm
+            # --- Grid ---
+            grid_mm = 16 * 8.0
+            grid_px = grid_mm * self.pixels_per_mm
         
-        num_h_lines = int(floor_y / grid_px) + 1
-        for i in range(1, num_h_lines):
-            y = floor_y - (i * grid_px)
-            canvas.create_line(0, y, w, y, fill="#cccccc", width=1, dash=(4, 4))
-            
-        # Vertical lines
-        num_v_lines_r = int((w - origin_x) / grid_px) + 1
-        for i in range(1, num_v_lines_r):
-            x = origin_x + (i * grid_px)
-            canvas.create_line(x, 0, x, h, fill="#cccccc", width=1, dash=(4, 4))
-        num_v_lines_l = int(origin_x / grid_px) + 1
-        for i in range(1, num_v_lines_l):
-            x = origin_x - (i * grid_px)
-            canvas.create_line(x, 0, x, h, fill="#cccccc", width=1, dash=(4, 4))
-
-        # Minifig
-        minifig_h = 40 * self.pixels_per_mm
-        canvas.create_rectangle(origin_x-10, floor_y-minifig_h, origin_x+10, floor_y, fill="red")
-        
-        # Draw Mesh Lines
-        if mesh_color:
-            z_center = (self.max_z + self.min_z) / 2
-            
-            # Draw Edges (limited/sampled)
-            # Optimized draw: calculate projected points first?
-            # Drawing thousands of lines is slow.
+            num_h_lines = int(floor_y / grid_px) + 1
+            for i in range(1, num_h_lines):
+                y = floor_y - (i * grid_px)
+                canvas.create_line(0, y, w, y, fill="#cccccc", width=1, dash=(4, 4))
             
-            # Use a generator/loop
-            for v1_idx, v2_idx in self.edges:
-                # Vertex 1
-                vx1, vy1, vz1 = self.vertices[v1_idx]
-                sy1 = (vy1 - self.min_y) * self.scale_factor
-                py1 = floor_y - (sy1 * self.pixels_per_mm)
-                
-                # Vertex 2
-                vx2, vy2, vz2 = self.vertices[v2_idx]
-                sy2 = (vy2 - self.min_y) * self.scale_factor
-                py2 = floor_y - (sy2 * self.pixels_per_mm)
-
-                if view_type == "side":
-                    sx1 = (vx1 - self.min_x) * self.scale_factor
-                    px1 = origin_x + 50 + (sx1 * self.pixels_per_mm)
-                    
-                    sx2 = (vx2 - self.min_x) * self.scale_factor
-                    px2 = origin_x + 50 + (sx2 * self.pixels_per_mm)
-                else:
-                    sz1 = (vz1 - z_center) * self.scale_factor
-                    px1 = origin_x + (sz1 * self.pixels_per_mm)
-                    
-                    sz2 = (vz2 - z_center) * self.scale_factor
-                    px2 = origin_x + (sz2 * self.pixels_per_mm)
-                
-                canvas.create_line(px1, py1, px2, py2, fill=mesh_color)
+            # Vertical lines
+            num_v_lines_r = int((w - origin_x) / grid_px) + 1
+            for i in range(1, num_v_lines_r):
+                x = origin_x + (i * grid_px)
+                canvas.create_line(x, 0, x, h, fill="#cccccc", width=1, dash=(4, 4))
+            num_v_lines_l = int(origin_x / grid_px) + 1
+            for i in range(1, num_v_lines_l):
+                x = origin_x - (i * grid_px)
+                canvas.create_line(x, 0, x, h, fill="#cccccc", width=1, dash=(4, 4))
+
+            # Minifig
+            minifig_h = 40 * self.pixels_per_mm
+            canvas.create_rectangle(origin_x-10, floor_y-minifig_h, origin_x+10, floor_y, fill="red")
+        
+            # Draw Mesh Lines
+            if mesh_color:
+                # Project every vertex once, then draw the (limited/sampled) edges
+                px, py = (c.tolist() for c in self.project(self.vertices, view_type, origin_x, floor_y))
+                for v1_idx, v2_idx in self.edges.tolist():
+                    canvas.create_line(px[v1_idx], py[v1_idx], px[v2_idx], py[v2_idx], fill=mesh_color)
             
         # Draw Skeleton
-        joint_px = {}
-        for name, (mx, my, mz) in self.current_joints.items():
-             sy = (my - self.min_y) * self.scale_factor
-             py = floor_y - (sy * self.pixels_per_mm)
-             
-             if view_type == "side":
-                 sx = (mx - self.min_x) * self.scale_factor
-                 px = origin_x + 50 + (sx * self.pixels_per_mm)
-             else:
-                 z_center = (self.max_z + self.min_z) / 2
-                 sz = (mz - z_center) * self.scale_factor
-                 px = origin_x + (sz * self.pixels_per_mm)
-            
-             joint_px[name] = (px, py)
-             canvas.create_oval(px-4, py-4, px+4, py+4, fill="orange", outline="black", tags=name)
-             
-        for bone, s, e in self.bones:
-            p1 = joint_px[s]
-            p2 = joint_px[e]
-            canvas.create_line(p1[0], p1[1], p2[0], p2[1], fill="green", width=3)
+        px, py = (c.tolist() for c in self.joint_pixels(view_type, origin_x, floor_y))
+        joints = [canvas.create_oval(x-4, y-4, x+4, y+4, fill="orange", outline="black", tags=name)
+                  for name, x, y in zip(self.skeleton.names, px, py)]
+        bones = [canvas.create_line(px[s], py[s], px[e], py[e], fill="green", width=3)
+                 for s, e in self.skeleton.bones.tolist()]
+        self.skeleton_items[view_type] = (canvas, joints, bones)
+
+        if EVENTS.enabled:
+            EVENTS.redraw(view_type, deleted, len(canvas.find_all()))
+
+    def draw_orbit_mesh(self, canvas, w, h):
+        # Rendered again only when the view itself changes, not while a joint moves
+        vis = self.mesh_visibility.get()
+        if vis <= 5 or self.renderer is None:
+            return
+        px_per_unit = self.scale_factor * self.pixels_per_mm
+        key = (self.orbit_yaw, self.orbit_pitch, w, h, px_per_unit, vis)
+        if key != self.orbit_key:
+            image = self.renderer.render(orbit_matrix(self.orbit_yaw, self.orbit_pitch), w, h, px_per_unit,
+                                         opacity=vis / 100.0)
+            # Tk draws the image only while a reference to it is kept
+            self.orbit_photo = tk.PhotoImage(data=to_ppm(image), format="PPM")
+            self.orbit_key = key
+        canvas.create_image(0, 0, anchor=tk.NW, image=self.orbit_photo)
+
+    def view_origin(self, canvas, view_type):
+        # (origin_x, floor_y) of the flat views; the orbit view centres the bounding box instead
+        w = canvas.winfo_width()
+        h = canvas.winfo_height()
+        if view_type == "orbit":
+            return w/2, h/2
+        return (w/2 if view_type == "front" else 100), h - 50
+
+    def project(self, points, view_type, origin_x, floor_y):
+        if view_type == "orbit":
+            px, py, _ = orbit_project(points, self.orbit_center, orbit_matrix(self.orbit_yaw, self.orbit_pitch),
+                                      self.scale_factor * self.pixels_per_mm, (origin_x, floor_y))
+            return px, py
+        return project(points, view_type, self.mins, self.maxs, self.scale_factor,
+                       self.pixels_per_mm, origin_x, floor_y)
+
+    def joint_pixels(self, view_type, origin_x, floor_y):
+        # Canvas coordinates of every joint, in skeleton row order
+        return self.project(self.current_joints, view_type, origin_x, floor_y)
+
+    def move_joint(self, joint):
+        # Moves the joint's oval and the bones at it in every drawn view; the mesh and
+        # the other joints stay as they are, so a drag costs the same on any rig
+        rows = self.skeleton.bones_at(joint)
+        touching = list(zip(rows.tolist(), self.skeleton.bones[rows].tolist()))
+        for view_type, (canvas, joints, bones) in self.skeleton_items.items():
+            if not canvas.winfo_ismapped():
+                continue
+            origin_x, floor_y = self.view_origin(canvas, view_type)
+            px, py = (c.tolist() for c in self.joint_pixels(view_type, origin_x, floor_y))
+            canvas.coords(joints[joint], px[joint]-4, py[joint]-4, px[joint]+4, py[joint]+4)
+            for b, (s, e) in touching:
+                canvas.coords(bones[b], px[s], py[s], px[e], py[e])
+            if EVENTS.enabled:
+                EVENTS.redraw(view_type, 0, 0)
 
     # --- Interaction ---
+    @EVENTS.handler("<ButtonPress-1>")
     def on_click(self, event, view_type):
         canvas = event.widget
-        # Simple hit test
-        closest = None
-        min_dist = 20
-        
-        # We need to reuse the projection logic to find px,py of joints
-        # Or just store them in draw? Storing in draw is cleaner but let's recompute for simplicity
-        w = canvas.winfo_width()
-        h = canvas.winfo_height()
-        floor_y = h - 50
-        origin_x = w/2 if view_type == "front" else 100
-        
-        for name, (mx, my, mz) in self.current_joints.items():
-             sy = (my - self.min_y) * self.scale_factor
-             py = floor_y - (sy * self.pixels_per_mm)
-             
-             if view_type == "side":
-                 sx = (mx - self.min_x) * self.scale_factor
-                 px = origin_x + 50 + (sx * self.pixels_per_mm)
-             else:
-                 z_center = (self.max_z + self.min_z) / 2
-                 sz = (mz - z_center) * self.scale_factor
-                 px = origin_x + (sz * self.pixels_per_mm)
-             
-             dist = math.sqrt((event.x-px)**2 + (event.y-py)**2)
-             if dist < min_dist:
-                 closest = name
-                 min_dist = dist
+        # Simple hit test: the nearest joint within 20 px, as a skeleton row
+        origin_x, floor_y = self.view_origin(canvas, view_type)
+        px, py = self.joint_pixels(view_type, origin_x, floor_y)
+        dist = np.hypot(event.x - px, event.y - py)
+        closest = int(np.argmin(dist)) if len(dist) and dist.min() < 20 else None
         
         self.dragged_joint = closest
+        # Empty space in the orbit view rotates it instead
+        self.orbit_anchor = (event.x, event.y) if view_type == "orbit" and closest is None else None
 
+    @EVENTS.handler("<B1-Motion>")
     def on_drag(self, event, view_type):
-        if not self.dragged_joint: return
+        if self.orbit_anchor:
+            # Half a degree per pixel; the pitch stops short of looking straight down or up
+            x0, y0 = self.orbit_anchor
+            self.orbit_yaw = (self.orbit_yaw + (event.x - x0) * 0.5) % 360
+            self.orbit_pitch = min(max(self.orbit_pitch + (event.y - y0) * 0.5, -89.0), 89.0)
+            self.orbit_anchor = (event.x, event.y)
+            self.draw_canvas(event.widget, view_type)
+            return
+        if self.dragged_joint is None: return
         
         canvas = event.widget
-        w = canvas.winfo_width()
-        h = canvas.winfo_height()
-        floor_y = h - 50
-        origin_x = w/2 if view_type == "front" else 100
+        origin_x, floor_y = self.view_origin(canvas, view_type)
         
         # Inverse Projection
-        # py = floor_y - (sy * pix_per_mm) => sy = (floor_y - py) / pix
-        sy = (floor_y - event.y) / self.pixels_per_mm
-        
-        # my = min_y + (sy / scale)
         if self.scale_factor == 0: return
-        new_my = self.min_y + (sy / self.scale_factor)
-        
-        # Ratio Y
-        range_y = self.max_y - self.min_y
-        new_ry = (new_my - self.min_y) / range_y if range_y else 0
-        
-        # Get current ratios
-        cur_rx, cur_ry, cur_rz = self.skeleton_ratios[self.dragged_joint]
-        
-        if view_type == "side":
-            # Update X
-            # px = origin + 50 + sx*pix
-            # sx = (px - origin - 50) / pix
-            sx = (event.x - origin_x - 50) / self.pixels_per_mm
-            new_mx = self.min_x + (sx / self.scale_factor)
-            range_x = self.max_x - self.min_x
-            new_rx = (new_mx - self.min_x) / range_x if range_x else 0
-            
-            self.skeleton_ratios[self.dragged_joint] = (new_rx, new_ry, cur_rz)
+        if view_type == "orbit":
+            self.skeleton.ratios[self.dragged_joint] = self.orbit_ratios(event.x, event.y, origin_x, floor_y)
+        else:
+            new_rh, new_ry = unproject(event.x, event.y, view_type, self.mins, self.maxs, self.scale_factor,
+                                       self.pixels_per_mm, origin_x, floor_y)
             
-        else: # Front
-            # Update Z
-            # px = origin + sz*pix
-            sz = (event.x - origin_x) / self.pixels_per_mm
-            z_center = (self.max_z + self.min_z) / 2
-            new_mz = z_center + (sz / self.scale_factor)
-            range_z = self.max_z - self.min_z
-            new_rz = (new_mz - self.min_z) / range_z if range_z else 0.5
+            # Get current ratios
+            cur_rx, cur_ry, cur_rz = self.skeleton.ratios[self.dragged_joint]
             
-            self.skeleton_ratios[self.dragged_joint] = (cur_rx, new_ry, new_rz)
+            if view_type == "side":
+                # Update X
+                self.skeleton.ratios[self.dragged_joint] = (new_rh, new_ry, cur_rz)
+            else: # Front
+                # Update Z
+                self.skeleton.ratios[self.dragged_joint] = (cur_rx, new_ry, new_rh)
             
-        self.update_calculations()
+        self.update_skeleton()
+        self.move_joint(self.dragged_joint)
 
+    def orbit_ratios(self, px, py, origin_x, floor_y):
+        # The dragged joint moves in the screen plane through it, keeping its depth
+        matrix = orbit_matrix(self.orbit_yaw, self.orbit_pitch)
+        px_per_unit = self.scale_factor * self.pixels_per_mm
+        _, _, depth = orbit_project(self.current_joints[self.dragged_joint], self.orbit_center, matrix, px_per_unit,
+                                    (origin_x, floor_y))
+        point = orbit_unproject(px, py, depth[0], self.orbit_center, matrix, px_per_unit, (origin_x, floor_y))
+        # Flat axes keep their ratio
+        span = self.maxs - self.mins
+        ratios = np.where(span > 0, (point - self.mins) / np.where(span > 0, span, 1), self.skeleton.ratios[self.dragged_joint])
+        return tuple(float(r) for r in ratios)
+
+    @EVENTS.handler("<ButtonRelease-1>")
     def on_release(self, event):
         self.dragged_joint = None
+        self.orbit_anchor = None
+        self.save_config()
+
+    def auto_fit_skeleton(self):
+        # Fits the full mesh, not the sampled display edges; the voxel grid is
+        # cached next to the config until the OBJ file changes
+        try:
+            grid = cached_grid(self.obj_path, self.vertices, self.triangles)
+        except OSError:
+            grid = None
+        fit = fit_skeleton(self.vertices, self.triangles, self.skeleton.to_ratios(), grid=grid)
+        print(format_report(fit))
+        self.skeleton.update(fit.ratios)
+        self.update_calculations()
         self.save_config()
 
+    def export_slices(self):
+        # One outline SVG per brick layer at the target height, plus a summary CSV,
+        # in slices_<stem> next to the OBJ. Large meshes are sliced on all cores.
+        stem = os.path.splitext(os.path.basename(self.obj_path))[0]
+        directory = os.path.join(os.path.dirname(self.obj_path), f"slices_{stem}")
+        workers = (os.cpu_count() or 1) if len(self.triangles) >= 1_000_000 else 1
+        layers = scaled_layers(self.vertices, self.triangles, self.target_height_cm.get() * 10, workers=workers)
+        write_svg(layers, directory)
+        write_csv(layers, os.path.join(directory, "layers.csv"))
+        print(f"Exported {len(layers)} layers to {directory}")
+
+    def export_bricks(self):
+        # Stud grid in plate layers at the target height: pieces per layer in
+        # bricks_<stem>.csv and the bit-packed grid in bricks_<stem>.npz, next to the OBJ
+        stem = os.path.splitext(os.path.basename(self.obj_path))[0]
+        base = os.path.join(os.path.dirname(self.obj_path), f"bricks_{stem}")
+        grid = voxelize_bricks(self.vertices, self.triangles, self.target_height_cm.get() * 10)
+        rows = write_pieces_csv(grid, base + ".csv")
+        grid.save(base + ".npz")
+        totals = ", ".join(f"{sum(row[f'{w}x{d}'] for row in rows)} {w}x{d}" for w, d in PIECES)
+        print(f"Exported {grid.shape[1]} layers ({totals}) to {base}.csv")
+
+    def compare_models(self):
+        # Bone lengths of every loaded model at the target height, each with its own
+        # skeleton, in cm and as the difference from this model
+        if self.session is None or len(self.session.models) < 2:
+            print("Compare Models: start with more than one OBJ file to compare")
+            return
+        self.session.models[0].ratios = self.skeleton.to_ratios()
+        names = [model.name for model in self.session.models]
+        table = self.session.bone_table(self.target_height_cm.get() * 10, self.bones)
+        print(format_bone_table(names, table))
+        
+        window = tk.Toplevel(self.root)
+        window.title(f"Bone Lengths at {self.target_height_cm.get():.1f} cm")
+        tree = ttk.Treeview(window, columns=names, height=len(table))
+        tree.heading("#0", text="Bone")
+        for name in names:
+            tree.heading(name, text=name)
+            tree.column(name, anchor=tk.E, width=120)
+        for bone, lengths in table.items():
+            cells = [f"{lengths[0] / 10:.1f}"] + [f"{mm / 10:.1f} ({(mm - lengths[0]) / 10:+.1f})" for mm in lengths[1:]]
+            tree.insert("", tk.END, text=bone, values=cells)
+        tree.pack(fill=tk.BOTH, expand=True)
+
+    def retarget_skeleton(self):
+        # Copies this skeleton onto every compared model and saves it next to each OBJ
+        if self.session is None or len(self.session.models) < 2:
+            print("Retarget Skeleton: start with more than one OBJ file to retarget onto")
+            return
+        targets = self.session.models[1:]
+        self.session.retarget(self.skeleton.to_ratios(), targets)
+        for model in targets:
+            try:
+                print(f"Saved config to {model.save_skeleton()}")
+            except Exception as e:
+                print(f"Error saving config: {e}")
+
     def get_config_path(self):
-        # Config name = skeleton_<obj_filename_stem>.json
-        # e.g. rpo.obj -> skeleton_rpo.json
-        base_name = os.path.basename(self.obj_path)
-        stem = os.path.splitext(base_name)[0]
-        config_name = f"skeleton_{stem}.json"
-        
-        # Look for it in the same directory as the obj path
+        # Config name = skeleton_<obj_filename_stem>.json, next to the OBJ
         # (which we enforce is the script directory in main)
-        return os.path.join(os.path.dirname(self.obj_path), config_name)
+        return skeleton_config_path(self.obj_path)
 
     def load_config(self):
         p = self.get_config_path()
         if os.path.exists(p):
             print(f"Loading config from {p}")
             try:
-                with open(p, 'r') as f:
-                    data = json.load(f)
-                    for k, v in data.items():
-                        if k in self.skeleton_ratios:
-                            if len(v) == 2: # Migrate 2D -> 3D
-                                self.skeleton_ratios[k] = (v[0], v[1], 0.5)
-                            else:
-                                self.skeleton_ratios[k] = tuple(v)
+                # Older 2D configs are migrated to 3D
+                self.skeleton.update(read_skeleton_config(p, self.skeleton.to_ratios()))
             except Exception as e:
                 print(f"Error loading config: {e}")
 
     def save_config(self):
         p = self.get_config_path()
         try:
-            with open(p, 'w') as f: json.dump(self.skeleton_ratios, f, indent=4)
+            write_skeleton_config(p, self.skeleton.to_ratios())
             print(f"Saved config to {p}")
         except Exception as e:
             print(f"Error saving config: {e}")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python mech_scaler.py <filename.obj>")
+    # --profile-startup prints an import-time and first-paint breakdown, then exits
+    # (exit status 1 if time-to-interactive is over budget)
+    # --profile-events records per-event handling time, canvas item churn and
+    # event backlog, samples cProfile of the slowest events, and prints a summary on exit
+    flags = {"--profile-startup", "--profile-events"}
+    profile_startup = "--profile-startup" in sys.argv[1:]
+    profile_events = "--profile-events" in sys.argv[1:]
+    args = [a for a in sys.argv[1:] if a not in flags]
+    if not args:
+        print("Usage: python mech_scaler.py [--profile-startup] [--profile-events] <filename.obj> [<compare.obj> ...]")
         print("Error: No OBJ file specified.")
         sys.exit(1)
         
-    filename = sys.argv[1]
-    # Always look for the file in the same directory as the script
+    # Always look for the files in the same directory as the script;
+    # any after the first are loaded alongside it for comparison
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    path = os.path.join(script_dir, filename)
+    paths = [os.path.join(script_dir, filename) for filename in args]
     
-    if not os.path.exists(path):
-        print(f"Error: File not found: {path}")
-        sys.exit(1)
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"Error: File not found: {path}")
+            sys.exit(1)
     
-    root = tk.Tk()
-    app = MechScalerApp(root, path)
+    with STARTUP.phase("Tk"):
+        root = tk.Tk()
+    with STARTUP.phase("build window"):
+        app = MechScalerApp(root, paths[0], paths[1:])
+    if profile_startup:
+        STARTUP.watch_tk(root)
+    if profile_events:
+        EVENTS.attach(root)
     root.mainloop()
+    if profile_events:
+        EVENTS.finish()
+    if profile_startup:
+        root.destroy()
+        sys.exit(STARTUP.finish())
@@ -1,22 +1,36 @@
 
+import argparse
+import os
 import sys
-import numpy as np
-from PyQt6.QtWidgets import (
-    QApplication,
-    QMainWindow,
-    QWidget,
-    QVBoxLayout,
-    QHBoxLayout,
-    QGridLayout,
-    QSlider,
-    QLabel,
-    QLineEdit,
-)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor
-import pyqtgraph as pg
 
-from specimen_model import TensileSpecimen, GeometricProperties, MaterialProperties
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolbox_core.hotpath import HotPathProfiler  # noqa: E402
+from toolbox_core.startup import StartupProfiler  # noqa: E402
+
+STARTUP = StartupProfiler("tensile_analyzer")
+HOTPATH = HotPathProfiler("tensile_analyzer")
+
+with STARTUP.phase("import NumPy"):
+    import numpy as np
+with STARTUP.phase("import PyQt6"):
+    from PyQt6.QtWidgets import (
+        QApplication,
+        QMainWindow,
+        QWidget,
+        QVBoxLayout,
+        QHBoxLayout,
+        QGridLayout,
+        QSlider,
+        QLabel,
+        QLineEdit,
+    )
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtGui import QColor
+with STARTUP.phase("import pyqtgraph"):
+    import pyqtgraph as pg
+with STARTUP.phase("import toolbox_core"):
+    from toolbox_core.specimen_model import TensileSpecimen, GeometricProperties, MaterialProperties
 
 
 class TensileAnalyzer(QMainWindow):
@@ -214,6 +228,7 @@ class TensileAnalyzer(QMainWindow):
         self.force_box.setText(f"{self.applied_force / 1000:.1f}")
         self.update_all()
     
+    @HOTPATH.handler
     def update_all(self):
         """Update all visualizations."""
         self.plot_geometry()
@@ -225,11 +240,13 @@ class TensileAnalyzer(QMainWindow):
         kt = self.specimen.stress_concentration_factor()
         self.kt_box.setText(f"{kt:.2f}")
     
+    @HOTPATH.timed("plot")
     def plot_geometry(self):
         """Plot the specimen geometry."""
         self.geometry_plot.clear()
         
-        x, y = self.specimen.get_profile_coordinates()
+        with HOTPATH.span("get_profile_coordinates"):
+            x, y = self.specimen.get_profile_coordinates()
         
         # Plot upper and lower profiles
         self.geometry_plot.plot(x, y, pen=pg.mkPen('b', width=2))
@@ -238,6 +255,7 @@ class TensileAnalyzer(QMainWindow):
         # Add centerline
         self.geometry_plot.plot([x[0], x[-1]], [0, 0], pen=pg.mkPen('k', width=1, style=Qt.PenStyle.DashLine))
     
+    @HOTPATH.timed("plot")
     def plot_stress_distribution(self):
         """Plot stress distribution along the specimen."""
         self.stress_plot.clear()
@@ -245,44 +263,27 @@ class TensileAnalyzer(QMainWindow):
         if self.applied_force == 0:
             return
         
-        x, y = self.specimen.get_profile_coordinates()
-        stress = np.zeros_like(x)
-        
-        # Calculate stress at each point
-        gauge_stress = self.specimen.calculate_stress(self.applied_force)
-        kt = self.specimen.stress_concentration_factor()
-        
-        for i, (xi, yi) in enumerate(zip(x, y)):
-            area = np.pi * yi ** 2
-            if area > 0:
-                stress[i] = self.applied_force / area
-                
-                # Apply stress concentration at transitions
-                # Simplified: apply K_t in transition zones
-                total_length = 2 * self.geometry.grip_length + self.geometry.gauge_length
-                grip1_end = self.geometry.grip_length
-                transition1_end = grip1_end + self.geometry.fillet_radius
-                gauge_end = transition1_end + self.geometry.gauge_length
-                transition2_end = gauge_end + self.geometry.fillet_radius
-                
-                if grip1_end < xi < transition1_end or gauge_end < xi < transition2_end:
-                    stress[i] *= kt
+        # Stress at each profile point, with K_t in the transition zones
+        with HOTPATH.span("stress_distribution"):
+            x, stress = self.specimen.stress_distribution(self.applied_force)
         
         self.stress_plot.plot(x, stress, pen=pg.mkPen('r', width=2))
         self.stress_plot.plot([x[0], x[-1]], [self.material.yield_strength, self.material.yield_strength], 
                              pen=pg.mkPen('g', width=1, style=Qt.PenStyle.DashLine))
     
+    @HOTPATH.timed("plot")
     def plot_stress_strain_curve(self):
         """Plot the stress-strain curve."""
         self.stress_strain_plot.clear()
         
         # Generate stress-strain curve
-        max_stress = min(self.material.ultimate_strength, 800)
-        stress_range = np.linspace(0, max_stress, 200)
-        strain_range = np.zeros_like(stress_range)
-        
-        for i, stress in enumerate(stress_range):
-            strain_range[i] = self.specimen.calculate_strain_plastic(stress) * 100  # Convert to %
+        with HOTPATH.span("stress_strain_curve"):
+            max_stress = min(self.material.ultimate_strength, 800)
+            stress_range = np.linspace(0, max_stress, 200)
+            strain_range = np.zeros_like(stress_range)
+            
+            for i, stress in enumerate(stress_range):
+                strain_range[i] = self.specimen.calculate_strain_plastic(stress) * 100  # Convert to %
         
         self.stress_strain_plot.plot(strain_range, stress_range, pen=pg.mkPen('b', width=2))
         
@@ -298,6 +299,7 @@ class TensileAnalyzer(QMainWindow):
             self.stress_strain_plot.plot([current_strain], [current_stress], 
                                         symbol='o', symbolSize=10, symbolBrush='r')
     
+    @HOTPATH.timed("plot")
     def plot_deformed_shape(self):
         """Plot the deformed shape with exaggerated deformation."""
         self.deformed_plot.clear()
@@ -310,31 +312,32 @@ class TensileAnalyzer(QMainWindow):
             return
         
         # Calculate deformation
-        stress = self.specimen.calculate_stress(self.applied_force)
-        strain = self.specimen.calculate_strain_plastic(stress)
-        
-        # Exaggeration factor for visibility
-        exaggeration = 50.0
-        
-        x, y = self.specimen.get_profile_coordinates()
-        x_deformed = x.copy()
-        y_deformed = y.copy()
-        
-        # Apply axial elongation (only in gauge section)
-        total_length = 2 * self.geometry.grip_length + self.geometry.gauge_length
-        grip1_end = self.geometry.grip_length
-        transition1_end = grip1_end + self.geometry.fillet_radius
-        gauge_end = transition1_end + self.geometry.gauge_length
-        
-        for i, xi in enumerate(x):
-            if transition1_end <= xi <= gauge_end:
-                # Gauge section: apply full strain
-                local_elongation = (xi - transition1_end) * strain * exaggeration
-                x_deformed[i] = xi + local_elongation
+        with HOTPATH.span("deformed_shape"):
+            stress = self.specimen.calculate_stress(self.applied_force)
+            strain = self.specimen.calculate_strain_plastic(stress)
+        
+            # Exaggeration factor for visibility
+            exaggeration = 50.0
+        
+            x, y = self.specimen.get_profile_coordinates()
+            x_deformed = x.copy()
+            y_deformed = y.copy()
+        
+            # Apply axial elongation (only in gauge section)
+            total_length = 2 * self.geometry.grip_length + self.geometry.gauge_length
+            grip1_end = self.geometry.grip_length
+            transition1_end = grip1_end + self.geometry.fillet_radius
+            gauge_end = transition1_end + self.geometry.gauge_length
+        
+            for i, xi in enumerate(x):
+                if transition1_end <= xi <= gauge_end:
+                    # Gauge section: apply full strain
+                    local_elongation = (xi - transition1_end) * strain * exaggeration
+                    x_deformed[i] = xi + local_elongation
                 
-                # Apply Poisson contraction
-                lateral_strain = self.specimen.calculate_lateral_strain(strain)
-                y_deformed[i] = y[i] * (1 + lateral_strain * exaggeration)
+                    # Apply Poisson contraction
+                    lateral_strain = self.specimen.calculate_lateral_strain(strain)
+                    y_deformed[i] = y[i] * (1 + lateral_strain * exaggeration)
         
         # Plot undeformed (dashed) and deformed (solid)
         self.deformed_plot.plot(x, y, pen=pg.mkPen('gray', width=1, style=Qt.PenStyle.DashLine))
@@ -345,10 +348,31 @@ class TensileAnalyzer(QMainWindow):
 
 def main():
     """Main function to run the application."""
-    app = QApplication(sys.argv)
-    window = TensileAnalyzer()
+    parser = argparse.ArgumentParser(description="Tensile Specimen Analyzer")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print an import-time and first-paint breakdown, then exit "
+                             "(exit status 1 if time-to-interactive is over budget)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Time compute, plot and paint per update and show a frame-time overlay (F12 toggles it)")
+    parser.add_argument("--trace", metavar="JSON",
+                        help="Instrument and write a Chrome trace-event file on exit")
+    args, qt_args = parser.parse_known_args()
+
+    with STARTUP.phase("QApplication"):
+        app = QApplication(sys.argv[:1] + qt_args)
+    with STARTUP.phase("build window"):
+        window = TensileAnalyzer()
+    if args.profile_startup:
+        STARTUP.watch_qt(window, app)
+    if args.instrument or args.trace:
+        plots = (window.geometry_plot, window.stress_plot, window.stress_strain_plot, window.deformed_plot)
+        HOTPATH.attach(window, app, plots, trace_path=args.trace)
     window.show()
-    sys.exit(app.exec())
+    status = app.exec()
+    if args.profile_startup:
+        window.close()
+        status = STARTUP.finish()
+    sys.exit(status)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from toolbox_core.bridge_model import (
+    BridgeConfig, FULL_BRIDGE, HALF_BRIDGE, QUARTER_BRIDGE, bridge_response, strain_from_output,
+)
+
+
+RG, GF, RS = 120.0, 2.0, 20000.0
+STRAINS = np.linspace(-5e-3, 5e-3, 21)
+
+
+def parallel(a, b):
+    return a * b / (a + b)
+
+
+def shunted_mv_v(active_gauges, strain, lead):
+    """Hand-derived output of a shunted bridge with 2-wire leads (Vout/Vin = R3/(R2+R3) - R4/(R1+R4))."""
+    tension, compression = RG * (1 + GF * strain), RG * (1 - GF * strain)
+    if active_gauges == QUARTER_BRIDGE:
+        ratio = 0.5 - RG / (parallel(tension + 2 * lead, RS) + RG)
+    elif active_gauges == HALF_BRIDGE:
+        arm = tension + 2 * lead
+        ratio = arm / (RG + arm) - RG / (parallel(arm, RS) + RG)
+    else:
+        r1 = parallel(tension, RS)
+        ratio = tension / (compression + tension) - compression / (r1 + compression)
+        r_in = (r1 + compression) * (compression + tension) / (r1 + 2 * compression + tension)
+        ratio = ratio * r_in / (r_in + 2 * lead)
+    return ratio * 1000.0
+
+
+@pytest.mark.parametrize("active_gauges", [QUARTER_BRIDGE, HALF_BRIDGE, FULL_BRIDGE])
+@pytest.mark.parametrize("lead_resistance", [0.0, 0.5])
+def test_shunted_output_closed_form(active_gauges, lead_resistance):
+    config = BridgeConfig(RG, GF, active_gauges, RS, shunt_connected=True, lead_resistance=lead_resistance)
+    np.testing.assert_allclose(bridge_response(STRAINS, config).mv_v,
+                               shunted_mv_v(active_gauges, STRAINS, lead_resistance), rtol=1e-12, atol=1e-12)
+
+
+def test_quarter_shunt_strain_is_shunt_equivalent():
+    config = BridgeConfig(RG, GF, QUARTER_BRIDGE, RS, shunt_connected=True)
+    np.testing.assert_allclose(bridge_response(0.0, config).total_strain, -RG / (GF * (RG + RS)), rtol=1e-12)
+
+
+@pytest.mark.parametrize("active_gauges", [QUARTER_BRIDGE, HALF_BRIDGE, FULL_BRIDGE])
+@pytest.mark.parametrize("lead_resistance, lead_wires", [(0.0, 2), (0.5, 2), (0.5, 3)])
+@pytest.mark.parametrize("shunt_connected", [False, True])
+def test_strain_round_trip(active_gauges, lead_resistance, lead_wires, shunt_connected):
+    config = BridgeConfig(active_gauges=active_gauges, lead_resistance=lead_resistance, lead_wires=lead_wires,
+                          shunt_connected=shunt_connected)
+    np.testing.assert_allclose(strain_from_output(bridge_response(STRAINS, config).mv_v, config), STRAINS,
+                               rtol=0, atol=1e-12)
+
+
+def test_shunt_strain_scales_with_active_arms():
+    zero = [bridge_response(0.0, BridgeConfig(active_gauges=g, shunt_connected=True)).total_strain
+            for g in (QUARTER_BRIDGE, HALF_BRIDGE, FULL_BRIDGE)]
+    np.testing.assert_allclose(np.array(zero) * 1e6, [-2982.1, -1493.3, -747.8], atol=0.1)
+
+
+def test_unshunted_strain_is_applied():
+    config = BridgeConfig(active_gauges=FULL_BRIDGE, lead_resistance=0.5)
+    np.testing.assert_array_equal(bridge_response(2e-3, config).total_strain, 2e-3)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from toolbox_core.hysteresis_model import (
+    SLIDER_ORDER, LoopCache, calculate_hysteresis_loop, params_from_sliders,
+)
+
+KEY = (10, 500, 1000, 200)
+
+
+def direct_loop(key):
+    return calculate_hysteresis_loop(*params_from_sliders(*key))
+
+
+@pytest.mark.parametrize("max_entries", [0, -1])
+def test_rejects_empty_cache(max_entries):
+    with pytest.raises(ValueError):
+        LoopCache(max_entries=max_entries)
+
+
+@pytest.mark.parametrize("max_entries", [1, 5, 5000])
+@pytest.mark.parametrize("prefetch_axis", [None, *SLIDER_ORDER])
+def test_get_matches_direct_loop(max_entries, prefetch_axis):
+    cache = LoopCache(max_entries=max_entries)
+    for key in (KEY, (1, 100, 200, 100), (20, 1000, 2000, 300)):
+        x, y = cache.get(key, prefetch_axis)
+        x_ref, y_ref = direct_loop(key)
+        np.testing.assert_allclose(x, x_ref, rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(y, y_ref, rtol=1e-12, atol=1e-12)
+        assert len(cache) <= max_entries
+
+
+@pytest.mark.parametrize("max_entries", [1, 3])
+def test_neighbours_on_small_cache(max_entries):
+    cache = LoopCache(max_entries=max_entries)
+    loops = cache.neighbours(KEY, "hc", (-20, -10, 10, 20))
+    assert len(loops) == 4
+    np.testing.assert_allclose(loops[0][0], direct_loop((10, 480, 1000, 200))[0], rtol=1e-12, atol=1e-12)
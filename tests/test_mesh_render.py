@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from toolbox_core.mesh_render import MeshRenderer, orbit_matrix
+
+BACKGROUND = (224, 224, 224)
+
+
+def uv_sphere(n_lat: int, n_lon: int):
+    """Closed unit sphere with outward (counter-clockwise) triangles."""
+    theta = np.linspace(0, np.pi, n_lat + 1)[1:-1]
+    phi = np.linspace(0, 2 * np.pi, n_lon, endpoint=False)
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    vertices = np.column_stack([(np.sin(t) * np.cos(p)).ravel(), np.cos(t).ravel(), (np.sin(t) * np.sin(p)).ravel()])
+    vertices = np.vstack([vertices, [0, 1, 0], [0, -1, 0]])
+    top, bottom = len(vertices) - 2, len(vertices) - 1
+    ring = np.arange((n_lat - 1) * n_lon).reshape(n_lat - 1, n_lon)
+    following = np.roll(ring, -1, axis=1)
+    triangles = np.vstack([
+        np.column_stack([ring[:-1].ravel(), following[:-1].ravel(), ring[1:].ravel()]),
+        np.column_stack([following[:-1].ravel(), following[1:].ravel(), ring[1:].ravel()]),
+        np.column_stack([np.full(n_lon, top), following[0], ring[0]]),
+        np.column_stack([np.full(n_lon, bottom), ring[-1], following[-1]]),
+    ])
+    return vertices, triangles
+
+
+@pytest.mark.parametrize("detail_px", [None, 1.0])
+def test_closed_sphere_has_no_pinholes(detail_px):
+    # Triangles smaller than a pixel, with back faces culled: a pixel the front faces miss shows background
+    vertices, triangles = uv_sphere(300, 600)
+    renderer = MeshRenderer(vertices, triangles, closed=True)
+    assert renderer.facing == 1
+    size, px_per_unit = 300, 135.0
+    y, x = np.mgrid[:size, :size] - (size / 2 - 0.5)
+    inside = np.hypot(x, y) < 0.98 * px_per_unit
+    holes = 0
+    for k in range(24):
+        image = renderer.render(orbit_matrix(k * 15.0 + 3, 7.0 + k), size, size, px_per_unit,
+                                background=BACKGROUND, detail_px=detail_px)
+        holes += int(np.count_nonzero((image == BACKGROUND).all(axis=2) & inside))
+    assert holes == 0
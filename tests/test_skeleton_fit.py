@@ -0,0 +1,36 @@
+import numpy as np
+
+from toolbox_core.skeleton_fit import fit_skeleton
+
+BOX_FACES = np.array([(0, 1, 3), (0, 3, 2), (4, 6, 7), (4, 7, 5), (0, 4, 5), (0, 5, 1),
+                      (2, 3, 7), (2, 7, 6), (0, 2, 6), (0, 6, 4), (1, 5, 7), (1, 7, 3)])
+
+
+def box_creature():
+    """Legs, body, chest, neck, head, a tail running back along -x and two arms, as boxes."""
+    parts = [
+        ((40, 0, 15), (55, 45, 30)), ((40, 0, 50), (55, 45, 65)),
+        ((35, 40, 20), (75, 80, 60)), ((55, 80, 28), (72, 110, 52)),
+        ((62, 110, 34), (68, 120, 46)), ((58, 120, 28), (85, 140, 52)),
+        ((0, 25, 32), (38, 40, 48)),
+        ((72, 65, 22), (80, 100, 30)), ((72, 65, 50), (80, 100, 58)),
+    ]
+    corners = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=float)
+    vertices = [np.array(lo, float) + corners * (np.array(hi, float) - lo) for lo, hi in parts]
+    return np.vstack(vertices), np.vstack([BOX_FACES + 8 * i for i in range(len(parts))])
+
+
+def test_fitted_ratios_inside_bounding_box():
+    fit = fit_skeleton(*box_creature())
+    ratios = np.array([fit.ratios[name] for name in fit.fitted])
+    assert ratios.min() >= 0.0 and ratios.max() <= 1.0
+
+
+def test_tail_tip_on_tail_axis():
+    fit = fit_skeleton(*box_creature())
+    assert "TailTip" in fit.fitted
+    x, y, z = fit.ratios["TailTip"]
+    # The tail box spans x 0-38 of 0-85, y 25-40 of 0-140 and z 32-48 of 15-65 (centre 0.5)
+    assert x < 0.05
+    assert abs(y - 32.5 / 140) < 0.03
+    assert abs(z - 0.5) < 0.03
@@ -0,0 +1,22 @@
+import numpy as np
+
+from toolbox_core.bridge_model import BridgeConfig, FULL_BRIDGE, HALF_BRIDGE, QUARTER_BRIDGE, output_mv_per_v
+from toolbox_core.strain_stream import StrainInverter
+
+BRIDGES = np.array([QUARTER_BRIDGE, HALF_BRIDGE, FULL_BRIDGE])
+
+
+def test_shunt_calibrate_returns_calibrated_reading():
+    config = BridgeConfig(active_gauges=BRIDGES)
+    zero = output_mv_per_v(0.0, config)
+    shunted = output_mv_per_v(0.0, BridgeConfig(active_gauges=BRIDGES, shunt_connected=True))
+    # An amplifier with gain and offset errors in front of the bridges
+    gain, offset = np.array([0.97, 1.02, 1.05]), np.array([0.03, -0.01, 0.2])
+    inverter = StrainInverter(config, 3)
+    step = inverter.shunt_calibrate(shunted * gain + offset, zero * gain + offset)
+
+    np.testing.assert_allclose(inverter.invert((shunted * gain + offset)[None, :])[0], step, rtol=1e-12)
+    np.testing.assert_allclose(inverter.invert((zero * gain + offset)[None, :])[0], 0.0, atol=1e-15)
+    # -Rg / (GF (Rg + Rs)) for the quarter bridge; the half and full bridges see the step on fewer of their arms
+    assert abs(step[0] * 1e6 + 2982.1) < 0.1
+    np.testing.assert_allclose(step[1:] / step[0], [0.5, 0.25], rtol=0.01)
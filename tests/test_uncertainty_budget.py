@@ -0,0 +1,41 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from toolbox_core.bridge_model import BridgeConfig, FULL_BRIDGE, HALF_BRIDGE, QUARTER_BRIDGE
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uncertainty_budget"))
+
+from uncertainty_budget import bridge_budget_model, bridge_inputs  # noqa: E402
+
+BRIDGES = [QUARTER_BRIDGE, HALF_BRIDGE, FULL_BRIDGE]
+
+
+def sample(config: BridgeConfig, n: int, seed: int = 0, **tolerances):
+    tolerances = {"gauge_tolerance": 0.0, "completion_tolerance": 0.0, "gf_tolerance": 0.0,
+                  "shunt_tolerance": 0.0, "lead_tolerance": 0.0, **tolerances}
+    rng = np.random.default_rng(seed)
+    return {name: dist.sample(rng, n) for name, dist in bridge_inputs(config, **tolerances).items()}
+
+
+@pytest.mark.parametrize("active_gauges", BRIDGES)
+@pytest.mark.parametrize("lead_resistance", [0.0, 0.5])
+@pytest.mark.parametrize("shunt_connected", [False, True])
+def test_without_tolerances_indicates_applied_strain(active_gauges, lead_resistance, shunt_connected):
+    config = BridgeConfig(active_gauges=active_gauges, lead_resistance=lead_resistance,
+                          shunt_connected=shunt_connected)
+    result = bridge_budget_model(sample(config, 4), 1e-3, config)
+    np.testing.assert_allclose(result["indicated_strain"], 1000.0, rtol=1e-9)
+
+
+@pytest.mark.parametrize("active_gauges", BRIDGES)
+def test_gauge_tolerance_is_balanced_out(active_gauges):
+    # ±0.3 % on a gauge is an offset of up to ±1500 µε; balancing leaves only the second-order terms
+    config = BridgeConfig(active_gauges=active_gauges)
+    result = bridge_budget_model(sample(config, 100_000, gauge_tolerance=0.003), 1e-3, config)
+    assert np.ptp(result["zero_offset_mv_v"]) > 0.5
+    indicated = result["indicated_strain"]
+    assert abs(indicated.mean() - 1000.0) < 0.01
+    assert indicated.std() < 0.01
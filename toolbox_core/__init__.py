@@ -0,0 +1,44 @@
+"""
+Toolbox Core
+
+GUI-free models shared by the toolbox applications and headless tools. Every
+module depends on NumPy only; importing them never loads Qt, Tk or pyqtgraph.
+
+- specimen_model: tensile specimen geometry, stress and strain
+- hysteresis_model: tanh stress-strain hysteresis loops and their lookup table
+- chain_model, chain_geometry, chain_designer: chainlink closure, link geometry and inverse design
+- bridge_model, bridge_thermal, strain_stream: Wheatstone bridge output, thermal effects and streaming inversion
+- monte_carlo: vectorized Monte Carlo uncertainty engine
+- scaling_model: OBJ model scaling, skeleton joints and view projections
+- skeleton_fit: automatic skeleton fitting from a voxelized mesh
+- mesh_measure: mesh volume, surface area and print/brick mass estimates
+- mesh_slicer: horizontal cross-sections with outline loops and areas
+- brick_voxels: stud/plate occupancy grid and per-layer brick piece counts
+- mesh_render: z-buffered software rendering of a mesh from any direction
+- model_session: several models in one session with a shared mesh cache, skeleton retargeting and bone tables
+- startup: startup profiling and time-to-interactive budgets (standard library only)
+- hotpath: update handler timing, frame-time overlay and Chrome traces (standard library only)
+- eventloop: Tk event-loop latency and sampled cProfile of event handlers (standard library only)
+"""
+
+__all__ = [
+    "specimen_model",
+    "hysteresis_model",
+    "chain_model",
+    "chain_geometry",
+    "chain_designer",
+    "bridge_model",
+    "bridge_thermal",
+    "strain_stream",
+    "monte_carlo",
+    "scaling_model",
+    "skeleton_fit",
+    "mesh_measure",
+    "mesh_slicer",
+    "brick_voxels",
+    "mesh_render",
+    "model_session",
+    "startup",
+    "hotpath",
+    "eventloop",
+]
@@ -0,0 +1,228 @@
+"""
+Brick Voxelization for the Mech Scaler Tool
+
+Converts a model scaled to a print height into a stud grid: cells one stud
+(8 mm) square and one plate (3.2 mm) or brick (9.6 mm) tall, filled where
+the cell centre is inside the mesh. Every stud column casts one vertical
+ray; triangles are binned into the columns their X-Z extent covers, so each
+triangle is tested only against the rays that can hit it. A cell is inside
+where the faces crossed below it wind around it (non-zero rule; the even-odd
+rule counts crossings instead). Rays through shared edges and vertices are
+counted once by a top-left rule, so closed meshes never leak.
+
+The grid is kept bit-packed along Z. Per layer, the cells are split into
+2x4, 2x2, 1x2 and 1x1 pieces on an aligned lattice whose orientation
+alternates between layers, so the layers interlock.
+
+Example:
+    python -m toolbox_core.brick_voxels mechscaler/model.obj --height-cm 60 -o pieces.csv
+"""
+
+import argparse
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .mesh_slicer import BRICK_HEIGHT_MM, PLATE_HEIGHT_MM
+from .scaling_model import STUD_MM, load_mesh, model_bounds, scale_factor
+
+# Piece footprints in studs (x, z), largest first; odd layers use them turned
+PIECES = ((2, 4), (2, 2), (1, 2), (1, 1))
+
+# Triangles per chunk, bounding temporary memory
+CHUNK = 1 << 20
+
+
+@dataclass
+class BrickGrid:
+    """
+    Occupancy of a stud grid, bit-packed along Z: bits has shape
+    (nx, ny, ceil(nz / 8)). Cell (i, j, k) spans i * stud_mm in X,
+    j * layer_mm in Y and k * stud_mm in Z from the scaled model's bounding
+    box minimum.
+    """
+    bits: np.ndarray
+    shape: Tuple[int, int, int]
+    stud_mm: float
+    layer_mm: float
+
+    def occupancy(self) -> np.ndarray:
+        """Boolean cells (nx, ny, nz)."""
+        return np.unpackbits(self.bits, axis=2, count=self.shape[2]).astype(bool)
+
+    def layer(self, j: int) -> np.ndarray:
+        """Boolean cells (nx, nz) of layer j, counted from the base."""
+        return np.unpackbits(self.bits[:, j, :], axis=1, count=self.shape[2]).astype(bool)
+
+    def cell_count(self) -> int:
+        return int(np.unpackbits(self.bits).sum())
+
+    def save(self, path: str) -> None:
+        """Write the packed grid as .npz."""
+        np.savez_compressed(path, bits=self.bits, shape=np.array(self.shape), stud_mm=self.stud_mm,
+                            layer_mm=self.layer_mm)
+
+    @classmethod
+    def load(cls, path: str) -> "BrickGrid":
+        with np.load(path) as data:
+            return cls(data["bits"], tuple(int(n) for n in data["shape"]), float(data["stud_mm"]),
+                       float(data["layer_mm"]))
+
+
+def _column_hits(points: np.ndarray, triangles: np.ndarray, nx: int, nz: int, stud_mm: float):
+    """
+    Every crossing of a vertical ray through a stud column centre with a
+    triangle: column index (i * nz + k), height and direction (+1 where the
+    face turns down, i.e. the ray enters an outward-facing mesh).
+    """
+    xz = points[:, [0, 2]] / stud_mm - 0.5
+    columns, heights, signs = [np.zeros(0, np.int64)], [np.zeros(0)], [np.zeros(0, np.int8)]
+    for begin in range(0, len(triangles), CHUNK):
+        tri = triangles[begin:begin + CHUNK]
+        a, b, c = xz[tri[:, 0]], xz[tri[:, 1]], xz[tri[:, 2]]
+        # The column centres inside each triangle's X-Z bounding box
+        lo = np.ceil(np.minimum(np.minimum(a, b), c)).astype(np.int64)
+        hi = np.floor(np.maximum(np.maximum(a, b), c)).astype(np.int64)
+        np.maximum(lo, 0, out=lo)
+        np.minimum(hi, [nx - 1, nz - 1], out=hi)
+        span = np.maximum(hi - lo + 1, 0)
+        count = span[:, 0] * span[:, 1]
+        twice_area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+        # Most triangles of a fine mesh fall between the rays; vertical ones are never crossed
+        face = np.flatnonzero((count > 0) & (twice_area != 0))
+        tri, lo, span, count = tri[face], lo[face], span[face], count[face]
+        # Counter-clockwise in X-Z from here on; the sign remembers the facing
+        flip = twice_area[face] < 0
+        tri = np.where(flip[:, None], tri[:, [0, 2, 1]], tri)
+        ya, yb, yc = points[tri[:, 0], 1], points[tri[:, 1], 1], points[tri[:, 2], 1]
+        sign = np.where(flip, -1, 1).astype(np.int8)
+
+        owner = np.repeat(np.arange(len(face)), count)
+        offset = np.arange(len(owner)) - np.repeat(np.cumsum(count) - count, count)
+        i = lo[owner, 0] + offset // span[owner, 1]
+        k = lo[owner, 1] + offset % span[owner, 1]
+        p = np.column_stack((i, k)).astype(float)
+
+        # Edge functions, evaluated from the lower-numbered end so that the two triangles on an
+        # edge agree exactly; a centre on an edge belongs to the triangle on its top-left side
+        weights = []
+        inside = np.ones(len(owner), dtype=bool)
+        for start, end in ((1, 2), (2, 0), (0, 1)):
+            swap = (tri[:, start] > tri[:, end])[owner]
+            u = xz[np.where(swap, tri[owner, end], tri[owner, start])]
+            d = xz[np.where(swap, tri[owner, start], tri[owner, end])] - u
+            e = d[:, 0] * (p[:, 1] - u[:, 1]) - d[:, 1] * (p[:, 0] - u[:, 0])
+            np.negative(e, out=e, where=swap)
+            np.negative(d, out=d, where=swap[:, None])
+            top_left = (d[:, 1] < 0) | ((d[:, 1] == 0) & (d[:, 0] > 0))
+            inside &= (e > 0) | ((e == 0) & top_left)
+            weights.append(e)
+        w0, w1, w2 = (w[inside] for w in weights)
+        owner = owner[inside]
+        y = (w0 * ya[owner] + w1 * yb[owner] + w2 * yc[owner]) / (w0 + w1 + w2)
+        columns.append(i[inside] * nz + k[inside])
+        heights.append(y)
+        signs.append(sign[owner])
+    return np.concatenate(columns), np.concatenate(heights), np.concatenate(signs)
+
+
+def voxelize_bricks(vertices: np.ndarray, triangles: np.ndarray, target_height_mm: float,
+                    layer_mm: float = PLATE_HEIGHT_MM, stud_mm: float = STUD_MM, rule: str = "nonzero") -> BrickGrid:
+    """
+    Stud grid of a model printed target_height_mm tall.
+
+    Args:
+        vertices: (n, 3) vertices, Y up.
+        triangles: (t, 3) vertex indices.
+        target_height_mm: Height of the built model.
+        layer_mm: Cell height; PLATE_HEIGHT_MM or BRICK_HEIGHT_MM.
+        stud_mm: Cell width and depth.
+        rule: "nonzero" fills cells the faces wind around, which also joins
+            overlapping parts; "evenodd" fills cells with an odd number of
+            crossings below them.
+    """
+    mins, maxs = model_bounds(vertices)
+    points = (vertices - mins) * scale_factor(target_height_mm, mins, maxs)
+    extent = points.max(axis=0) if len(points) else np.zeros(3)
+    nx = max(int(np.ceil(extent[0] / stud_mm)), 1)
+    ny = max(int(np.ceil(extent[1] / layer_mm)), 1)
+    nz = max(int(np.ceil(extent[2] / stud_mm)), 1)
+
+    column, y, sign = _column_hits(points, triangles, nx, nz, stud_mm)
+    # Each hit changes the winding of the cells in its column whose centres lie above it
+    first_above = np.clip(np.floor(y / layer_mm - 0.5).astype(np.int64) + 1, 0, ny)
+    steps = np.bincount(column * (ny + 1) + first_above, weights=sign if rule == "nonzero" else None,
+                        minlength=nx * nz * (ny + 1))
+    winding = np.cumsum(steps.reshape(nx * nz, ny + 1)[:, :ny].astype(np.int32), axis=1)
+    filled = winding % 2 == 1 if rule == "evenodd" else winding != 0
+    occupancy = filled.reshape(nx, nz, ny).transpose(0, 2, 1)
+    return BrickGrid(np.packbits(occupancy, axis=2), (nx, ny, nz), stud_mm, layer_mm)
+
+
+def layer_pieces(cells: np.ndarray, turned: bool = False) -> Dict[str, int]:
+    """
+    Pieces covering the cells (nx, nz) of one layer, largest first, each
+    size on a lattice aligned to its footprint in both orientations.
+    turned tries each footprint rotated first.
+    """
+    remaining = cells.copy()
+    counts = {}
+    for w, d in PIECES:
+        counts[f"{w}x{d}"] = 0
+        for fx, fz in (((d, w), (w, d)) if turned else ((w, d), (d, w))):
+            nx, nz = remaining.shape[0] // fx * fx, remaining.shape[1] // fz * fz
+            blocks = remaining[:nx, :nz].reshape(nx // fx, fx, nz // fz, fz)
+            full = blocks.all(axis=(1, 3))
+            counts[f"{w}x{d}"] += int(full.sum())
+            blocks[full[:, None, :, None].repeat(fx, axis=1).repeat(fz, axis=3)] = False
+            if w == d:
+                break
+    return counts
+
+
+def piece_counts(grid: BrickGrid) -> List[Dict[str, int]]:
+    """Pieces per layer from the base, with "cells" the number of filled cells."""
+    rows = []
+    for j in range(grid.shape[1]):
+        cells = grid.layer(j)
+        rows.append({"cells": int(cells.sum()), **layer_pieces(cells, turned=j % 2 == 1)})
+    return rows
+
+
+def write_pieces_csv(grid: BrickGrid, path: str) -> List[Dict[str, int]]:
+    """One row per layer: index, height of its base in mm, filled cells and pieces of each size."""
+    rows = piece_counts(grid)
+    names = [f"{w}x{d}" for w, d in PIECES]
+    with open(path, "w") as f:
+        f.write(",".join(["layer", "base_mm", "cells"] + names) + "\n")
+        for j, row in enumerate(rows):
+            f.write(",".join([str(j), f"{j * grid.layer_mm:.1f}", str(row["cells"])] + [str(row[n]) for n in names]) + "\n")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voxelize an OBJ model into a stud grid and count pieces per layer.")
+    parser.add_argument("obj", help="OBJ mesh, Y up")
+    parser.add_argument("--height-cm", type=float, default=60.0, help="Model height in cm (default: 60)")
+    parser.add_argument("--bricks", action="store_true",
+                        help=f"Brick layers ({BRICK_HEIGHT_MM} mm) instead of plates ({PLATE_HEIGHT_MM} mm)")
+    parser.add_argument("--evenodd", action="store_true", help="Even-odd instead of non-zero fill rule")
+    parser.add_argument("-o", "--output", default="pieces.csv", help="Per-layer piece counts CSV (default: pieces.csv)")
+    parser.add_argument("--npz", help="Also write the bit-packed grid to this .npz file")
+    args = parser.parse_args()
+
+    vertices, _, triangles = load_mesh(args.obj)
+    grid = voxelize_bricks(vertices, triangles, args.height_cm * 10,
+                           BRICK_HEIGHT_MM if args.bricks else PLATE_HEIGHT_MM,
+                           rule="evenodd" if args.evenodd else "nonzero")
+    rows = write_pieces_csv(grid, args.output)
+    totals = {f"{w}x{d}": sum(row[f"{w}x{d}"] for row in rows) for w, d in PIECES}
+    print(f"Grid {grid.shape[0]} x {grid.shape[1]} x {grid.shape[2]}, {grid.cell_count()} cells")
+    print("Pieces: " + ", ".join(f"{count} {name}" for name, count in totals.items()) + f" -> {args.output}")
+    if args.npz:
+        grid.save(args.npz)
+
+
+if __name__ == "__main__":
+    main()
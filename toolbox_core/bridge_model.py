@@ -0,0 +1,255 @@
+"""
+Bridge Model for the Wheatstone Bridge Tool
+
+Vectorized strain gauge bridge equations: arm resistances, bridge output and
+shunt calibration for quarter, half and full bridges with lead-wire resistance.
+
+Arm layout (matching the GUI canvas): excitation across top/bottom, output
+across left/right.
+    R1: top-left     R2: top-right
+    R4: bottom-left  R3: bottom-right
+    Vout/Vin = R3/(R2+R3) - R4/(R1+R4)
+"""
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+
+QUARTER_BRIDGE = 1  # R1 active
+HALF_BRIDGE = 2  # R1 and R3 active, opposite arms (strains add)
+FULL_BRIDGE = 4  # R1, R3 in tension and R2, R4 in compression
+
+
+@dataclass
+class BridgeConfig:
+    """
+    Bridge setup. Any field may be a NumPy array to evaluate many channels at once.
+    """
+    base_resistance: float = 120.0  # Ω, nominal gauge and completion resistance
+    gauge_factor: float = 2.0
+    active_gauges: int = QUARTER_BRIDGE
+    shunt_resistance: float = 20000.0  # Ω, placed across R1
+    shunt_connected: bool = False
+    lead_resistance: float = 0.0  # Ω per lead wire
+    lead_wires: int = 2  # 2 or 3; full bridges take the leads in the excitation lines
+
+
+@dataclass
+class BridgeOutput:
+    """Arrays produced by bridge_response."""
+    r1: np.ndarray
+    r2: np.ndarray
+    r3: np.ndarray
+    r4: np.ndarray
+    vout_vin: np.ndarray  # V/V
+    mv_v: np.ndarray  # mV/V
+    total_strain: np.ndarray  # Indicated strain (ratio): applied, or read through the shunt step
+
+
+def arm_strains(strain, active_gauges=QUARTER_BRIDGE):
+    """
+    Strain seen by each arm for a given bridge arrangement.
+
+    Returns:
+        tuple: (e1, e2, e3, e4) broadcast arrays.
+    """
+    eps = np.asarray(strain, dtype=float)
+    active = np.asarray(active_gauges)
+    e1 = eps
+    e3 = np.where(active >= HALF_BRIDGE, eps, 0.0)
+    e2 = np.where(active >= FULL_BRIDGE, -eps, 0.0)
+    e4 = e2
+    return e1, e2, e3, e4
+
+
+def lead_split(config: BridgeConfig = BridgeConfig()):
+    """
+    Lead resistance added to each gauge arm and to its adjacent completion arm.
+
+    Full bridges take their leads in the excitation lines, so both are zero.
+
+    Returns:
+        tuple: (in_gauge, in_adjacent) in Ω.
+    """
+    r_lead = np.asarray(config.lead_resistance, dtype=float)
+    three_wire = np.asarray(config.lead_wires) == 3
+    completed = np.asarray(config.active_gauges) < FULL_BRIDGE
+    in_gauge = np.where(completed, np.where(three_wire, r_lead, 2 * r_lead), 0.0)
+    in_adjacent = np.where(completed & three_wire, r_lead, 0.0)
+    return in_gauge, in_adjacent
+
+
+def arm_resistances(strain, config: BridgeConfig = BridgeConfig()):
+    """
+    Resistance of each bridge arm including lead wires and shunt.
+
+    Args:
+        strain: Mechanical strain (ratio, e.g. 0.01 for 1%). Scalar or array.
+        config: Bridge setup.
+
+    Returns:
+        tuple: (r1, r2, r3, r4) arrays in Ω.
+    """
+    return resistances_from_arm_strains(*arm_strains(strain, config.active_gauges), config)
+
+
+def resistances_from_arm_strains(e1, e2, e3, e4, config: BridgeConfig = BridgeConfig()):
+    """
+    Arm resistances for explicit per-arm strains, including lead wires and shunt.
+
+    Lets callers add strain components that arm_strains does not model, such as
+    the thermal output of every bonded gauge.
+    """
+    rb = np.asarray(config.base_resistance, dtype=float)
+    gf = np.asarray(config.gauge_factor, dtype=float)
+    r1, r2, r3, r4 = (rb * (1.0 + gf * e) for e in (e1, e2, e3, e4))
+
+    # Lead wires of quarter/half bridges: 2-wire puts both leads in the gauge arm;
+    # 3-wire moves one into the adjacent arm on the same output node so they cancel.
+    # R1 pairs with R4 on the Out- node, R3 with R2 on the Out+ node.
+    if np.any(np.asarray(config.lead_resistance) != 0):
+        in_gauge, in_adjacent = lead_split(config)
+        half = np.asarray(config.active_gauges) == HALF_BRIDGE
+        r1 = r1 + in_gauge
+        r4 = r4 + in_adjacent
+        r3 = r3 + np.where(half, in_gauge, 0.0)
+        r2 = r2 + np.where(half, in_adjacent, 0.0)
+
+    # Shunt calibration resistor across R1
+    rs = np.asarray(config.shunt_resistance, dtype=float)
+    r1 = np.where(np.asarray(config.shunt_connected), r1 * rs / (r1 + rs), r1)
+    return r1, r2, r3, r4
+
+
+def bridge_ratio(r1, r2, r3, r4):
+    """Bridge output Vout/Vin = R3/(R2+R3) - R4/(R1+R4)."""
+    return r3 / (r2 + r3) - r4 / (r1 + r4)
+
+
+def excitation_factor(r1, r2, r3, r4, config: BridgeConfig = BridgeConfig()):
+    """
+    Fraction of the excitation reaching a full bridge through its two excitation leads.
+
+    Quarter and half bridges are completed at the instrument, so their leads are
+    modelled as arm resistance instead and the factor is 1.
+    """
+    r_lead = np.asarray(config.lead_resistance, dtype=float)
+    r_in = (r1 + r4) * (r2 + r3) / (r1 + r2 + r3 + r4)
+    full = np.asarray(config.active_gauges) >= FULL_BRIDGE
+    return np.where(full, r_in / (r_in + 2 * r_lead), 1.0)
+
+
+def shunt_equivalent_strain(config: BridgeConfig = BridgeConfig()):
+    """Strain simulated by shunting the gauge arm: -Rg / (GF * (Rg + Rs))."""
+    rb = np.asarray(config.base_resistance, dtype=float)
+    return -rb / (np.asarray(config.gauge_factor, dtype=float) * (rb + np.asarray(config.shunt_resistance, dtype=float)))
+
+
+def output_mv_per_v(strain, config: BridgeConfig = BridgeConfig()):
+    """Bridge output in mV/V for the given strain (ratio). Vectorized over strain and config."""
+    arms = arm_resistances(strain, config)
+    return bridge_ratio(*arms) * excitation_factor(*arms, config) * 1000.0
+
+
+def bridge_response(strain, config: BridgeConfig = BridgeConfig()) -> BridgeOutput:
+    """
+    Full bridge state for the given strain.
+
+    Args:
+        strain: Mechanical strain (ratio). Scalar or array.
+        config: Bridge setup.
+
+    Returns:
+        BridgeOutput: Arm resistances, output and total indicated strain.
+    """
+    r1, r2, r3, r4 = arm_resistances(strain, config)
+    vout_vin = bridge_ratio(r1, r2, r3, r4) * excitation_factor(r1, r2, r3, r4, config)
+    # Shunted, the indicated strain is what an instrument converting without the shunt
+    # reads; shunt_equivalent_strain() is that reading for a quarter bridge only
+    total_strain = np.asarray(strain, dtype=float)
+    shunt = np.asarray(config.shunt_connected)
+    if np.any(shunt):
+        indicated = strain_from_output(vout_vin * 1000.0, replace(config, shunt_connected=False))
+        total_strain = np.where(shunt, indicated, total_strain)
+    return BridgeOutput(r1, r2, r3, r4, vout_vin, vout_vin * 1000.0, total_strain)
+
+
+def _positive_root(a, b, c):
+    """Positive root of a*u^2 + b*u + c = 0 (roots of opposite sign), cancellation-free."""
+    sqrt_disc = np.sqrt(b * b - 4 * a * c)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(b < 0, (sqrt_disc - b) / (2 * a), 2 * c / (-b - sqrt_disc))
+
+
+def _strain_quarter(v, config: BridgeConfig):
+    """Exact quarter bridge inverse: solve for R1, remove the shunt, then the leads."""
+    rb = np.asarray(config.base_resistance, dtype=float)
+    in_gauge, in_adjacent = lead_split(config)
+    r4 = rb + in_adjacent
+    r1 = r4 / (0.5 - v) - r4  # From Vout/Vin = 1/2 - R4/(R1+R4)
+    rs = np.asarray(config.shunt_resistance, dtype=float)
+    r1 = np.where(np.asarray(config.shunt_connected), r1 * rs / (rs - r1), r1)
+    return (r1 - in_gauge - rb) / (rb * np.asarray(config.gauge_factor, dtype=float))
+
+
+def _strain_half(v, config: BridgeConfig):
+    """
+    Exact half bridge inverse for the active arm resistance u = R3 (= R1 before the shunt).
+
+    Unshunted: Vout/Vin = (u - c)/(u + c) with c = R2 = R4. With the shunt s across R1
+    the output equation becomes [s - V(s+c)] u^2 - [c^2 (1+V) + 2Vcs] u - c^2 s (1+V) = 0.
+    """
+    rb = np.asarray(config.base_resistance, dtype=float)
+    in_gauge, in_adjacent = lead_split(config)
+    c = rb + in_adjacent
+    s = np.asarray(config.shunt_resistance, dtype=float)
+    u_plain = c * (1 + v) / (1 - v)
+    with np.errstate(invalid='ignore'):
+        u_shunt = _positive_root(s - v * (s + c), -(c * c * (1 + v) + 2 * v * c * s), -c * c * s * (1 + v))
+    u = np.where(np.asarray(config.shunt_connected), u_shunt, u_plain)
+    return (u - in_gauge - rb) / (rb * np.asarray(config.gauge_factor, dtype=float))
+
+
+def _strain_full(v, config: BridgeConfig, iterations: int = 4):
+    """
+    Full bridge inverse. Without the shunt the output is exactly GF*eps scaled by the
+    excitation-lead factor Rb/(Rb + 2 R_lead); with the shunt a few Newton steps on
+    the forward model refine that estimate.
+    """
+    rb = np.asarray(config.base_resistance, dtype=float)
+    gf = np.asarray(config.gauge_factor, dtype=float)
+    k = rb / (rb + 2 * np.asarray(config.lead_resistance, dtype=float))
+    shunt = np.asarray(config.shunt_connected)
+    if not np.any(shunt):
+        return v / (k * gf)
+
+    v0 = output_mv_per_v(0.0, config) / 1000.0
+    eps = (v - v0) / (k * gf)
+    h = 1e-7
+    for _ in range(iterations):
+        f = output_mv_per_v(eps, config) / 1000.0 - v
+        df = (output_mv_per_v(eps + h, config) - output_mv_per_v(eps - h, config)) / (2000.0 * h)
+        eps = eps - f / df
+    return np.where(shunt, eps, v / (k * gf))
+
+
+def strain_from_output(mv_v, config: BridgeConfig = BridgeConfig()):
+    """
+    Exact inverse of output_mv_per_v: strain (ratio) from bridge output in mV/V.
+
+    Vectorized over mv_v and array-valued configs. Mixed bridge types are
+    supported but evaluate every branch; see strain_stream.StrainInverter for
+    grouped per-channel streaming.
+    """
+    v = np.asarray(mv_v, dtype=float) / 1000.0
+    active = np.asarray(config.active_gauges)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if active.ndim == 0:
+            kernel = {QUARTER_BRIDGE: _strain_quarter, HALF_BRIDGE: _strain_half, FULL_BRIDGE: _strain_full}[int(active)]
+            return kernel(v, config)
+        return np.select(
+            [active == QUARTER_BRIDGE, active == HALF_BRIDGE],
+            [_strain_quarter(v, config), _strain_half(v, config)],
+            _strain_full(v, config),
+        )
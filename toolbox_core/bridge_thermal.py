@@ -0,0 +1,253 @@
+"""
+Thermal Model for the Wheatstone Bridge Tool
+
+Temperature effects on a strain gauge bridge, vectorized over temperature x
+strain grids and over many channel setups at once:
+
+- Thermal output (apparent strain) of every bonded gauge from its grid TCR and
+  the expansion mismatch between grid and specimen:
+      eps_app = (tcr / GF + cte_specimen - cte_gauge) * (T - T_ref)
+- Gauge factor drift: GF(T) = GF * (1 + gf_tempco * (T - T_ref))
+- Lead wire resistance drift: R_lead(T) = R_lead * (1 + lead_tcr * (T - T_ref))
+- Dummy-gauge compensation: the half-bridge arrangement of one active gauge in
+  R1 and an unstrained gauge on the same material in the adjacent arm R4, whose
+  thermal output cancels the active gauge's.
+
+The instrument is assumed to convert with the nominal setup at the reference
+temperature, so the indicated strain error is what a compensation table removes.
+
+Example:
+    python -m toolbox_core.bridge_thermal --bridge quarter dummy --gauge-factor 2.0 2.1 \\
+        --specimen-cte 11.7 23.0 --temperature -20 80 5 -o compensation.csv
+"""
+
+import argparse
+from dataclasses import dataclass, fields, replace
+from typing import Dict, Sequence
+
+import numpy as np
+
+from .bridge_model import (
+    BridgeConfig, arm_strains, resistances_from_arm_strains, bridge_ratio, excitation_factor, strain_from_output,
+    QUARTER_BRIDGE, HALF_BRIDGE, FULL_BRIDGE,
+)
+
+
+@dataclass
+class ThermalConfig:
+    """
+    Thermal properties of the gauge installation. Any field may be a NumPy array.
+
+    Defaults describe an uncompensated constantan foil gauge on steel.
+    """
+    reference_temperature: float = 24.0  # °C, temperature of the nominal setup
+    gauge_tcr: float = 20e-6  # 1/°C, grid temperature coefficient of resistance
+    gauge_cte: float = 14.9e-6  # 1/°C, grid expansion coefficient
+    specimen_cte: float = 11.7e-6  # 1/°C, specimen expansion coefficient
+    gf_tempco: float = 1.3e-4  # 1/°C, relative gauge factor change
+    lead_tcr: float = 3.93e-3  # 1/°C, copper lead wires at the gauge temperature
+    dummy_gauge: bool = False  # Quarter bridges only: unstrained gauge in R4
+
+
+def apparent_strain(temperature, thermal: ThermalConfig = ThermalConfig(), gauge_factor=2.0):
+    """Thermal output (ratio) of a bonded gauge at the given temperature (°C)."""
+    dt = np.asarray(temperature, dtype=float) - thermal.reference_temperature
+    return (np.asarray(thermal.gauge_tcr) / np.asarray(gauge_factor, dtype=float)
+            + np.asarray(thermal.specimen_cte) - np.asarray(thermal.gauge_cte)) * dt
+
+
+def config_at_temperature(temperature, config: BridgeConfig = BridgeConfig(),
+                          thermal: ThermalConfig = ThermalConfig()) -> BridgeConfig:
+    """Bridge setup with the gauge factor and lead resistance drifted to the given temperature."""
+    dt = np.asarray(temperature, dtype=float) - thermal.reference_temperature
+    return replace(
+        config,
+        gauge_factor=np.asarray(config.gauge_factor, dtype=float) * (1.0 + np.asarray(thermal.gf_tempco) * dt),
+        lead_resistance=np.asarray(config.lead_resistance, dtype=float) * (1.0 + np.asarray(thermal.lead_tcr) * dt),
+    )
+
+
+def thermal_arm_strains(strain, temperature, config: BridgeConfig = BridgeConfig(),
+                        thermal: ThermalConfig = ThermalConfig()):
+    """
+    Mechanical plus thermal strain seen by each arm.
+
+    Every gauge arm (active or dummy) picks up the apparent strain; completion
+    resistors in the instrument do not.
+
+    Returns:
+        tuple: (e1, e2, e3, e4) broadcast arrays.
+    """
+    active = np.asarray(config.active_gauges)
+    dummy = np.asarray(thermal.dummy_gauge) & (active == QUARTER_BRIDGE)
+    e1, e2, e3, e4 = arm_strains(strain, active)
+    app = apparent_strain(temperature, thermal, config.gauge_factor)
+    return (
+        e1 + app,
+        e2 + np.where(active >= FULL_BRIDGE, app, 0.0),
+        e3 + np.where(active >= HALF_BRIDGE, app, 0.0),
+        e4 + np.where((active >= FULL_BRIDGE) | dummy, app, 0.0),
+    )
+
+
+def thermal_output_mv_per_v(strain, temperature, config: BridgeConfig = BridgeConfig(),
+                            thermal: ThermalConfig = ThermalConfig()):
+    """Bridge output in mV/V at the given strain and temperature. Broadcasts strain, temperature and fields."""
+    hot = config_at_temperature(temperature, config, thermal)
+    arms = resistances_from_arm_strains(*thermal_arm_strains(strain, temperature, hot, thermal), hot)
+    return bridge_ratio(*arms) * excitation_factor(*arms, hot) * 1000.0
+
+
+def indicated_strain(strain, temperature, config: BridgeConfig = BridgeConfig(),
+                     thermal: ThermalConfig = ThermalConfig()):
+    """Strain reported by an instrument that converts with the nominal setup at the reference temperature."""
+    return strain_from_output(thermal_output_mv_per_v(strain, temperature, config, thermal), config)
+
+
+def thermal_error_grid(strains, temperatures, config: BridgeConfig = BridgeConfig(),
+                       thermal: ThermalConfig = ThermalConfig()):
+    """
+    Indicated minus applied strain over a temperature x strain grid.
+
+    Returns:
+        np.ndarray: Shape (..., len(temperatures), len(strains)), where the
+        leading axes are those of array-valued config fields.
+    """
+    eps = np.asarray(strains, dtype=float)[None, :]
+    temp = np.asarray(temperatures, dtype=float)[:, None]
+    return indicated_strain(eps, temp, _expand(config, 2), _expand(thermal, 2)) - eps
+
+
+def _expand(setup, n_axes: int):
+    """Append n_axes length-1 axes to every array field so channel setups broadcast against a grid."""
+    return replace(setup, **{
+        f.name: np.asarray(getattr(setup, f.name)).reshape(np.shape(getattr(setup, f.name)) + (1,) * n_axes)
+        for f in fields(setup)
+    })
+
+
+TABLE_COLUMNS = (
+    "base_resistance", "gauge_factor", "active_gauges", "dummy_gauge", "lead_resistance", "lead_wires",
+    "gauge_tcr", "gauge_cte", "specimen_cte", "gf_tempco",
+    "thermal_output_per_c", "comp_c0", "comp_c1", "comp_c2",
+    "max_error_uncompensated", "max_error_compensated",
+)
+
+
+def compensation_table(config: BridgeConfig, thermal: ThermalConfig, temperatures: Sequence[float],
+                       strains: Sequence[float], chunk: int = 4096) -> Dict[str, np.ndarray]:
+    """
+    Temperature compensation for a batch of channel setups.
+
+    Fields of config and thermal are broadcast to one value per channel. For each
+    channel the zero-strain indicated strain is fitted with a quadratic in
+    (T - T_ref); subtracting comp_c0 + comp_c1*dT + comp_c2*dT^2 from the reading
+    compensates it. The remaining error over the full temperature x strain grid
+    (gauge factor drift and bridge nonlinearity) is reported alongside.
+
+    Args:
+        config: Bridge setups, scalar or per-channel array fields.
+        thermal: Thermal properties, scalar or per-channel array fields.
+        temperatures: Temperature grid (°C).
+        strains: Mechanical strain grid (ratio).
+        chunk: Channels evaluated per pass to bound memory.
+
+    Returns:
+        dict: Per-channel columns keyed by TABLE_COLUMNS. Strain columns are
+        ratios; thermal_output_per_c is the fitted slope at T_ref (ratio/°C).
+    """
+    shape = np.broadcast_shapes(*(np.shape(getattr(config, f.name)) for f in fields(BridgeConfig)),
+                                *(np.shape(getattr(thermal, f.name)) for f in fields(ThermalConfig)))
+    n = int(np.prod(shape))
+    config = replace(config, **{f.name: np.broadcast_to(getattr(config, f.name), shape).ravel()
+                                for f in fields(BridgeConfig)})
+    thermal = replace(thermal, **{f.name: np.broadcast_to(getattr(thermal, f.name), shape).ravel()
+                                  for f in fields(ThermalConfig)})
+
+    temperatures = np.asarray(temperatures, dtype=float)
+    strains = np.asarray(strains, dtype=float)
+    out = {name: np.empty(n) for name in TABLE_COLUMNS[-6:]}
+    for start in range(0, n, chunk):
+        part = slice(start, start + chunk)
+        cfg = replace(config, **{f.name: getattr(config, f.name)[part] for f in fields(BridgeConfig)})
+        thm = replace(thermal, **{f.name: getattr(thermal, f.name)[part] for f in fields(ThermalConfig)})
+        error = thermal_error_grid(strains, temperatures, cfg, thm)  # (channels, T, S)
+
+        # Quadratic in dT through the zero-strain thermal output, all channels in one solve
+        dt = temperatures[:, None] - thm.reference_temperature  # (T, channels)
+        zero = indicated_strain(0.0, temperatures[None, :], _expand(cfg, 1), _expand(thm, 1))  # (channels, T)
+        vander = np.stack([np.ones_like(dt), dt, dt * dt], axis=-1).transpose(1, 0, 2)  # (channels, T, 3)
+        coeffs = np.linalg.solve(vander.transpose(0, 2, 1) @ vander,
+                                 (vander.transpose(0, 2, 1) @ zero[..., None]))[..., 0]
+        correction = (vander @ coeffs[..., None])[..., 0]  # (channels, T)
+
+        out["comp_c0"][part], out["comp_c1"][part], out["comp_c2"][part] = coeffs.T
+        out["thermal_output_per_c"][part] = coeffs[:, 1]
+        out["max_error_uncompensated"][part] = np.max(np.abs(error), axis=(1, 2))
+        out["max_error_compensated"][part] = np.max(np.abs(error - correction[..., None]), axis=(1, 2))
+
+    table = {name: getattr(config if hasattr(config, name) else thermal, name) for name in TABLE_COLUMNS[:10]}
+    table.update(out)
+    return table
+
+
+def write_csv(table: Dict[str, np.ndarray], path: str) -> None:
+    """Write a compensation table as CSV; strain columns in µε (per °C for the slope)."""
+    micro = {"thermal_output_per_c", "comp_c0", "comp_c1", "comp_c2", "max_error_uncompensated",
+             "max_error_compensated"}
+    columns = [np.asarray(table[name], dtype=float) * (1e6 if name in micro else 1.0) for name in TABLE_COLUMNS]
+    header = ",".join(f"{name}_ue" if name in micro else name for name in TABLE_COLUMNS)
+    fmt = ["%.4f", "%.4f", "%d", "%d", "%.4f", "%d", "%.6g", "%.6g", "%.6g", "%.6g"] + ["%.6g"] * 6
+    np.savetxt(path, np.column_stack(columns), fmt=fmt, delimiter=",", header=header, comments="")
+
+
+BRIDGE_CHOICES = {"quarter": (QUARTER_BRIDGE, False), "dummy": (QUARTER_BRIDGE, True),
+                  "half": (HALF_BRIDGE, False), "full": (FULL_BRIDGE, False)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate gauge temperature compensation tables.")
+    parser.add_argument("--bridge", nargs='+', choices=tuple(BRIDGE_CHOICES), default=["quarter"],
+                        help="Bridge arrangements; 'dummy' is a quarter bridge with a dummy gauge in R4")
+    parser.add_argument("--resistance", nargs='+', type=float, default=[120.0], help="Gauge resistances (Ω)")
+    parser.add_argument("--gauge-factor", nargs='+', type=float, default=[2.0], help="Gauge factors")
+    parser.add_argument("--lead-resistance", nargs='+', type=float, default=[0.0], help="Lead resistance per wire (Ω)")
+    parser.add_argument("--lead-wires", nargs='+', type=int, choices=(2, 3), default=[3], help="Lead wiring")
+    parser.add_argument("--gauge-tcr", nargs='+', type=float, default=[20.0], help="Grid TCR (ppm/°C)")
+    parser.add_argument("--gauge-cte", nargs='+', type=float, default=[14.9], help="Grid expansion (ppm/°C)")
+    parser.add_argument("--specimen-cte", nargs='+', type=float, default=[11.7], help="Specimen expansion (ppm/°C)")
+    parser.add_argument("--temperature", nargs=3, type=float, default=[-20.0, 80.0, 5.0], metavar=("MIN", "MAX", "STEP"),
+                        help="Temperature grid in °C (default: -20 80 5)")
+    parser.add_argument("--strain", nargs=3, type=float, default=[-5000.0, 5000.0, 500.0], metavar=("MIN", "MAX", "STEP"),
+                        help="Strain grid in µε (default: -5000 5000 500)")
+    parser.add_argument("--reference", type=float, default=24.0, help="Reference temperature in °C (default: 24)")
+    parser.add_argument("-o", "--output", default="compensation.csv", help="Output CSV (default: compensation.csv)")
+    args = parser.parse_args()
+
+    # Every combination of the listed values is one channel setup
+    bridge, resistance, gf, lead, wires, tcr, gcte, scte = (g.ravel() for g in np.meshgrid(
+        np.arange(len(args.bridge)), args.resistance, args.gauge_factor, args.lead_resistance, args.lead_wires,
+        args.gauge_tcr, args.gauge_cte, args.specimen_cte, indexing='ij'))
+    arrangement = [BRIDGE_CHOICES[args.bridge[int(i)]] for i in bridge]
+    config = BridgeConfig(
+        base_resistance=resistance, gauge_factor=gf,
+        active_gauges=np.array([a for a, _ in arrangement]),
+        lead_resistance=lead, lead_wires=wires.astype(int),
+    )
+    thermal = ThermalConfig(
+        reference_temperature=args.reference, gauge_tcr=tcr * 1e-6, gauge_cte=gcte * 1e-6, specimen_cte=scte * 1e-6,
+        dummy_gauge=np.array([d for _, d in arrangement]),
+    )
+
+    t_min, t_max, t_step = args.temperature
+    s_min, s_max, s_step = args.strain
+    temperatures = np.arange(t_min, t_max + t_step / 2, t_step)
+    strains = np.arange(s_min, s_max + s_step / 2, s_step) * 1e-6
+
+    table = compensation_table(config, thermal, temperatures, strains)
+    write_csv(table, args.output)
+    print(f"Wrote {len(table['gauge_factor'])} channel setups to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
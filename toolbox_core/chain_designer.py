@@ -0,0 +1,133 @@
+"""
+Inverse Chain Designer for Chainlink Mechanics
+
+Searches integer link counts and manufacturable red/green link lengths for
+chains that close at a target inner diameter, and returns the Pareto set of
+the closest designs.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .chain_model import ChainDimensions, angle_from_chord, green_length_for_diameter, inner_diameter_for_green_length
+
+
+DESIGN_COLUMNS = ("total_links", "l_red", "l_green", "d_inner", "error", "special_deviation")
+
+
+@dataclass
+class DesignRanges:
+    """Manufacturable search ranges (mm for lengths)."""
+    links: Tuple[int, int] = (2, 200)  # Inclusive total link count range
+    red: Tuple[float, float, float] = (3.0, 20.0, 0.05)  # min, max, step
+    green: Tuple[float, float, float] = (3.0, 20.0, 0.05)  # min, max, step
+
+
+def _grid(lo: float, hi: float, step: float) -> np.ndarray:
+    return np.round(np.arange(lo, hi + step / 2, step), 6)
+
+
+def feasible_link_counts(target_diameter: float, tolerance: float, ranges: DesignRanges = DesignRanges(),
+                         dims: ChainDimensions = ChainDimensions()) -> np.ndarray:
+    """
+    Link counts that can close within tolerance of the target for some red/green length.
+
+    The angle sum grows with both the link count and the special link lengths,
+    so a count is feasible only if the shortest specials on the largest allowed
+    radius still fit in a full turn and the longest specials on the smallest
+    allowed radius reach it.
+    """
+    r_lo = max((target_diameter - tolerance) / 2.0 + dims.r_small, 1e-9)
+    r_hi = (target_diameter + tolerance) / 2.0 + dims.r_small
+    n = np.arange(ranges.links[0], ranges.links[1] + 1, dtype=float)
+
+    def angle_sum(R, l_special_min, l_special_max):
+        fixed = (n - 2) * angle_from_chord(dims.d_standard, R) + n * angle_from_chord(dims.d_interlink, R)
+        return fixed + angle_from_chord(l_special_min, R) + angle_from_chord(l_special_max, R)
+
+    shortest = angle_sum(r_hi, ranges.red[0], ranges.green[0])
+    # Chords too long for the smallest radius saturate at half a turn each
+    longest = angle_sum(r_lo, min(ranges.red[1], 2 * r_lo), min(ranges.green[1], 2 * r_lo))
+    feasible = (shortest <= 2 * np.pi) & (longest >= 2 * np.pi)
+    return n[feasible].astype(int)
+
+
+def pareto_front(error: np.ndarray, deviation: np.ndarray) -> np.ndarray:
+    """Indices of the designs not beaten on both objectives, ordered by error."""
+    order = np.lexsort((deviation, error))
+    best_so_far = np.minimum.accumulate(deviation[order])
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = deviation[order][1:] < best_so_far[:-1]
+    return order[keep]
+
+
+def inverse_design(target_diameter: float, tolerance: float = 0.5, ranges: DesignRanges = DesignRanges(),
+                   dims: ChainDimensions = ChainDimensions()) -> Dict[str, np.ndarray]:
+    """
+    Find link counts and lengths that close the chain at a target inner diameter.
+
+    For every feasible link count and red length, the closed-form closure at
+    the two tolerance limits bounds the green lengths that can fit; only the
+    manufacturable green lengths inside that window are re-solved for their
+    true diameter.
+
+    Args:
+        target_diameter: Target inner diameter (mm).
+        tolerance: Accepted absolute diameter error (mm).
+        ranges: Manufacturable search ranges.
+        dims: Fixed link dimensions.
+
+    Returns:
+        dict: Columns keyed by DESIGN_COLUMNS for the Pareto set minimising the
+        diameter error and the special link deviation (|l_red - d_standard| +
+        |l_green - d_standard|), ordered by error. Empty if nothing fits.
+    """
+    links = feasible_link_counts(target_diameter, tolerance, ranges, dims)
+    empty = {name: np.array([]) for name in DESIGN_COLUMNS}
+    if len(links) == 0:
+        return empty
+
+    red = _grid(*ranges.red)
+    g_min, g_max, g_step = ranges.green
+    n_grid, red_grid = np.meshgrid(links, red, indexing='ij')
+
+    # The closing green length grows with the diameter, so the green lengths within
+    # tolerance lie between the closed-form solutions at the two diameter limits
+    green_lo = green_length_for_diameter(max(target_diameter - tolerance, 0.0), n_grid, red_grid, dims)
+    green_hi = green_length_for_diameter(target_diameter + tolerance, n_grid, red_grid, dims)
+    green_lo = np.where(np.isnan(green_lo), g_min, green_lo)
+
+    max_index = np.floor((g_max - g_min) / g_step + 1e-9)
+    first = np.maximum(np.ceil((green_lo - g_min) / g_step - 1e-9), 0)
+    last = np.minimum(np.floor((green_hi - g_min) / g_step + 1e-9), max_index)
+    width = np.where(np.isfinite(last) & (last >= first), last - first + 1, 0).astype(int)
+    if width.max(initial=0) == 0:
+        return empty
+
+    # Enumerate every manufacturable green length inside each window
+    offsets = np.arange(width.max())
+    valid = offsets < width[..., None]
+    candidates = first[..., None] + offsets
+    n_c = np.broadcast_to(n_grid[..., None], candidates.shape)[valid]
+    red_c = np.broadcast_to(red_grid[..., None], candidates.shape)[valid]
+    green_c = np.round(g_min + candidates[valid] * g_step, 6)
+    _, d_inner = inner_diameter_for_green_length(n_c, green_c, red_c, dims)
+    error = np.abs(d_inner - target_diameter)
+
+    ok = error <= tolerance
+    if not ok.any():
+        return empty
+    n_c, red_c, green_c, d_inner, error = n_c[ok], red_c[ok], green_c[ok], d_inner[ok], error[ok]
+    deviation = np.abs(red_c - dims.d_standard) + np.abs(green_c - dims.d_standard)
+
+    front = pareto_front(error, deviation)
+    return {
+        "total_links": n_c[front].astype(int),
+        "l_red": red_c[front],
+        "l_green": green_c[front],
+        "d_inner": d_inner[front],
+        "error": error[front],
+        "special_deviation": deviation[front],
+    }
@@ -0,0 +1,108 @@
+"""
+Chain Geometry Builder for Chainlink Mechanics
+
+Builds the plot arrays for a closed chain in one vectorized pass: link
+endpoints come from a cumulative sum of chord angles, and the endpoint circle
+template is broadcast into one preallocated NaN-separated array per link type.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from .chain_model import ChainDimensions, angle_from_chord
+
+
+LINK_TYPES = ("std", "green", "red")
+
+
+def link_types(total_links: int) -> np.ndarray:
+    """Link type index per link: 0 standard, 1 green (first link), 2 red (opposite the green)."""
+    types = np.zeros(total_links, dtype=np.intp)
+    types[0] = 1
+    types[total_links // 2] = 2
+    return types
+
+
+def link_endpoints(total_links: int, r_chain: float, l_green: float, l_red: float,
+                   dims: ChainDimensions = ChainDimensions()):
+    """
+    Start and end points of every link around the chain circle.
+
+    Links are laid out counter-clockwise from angle 0, each followed by an
+    interlink. Chords that do not fit on the circle get a zero angle.
+
+    Returns:
+        tuple: (types, p1, p2) with p1 and p2 of shape (total_links, 2).
+    """
+    types = link_types(total_links)
+    chord_lengths = np.array([dims.d_standard, l_green, l_red, dims.d_interlink], dtype=float)
+    chord_angles = np.nan_to_num(angle_from_chord(chord_lengths, r_chain), nan=0.0) if r_chain > 0 else np.zeros(4)
+
+    link_angle = chord_angles[types]
+    start = np.empty(total_links)
+    start[0] = 0.0
+    np.cumsum(link_angle[:-1] + chord_angles[3], out=start[1:])
+    end = start + link_angle
+
+    p1 = r_chain * np.column_stack([np.cos(start), np.sin(start)])
+    p2 = r_chain * np.column_stack([np.cos(end), np.sin(end)])
+    return types, p1, p2
+
+
+def circle_template(radius: float, num_points: int = 50):
+    """Closed circle outline followed by a NaN separator, as (x, y) arrays of num_points + 1."""
+    t = np.linspace(0, 2 * np.pi, num_points)
+    x = np.append(radius * np.cos(t), np.nan)
+    y = np.append(radius * np.sin(t), np.nan)
+    return x, y
+
+
+def build_chain_geometry(total_links: int, r_chain: float, l_green: float, l_red: float,
+                         dims: ChainDimensions = ChainDimensions(),
+                         circle_points: int = 50) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Plot arrays for every link type of a closed chain.
+
+    Args:
+        total_links: Total number of links.
+        r_chain: Chain circle radius (mm).
+        l_green: Green link length (mm).
+        l_red: Red link length (mm).
+        dims: Fixed link dimensions.
+        circle_points: Points per endpoint circle.
+
+    Returns:
+        dict: For each of LINK_TYPES, a dict with 'circles_x'/'circles_y' (two
+        NaN-separated circles per link) and 'lines_x'/'lines_y' (one
+        NaN-separated segment per link).
+    """
+    types, p1, p2 = link_endpoints(total_links, r_chain, l_green, l_red, dims)
+    circ_x, circ_y = circle_template(dims.r_small, circle_points)
+
+    geometry = {}
+    for type_index, name in enumerate(LINK_TYPES):
+        idx = np.flatnonzero(types == type_index)
+        m = len(idx)
+
+        # Both endpoint circles of each link, interleaved p1, p2, p1, p2...
+        centres = np.empty((2 * m, 2))
+        centres[0::2] = p1[idx]
+        centres[1::2] = p2[idx]
+        circles_x = np.empty((2 * m, circle_points + 1))
+        circles_y = np.empty((2 * m, circle_points + 1))
+        np.add(centres[:, :1], circ_x, out=circles_x)
+        np.add(centres[:, 1:], circ_y, out=circles_y)
+
+        lines_x = np.full((m, 3), np.nan)
+        lines_y = np.full((m, 3), np.nan)
+        lines_x[:, 0], lines_x[:, 1] = p1[idx, 0], p2[idx, 0]
+        lines_y[:, 0], lines_y[:, 1] = p1[idx, 1], p2[idx, 1]
+
+        geometry[name] = {
+            "circles_x": circles_x.ravel(),
+            "circles_y": circles_y.ravel(),
+            "lines_x": lines_x.ravel(),
+            "lines_y": lines_y.ravel(),
+        }
+    return geometry
@@ -0,0 +1,213 @@
+"""
+Chain Model for Chainlink Mechanics
+
+Closure geometry of a ring of links: every link and interlink is a chord of
+the chain circle, and the chord angles must sum to a full turn.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass
+class ChainDimensions:
+    """Fixed link dimensions of the chain (mm)."""
+    d_standard: float = 6.35  # Standard link length
+    d_interlink: float = 6.0  # Interlink (connector) length
+    r_small: float = 3.0  # Wire radius, offset between chain circle and inner diameter
+
+
+def angle_from_chord(length, R):
+    """
+    Angle subtended by a chord of the given length on a circle of radius R.
+
+    Works on scalars or NumPy arrays; returns NaN where the chord does not fit.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.asarray(length, dtype=float) / (2 * np.asarray(R, dtype=float))
+        angle = np.where((ratio >= 0) & (ratio <= 1), 2 * np.arcsin(np.clip(ratio, 0, 1)), np.nan)
+    return angle if angle.ndim else float(angle)
+
+
+def chain_lengths_counts(total_links, l_green, l_red, dims: ChainDimensions = ChainDimensions()):
+    """
+    Chord lengths and multiplicities of a chain with one green and one red link.
+
+    Args:
+        total_links: Total number of links (standard + green + red).
+        l_green: Green link length (mm).
+        l_red: Red (master) link length (mm).
+        dims: Fixed link dimensions. Fields may be arrays to sweep wire sizes.
+
+    Returns:
+        tuple: (lengths, counts) arrays broadcast together, with the four chord
+        types (standard, green, red, interlink) on the last axis.
+    """
+    total_links = np.asarray(total_links, dtype=float)
+    n_standard = np.maximum(total_links - 2, 0)
+    columns = [np.asarray(v, dtype=float) for v in (dims.d_standard, l_green, l_red, dims.d_interlink)]
+    lengths = np.stack(np.broadcast_arrays(*columns, total_links)[:4], axis=-1)
+    counts = np.stack(np.broadcast_arrays(n_standard, 1.0, 1.0, total_links, lengths[..., 0])[:4], axis=-1)
+    return lengths, counts
+
+
+def green_length_for_diameter(d_inner, total_links, l_red, dims: ChainDimensions = ChainDimensions()):
+    """
+    Closed-form green link length that closes the chain at a given inner diameter.
+
+    Returns NaN where no positive green length closes the chain.
+    """
+    r_chain = np.asarray(d_inner, dtype=float) / 2.0 + dims.r_small
+    total_links = np.asarray(total_links, dtype=float)
+    n_standard = np.maximum(total_links - 2, 0)
+
+    used = (n_standard * angle_from_chord(dims.d_standard, r_chain)
+            + angle_from_chord(l_red, r_chain)
+            + total_links * angle_from_chord(dims.d_interlink, r_chain))
+    angle_l_green = 2 * np.pi - used
+    with np.errstate(invalid='ignore'):
+        l_green = np.where(angle_l_green > 0, 2 * r_chain * np.sin(angle_l_green / 2.0), np.nan)
+    return l_green if l_green.ndim else float(l_green)
+
+
+def _half_angle_residual(s, ratios, counts):
+    """
+    Chord-angle sum minus 2*pi, parameterised by the half-angle s of the largest chord.
+
+    With R = L_max / (2 sin s) each chord subtends 2*asin(rho * sin s), where
+    rho = L / L_max <= 1. Unlike d/dR, the derivative with respect to s stays
+    finite at the smallest admissible radius (s = pi/2).
+    """
+    s = s[..., None]
+    sin_s, cos_s = np.sin(s), np.cos(s)
+    x = np.minimum(ratios * sin_s, 1.0)
+    residual = np.sum(counts * 2 * np.arcsin(x), axis=-1) - 2 * np.pi
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dangle = 2 * ratios * cos_s / np.sqrt(np.maximum(1.0 - x * x, 0.0))
+    # rho == 1 chords contribute exactly 2 per unit s, including at s = pi/2
+    dangle = np.where(ratios >= 1.0, 2.0, dangle)
+    derivative = np.sum(counts * dangle, axis=-1)
+    return residual, derivative
+
+
+def solve_chain_radii(lengths, counts, tol: float = 1e-12, max_iter: int = 50) -> np.ndarray:
+    """
+    Vectorized safeguarded Newton solve for the chain radius of many configurations.
+
+    Each configuration is closed when sum(counts * 2*asin(lengths / 2R)) == 2*pi.
+    The sum is solved for the half-angle s of the largest chord using its analytic
+    derivative; a Newton step that leaves the current bracket falls back to
+    bisection. Typically converges in 4-6 iterations.
+
+    Args:
+        lengths: Chord lengths (mm) with chord types on the last axis.
+        counts: Number of chords of each type, broadcastable to lengths.
+        tol: Absolute convergence tolerance on the half-angle (radians).
+        max_iter: Iteration limit.
+
+    Returns:
+        np.ndarray: Chain radius (mm) per configuration, NaN where the chain
+        cannot close (one chord spans more than the rest of the ring).
+    """
+    lengths, counts = np.broadcast_arrays(np.asarray(lengths, dtype=float), np.asarray(counts, dtype=float))
+    shape = lengths.shape[:-1]
+    lengths = lengths.reshape(-1, lengths.shape[-1])
+    counts = counts.reshape(-1, counts.shape[-1])
+
+    l_max = np.max(np.where(counts > 0, lengths, 0.0), axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = np.where(counts > 0, lengths / l_max[:, None], 0.0)
+        # asin(rho * sin s) <= rho * s, so the small-angle solution is a lower bound
+        lo = np.minimum(np.pi / np.sum(counts * ratios, axis=-1), np.pi / 2)
+    hi = np.full_like(lo, np.pi / 2)
+    closes = (l_max > 0) & (_half_angle_residual(hi, ratios, counts)[0] >= 0)
+
+    s = np.where(closes, lo, np.nan)
+    active = np.flatnonzero(closes)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        s_a, lo_a, hi_a = s[active], lo[active], hi[active]
+        f, df = _half_angle_residual(s_a, ratios[active], counts[active])
+        # The residual increases with s, so its sign tells which side of the root s is on
+        lo_a = np.where(f < 0, s_a, lo_a)
+        hi_a = np.where(f >= 0, s_a, hi_a)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = f / df
+        s_newton = s_a - step
+        converged = (np.abs(step) <= tol) | (hi_a - lo_a <= tol)
+        inside = (s_newton > lo_a) & (s_newton < hi_a)
+        s_next = np.where(inside | converged, s_newton, (lo_a + hi_a) / 2)
+        s[active], lo[active], hi[active] = s_next, lo_a, hi_a
+        active = active[~converged]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        R = l_max / (2 * np.sin(s))
+    return R.reshape(shape)
+
+
+def solve_chain_radius(lengths: Sequence[float], counts: Sequence[float], tol: float = 1e-12,
+                       max_iter: int = 50) -> float:
+    """
+    Scalar safeguarded Newton solve for the chain radius of one configuration.
+
+    Same method as solve_chain_radii, using the math module to avoid NumPy
+    overhead in interactive callbacks.
+
+    Returns:
+        float: Chain radius (mm), NaN if the chain cannot close.
+    """
+    pairs = [(float(l), float(n)) for l, n in zip(lengths, counts) if n > 0]
+    if not pairs:
+        return float('nan')
+    l_max = max(l for l, _ in pairs)
+    if l_max <= 0:
+        return float('nan')
+    pairs = [(l / l_max, n) for l, n in pairs]
+
+    def residual(s):
+        sin_s, cos_s = math.sin(s), math.cos(s)
+        f = -2 * math.pi
+        df = 0.0
+        for rho, n in pairs:
+            x = min(rho * sin_s, 1.0)
+            f += n * 2 * math.asin(x)
+            df += n * (2.0 if rho >= 1.0 else 2 * rho * cos_s / math.sqrt(1.0 - x * x))
+        return f, df
+
+    lo = min(math.pi / sum(n * rho for rho, n in pairs), math.pi / 2)
+    hi = math.pi / 2
+    if residual(hi)[0] < 0:
+        return float('nan')
+
+    s = lo
+    for _ in range(max_iter):
+        f, df = residual(s)
+        if f < 0:
+            lo = s
+        else:
+            hi = s
+        step = f / df
+        if abs(step) <= tol or hi - lo <= tol:
+            s -= step
+            break
+        s -= step
+        if not lo < s < hi:
+            s = (lo + hi) / 2
+    return l_max / (2 * math.sin(s))
+
+
+def inner_diameter_for_green_length(total_links, l_green, l_red, dims: ChainDimensions = ChainDimensions(),
+                                    tol: float = 1e-12) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized chain radius and inner diameter for given link counts and lengths.
+
+    Returns:
+        tuple: (r_chain, d_inner) arrays, NaN where the chain cannot close.
+    """
+    lengths, counts = chain_lengths_counts(total_links, l_green, l_red, dims)
+    r_chain = solve_chain_radii(lengths, counts, tol=tol)
+    return r_chain, (r_chain - dims.r_small) * 2
@@ -0,0 +1,180 @@
+"""
+Event-Loop Profiling for the Tk Tools
+
+Records how long each event handler takes, how long the canvas then takes
+to redisplay, how many canvas items every redraw deletes and creates, and
+how far the loop falls behind its input: events handled back to back before
+the loop next goes idle, and the delay between an input event's timestamp
+and its handling. Every sample_every-th event of a kind, and the next one
+after a kind's slowest event so far, runs under cProfile; the profiles of
+the slowest ones go into the summary printed on exit.
+
+Only the standard library is imported here.
+"""
+
+import cProfile
+import functools
+import heapq
+import io
+import pstats
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .hotpath import percentile
+
+
+class EventLoopProfiler:
+    """
+    Per-event timings of one Tk tool.
+
+    Args:
+        tool: Report title.
+        sample_every: Run every n-th event of each kind under cProfile; 0 disables sampling.
+        keep: Number of slowest profiled events kept for the summary.
+    """
+
+    def __init__(self, tool: str, sample_every: int = 20, keep: int = 3):
+        self.tool = tool
+        self.sample_every = sample_every
+        self.keep = keep
+        self.enabled = False
+        self.root = None
+        # Per kind: handler seconds of the events not run under cProfile
+        self.handler_times: Dict[str, List[float]] = {}
+        self.counts: Dict[str, int] = {}
+        # Per view: (items deleted, items created) of each redraw
+        self.redraws: Dict[str, List[Tuple[int, int]]] = {}
+        # Seconds from the last handler of a burst until the loop is idle again
+        self.redisplay_times: List[float] = []
+        # Events handled between two idle passes of the loop
+        self.bursts: List[int] = []
+        # Input event delay in ms relative to the least delayed event seen
+        self.lags: List[float] = []
+        # Min-heap of (seconds, order, kind, stats text)
+        self.profiles: List[Tuple[float, int, str, str]] = []
+        self._kind: Optional[str] = None
+        self._burst = 0
+        self._last_end = 0.0
+        self._idle_pending = False
+        self._clock_offset: Optional[float] = None
+        self._profile_next = set()
+        self._slowest: Dict[str, float] = {}
+
+    def attach(self, root) -> None:
+        """Start recording; root provides the idle callbacks that end each burst."""
+        self.root = root
+        self.enabled = True
+
+    def handler(self, kind: str):
+        """Decorator for a Tk event handler or widget command, recorded as kind."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or self._kind is not None:
+                    return fn(*args, **kwargs)
+                # The Tk event (or command argument) follows self
+                event = args[1] if len(args) > 1 else None
+                return self._record(kind, event, lambda: fn(*args, **kwargs))
+            return wrapper
+        return decorator
+
+    def redraw(self, view: str, deleted: int, created: int) -> None:
+        """Canvas items one redraw of view deleted and created."""
+        if self.enabled:
+            self.redraws.setdefault(view, []).append((deleted, created))
+
+    def _record(self, kind: str, event, call):
+        self._lag(event)
+        self._burst += 1
+        count = self.counts[kind] = self.counts.get(kind, 0) + 1
+        sampled = self.sample_every and (count - 1) % self.sample_every == 0
+        profile = cProfile.Profile() if sampled or kind in self._profile_next else None
+        self._profile_next.discard(kind)
+
+        self._kind = kind
+        start = time.perf_counter()
+        try:
+            if profile is None:
+                return call()
+            return profile.runcall(call)
+        finally:
+            end = time.perf_counter()
+            self._kind = None
+            if profile is None:
+                if self.sample_every and end - start > self._slowest.get(kind, float("inf")):
+                    self._profile_next.add(kind)
+                self._slowest[kind] = max(self._slowest.get(kind, 0.0), end - start)
+                self.handler_times.setdefault(kind, []).append(end - start)
+            else:
+                self._keep_profile(end - start, count, kind, profile)
+            self._last_end = end
+            if not self._idle_pending and self.root is not None:
+                # Queued behind the canvas redisplay, which Tk also runs at idle
+                self._idle_pending = True
+                self.root.after_idle(self._idle)
+
+    def _idle(self) -> None:
+        self.redisplay_times.append(time.perf_counter() - self._last_end)
+        self.bursts.append(self._burst)
+        self._burst = 0
+        self._idle_pending = False
+
+    def _lag(self, event) -> None:
+        # Tk input events carry the X server time in ms; <Configure> and commands do not
+        stamp = getattr(event, "time", None)
+        if not isinstance(stamp, int) or stamp <= 0:
+            return
+        offset = time.perf_counter() * 1000.0 - stamp
+        if self._clock_offset is None or offset < self._clock_offset:
+            self._clock_offset = offset
+        self.lags.append(offset - self._clock_offset)
+
+    def _keep_profile(self, seconds: float, order: int, kind: str, profile: cProfile.Profile) -> None:
+        if len(self.profiles) >= self.keep and seconds <= self.profiles[0][0]:
+            return
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(12)
+        entry = (seconds, order, kind, out.getvalue())
+        if len(self.profiles) < self.keep:
+            heapq.heappush(self.profiles, entry)
+        else:
+            heapq.heapreplace(self.profiles, entry)
+
+    def report(self) -> str:
+        """Event, redraw and backlog summary with the slowest profiled events."""
+        lines = [f"Event loop profile: {self.tool}"]
+        if not self.counts:
+            lines.append("  no events recorded")
+            return "\n".join(lines)
+        lines.append(f"  {'event':<20} {'count':>6} {'mean':>9} {'p50':>9} {'p99':>9} {'max':>9}  (ms)")
+        for kind, count in sorted(self.counts.items()):
+            times = [t * 1000.0 for t in self.handler_times.get(kind, [])]
+            if not times:
+                lines.append(f"  {kind:<20} {count:>6}   (all runs profiled)")
+                continue
+            lines.append(f"  {kind:<20} {count:>6} {sum(times) / len(times):>9.2f} {percentile(times, 50):>9.2f} "
+                         f"{percentile(times, 99):>9.2f} {max(times):>9.2f}")
+        for view, redraws in sorted(self.redraws.items()):
+            deleted = sum(d for d, _ in redraws) / len(redraws)
+            created = sum(c for _, c in redraws) / len(redraws)
+            lines.append(f"  redraw {view:<13} {len(redraws):>6}   {deleted:.0f} items deleted, "
+                         f"{created:.0f} created per redraw (max {max(c for _, c in redraws)})")
+        if self.redisplay_times:
+            redisplay = [t * 1000.0 for t in self.redisplay_times]
+            lines.append(f"  canvas redisplay after a burst: p50 {percentile(redisplay, 50):.2f} ms, "
+                         f"p99 {percentile(redisplay, 99):.2f} ms, max {max(redisplay):.2f} ms")
+        if self.bursts:
+            lines.append(f"  events per burst before idle: p50 {percentile(self.bursts, 50)}, "
+                         f"p99 {percentile(self.bursts, 99)}, max {max(self.bursts)}")
+        if self.lags:
+            lines.append(f"  input delay vs least delayed event: p50 {percentile(self.lags, 50):.1f} ms, "
+                         f"p99 {percentile(self.lags, 99):.1f} ms, max {max(self.lags):.1f} ms")
+        for seconds, order, kind, stats in sorted(self.profiles, reverse=True):
+            lines.append(f"--- cProfile of {kind} #{order}: {seconds * 1000.0:.2f} ms (with profiler overhead)")
+            lines.append(stats.rstrip())
+        return "\n".join(lines)
+
+    def finish(self) -> None:
+        """Print the report to stderr."""
+        print(self.report(), file=sys.stderr)
@@ -0,0 +1,333 @@
+"""
+Hot-Path Instrumentation for the Qt Tools
+
+Switchable timers around the compute, plot and paint stages of each update
+handler. Every handler call since the last repaint of the watched widgets
+belongs to one frame; handler calls beyond the first in a frame were
+coalesced into a single repaint. Per frame the profiler keeps the latency
+from the first handler call to the end of the repaint and the exclusive time
+spent in each stage, shown in an on-screen overlay and optionally written as
+a Chrome trace-event JSON file (chrome://tracing, Perfetto).
+
+While disabled, a timed call costs one attribute check. Only the standard
+library is imported here; Qt is loaded by attach() and the overlay, which
+need it.
+"""
+
+import functools
+import inspect
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Sequence
+
+# Stages in the overlay; handler time outside any stage is reported as "other"
+STAGES = ("compute", "plot", "paint")
+
+# Trace events kept for --trace; later events are counted but dropped
+MAX_TRACE_EVENTS = 1_000_000
+
+
+@dataclass
+class Frame:
+    """One repaint and the handler calls it absorbed. Times in seconds."""
+    start: float
+    end: float = 0.0
+    updates: int = 0
+    stages: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def latency(self) -> float:
+        return self.end - self.start
+
+    @property
+    def coalesced(self) -> int:
+        return max(self.updates - 1, 0)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100) of a non-empty sequence."""
+    ordered = sorted(values)
+    rank = min(max(math.ceil(q / 100.0 * len(ordered)) - 1, 0), len(ordered) - 1)
+    return ordered[rank]
+
+
+def _signal_safe(fn):
+    """
+    fn, dropping surplus positional arguments. PyQt trims the arguments of a
+    signal to fit a slot only when the slot itself rejects them, which it
+    cannot see through a wrapper.
+    """
+    params = inspect.signature(fn).parameters.values()
+    if any(p.kind == p.VAR_POSITIONAL for p in params):
+        return fn
+    limit = sum(p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in params)
+    return lambda *args, **kwargs: fn(*args[:limit], **kwargs)
+
+
+class HotPathProfiler:
+    """
+    Stage timings and frames of one tool's update handlers.
+
+    Args:
+        tool: Process name in the trace and report title.
+        window: Number of recent frames kept for the latency percentiles.
+    """
+
+    def __init__(self, tool: str, window: int = 500):
+        self.tool = tool
+        self.enabled = False
+        self.tracing = False
+        self.origin = time.perf_counter()
+        self.frames: Deque[Frame] = deque(maxlen=window)
+        self.total_frames = 0
+        self.total_coalesced = 0
+        self.trace_events: List[dict] = []
+        self.dropped_events = 0
+        self.on_frame: Optional[Callable[[Frame], None]] = None
+        # Open spans as [name, stage, start, time in child spans]
+        self._stack: List[list] = []
+        self._frame: Optional[Frame] = None
+        self._painted = False
+
+    def enable(self, trace: bool = False) -> None:
+        self.enabled = True
+        self.tracing = self.tracing or trace
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    # --- Spans ---
+
+    @contextmanager
+    def span(self, name: str, stage: str = "compute"):
+        """Time the enclosed block as one stage of the current frame."""
+        if not self.enabled:
+            yield
+            return
+        self._begin(name, stage)
+        try:
+            yield
+        finally:
+            self._end()
+
+    def timed(self, stage: str, name: Optional[str] = None):
+        """Decorator form of span(); the name defaults to the function's qualified name."""
+        def decorator(fn):
+            label = name or fn.__qualname__
+            call = _signal_safe(fn)
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return call(*args, **kwargs)
+                self._begin(label, stage)
+                try:
+                    return call(*args, **kwargs)
+                finally:
+                    self._end()
+            return wrapper
+        return decorator
+
+    def handler(self, fn):
+        """
+        Decorator for an update handler: opens a frame on its first call after
+        a repaint and counts later calls into the same frame. Nested handler
+        calls count once.
+        """
+        label = fn.__qualname__
+        call = _signal_safe(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return call(*args, **kwargs)
+            if not self._stack:
+                if self._frame is not None and self._painted:
+                    self._close_frame()
+                if self._frame is None:
+                    self._frame = Frame(start=time.perf_counter())
+                self._frame.updates += 1
+            self._begin(label, "other")
+            try:
+                return call(*args, **kwargs)
+            finally:
+                self._end()
+        return wrapper
+
+    def _begin(self, name: str, stage: str) -> None:
+        self._stack.append([name, stage, time.perf_counter(), 0.0])
+
+    def _end(self) -> None:
+        end = time.perf_counter()
+        name, stage, start, children = self._stack.pop()
+        duration = end - start
+        if self._stack:
+            self._stack[-1][3] += duration
+        if self._frame is not None:
+            stages = self._frame.stages
+            stages[stage] = stages.get(stage, 0.0) + duration - children
+        if self.tracing:
+            self._trace({"name": name, "cat": stage, "ph": "X",
+                         "ts": self._us(start), "dur": duration * 1e6})
+
+    # --- Frames ---
+
+    def painted(self) -> None:
+        """
+        A watched widget finished painting. The frame stays open for the other
+        widgets repainted in the same pass and closes on the next handler call
+        or close_pending().
+        """
+        if self._frame is not None:
+            self._frame.end = time.perf_counter()
+            self._painted = True
+
+    def close_pending(self) -> None:
+        """Close the current frame if it has been painted."""
+        if self._frame is not None and self._painted and not self._stack:
+            self._close_frame()
+
+    def _close_frame(self) -> None:
+        frame = self._frame
+        self._frame = None
+        self._painted = False
+        self.frames.append(frame)
+        self.total_frames += 1
+        self.total_coalesced += frame.coalesced
+        if self.tracing:
+            self._trace({"name": "frame", "cat": "frame", "ph": "X", "ts": self._us(frame.start),
+                         "dur": frame.latency * 1e6, "args": {"updates": frame.updates}})
+            self._trace({"name": "coalesced", "ph": "C", "ts": self._us(frame.end),
+                         "args": {"events": frame.coalesced}})
+        if self.on_frame is not None:
+            self.on_frame(frame)
+
+    # --- Statistics ---
+
+    def latency_percentiles(self, qs: Sequence[float] = (50, 99)) -> Optional[List[float]]:
+        """Frame latencies in ms at the given percentiles over the recent window, None before the first frame."""
+        if not self.frames:
+            return None
+        latencies = [frame.latency * 1000.0 for frame in self.frames]
+        return [percentile(latencies, q) for q in qs]
+
+    def overlay_text(self) -> str:
+        if not self.frames:
+            return f"{self.tool}: waiting for the first frame"
+        last = self.frames[-1]
+        stages = "  ".join(f"{stage} {last.stages.get(stage, 0.0) * 1000.0:.1f}" for stage in STAGES + ("other",))
+        p50, p99 = self.latency_percentiles()
+        return (f"frame {last.latency * 1000.0:6.1f} ms   {stages}\n"
+                f"coalesced {last.coalesced} (total {self.total_coalesced})   "
+                f"latency p50 {p50:.1f}  p99 {p99:.1f} ms over {len(self.frames)} frames")
+
+    def report(self) -> str:
+        """Frame latency percentiles and mean stage times over the recent window."""
+        lines = [f"Hot path: {self.tool}"]
+        if not self.frames:
+            lines.append("  no frames recorded")
+            return "\n".join(lines)
+        p50, p90, p99 = self.latency_percentiles((50, 90, 99))
+        lines.append(f"  frames {self.total_frames}, coalesced events {self.total_coalesced}")
+        lines.append(f"  latency p50 {p50:.1f} ms  p90 {p90:.1f} ms  p99 {p99:.1f} ms "
+                     f"(last {len(self.frames)} frames)")
+        for stage in STAGES + ("other",):
+            mean = sum(frame.stages.get(stage, 0.0) for frame in self.frames) / len(self.frames)
+            lines.append(f"  {stage:<8} {mean * 1000.0:>8.2f} ms/frame")
+        if self.dropped_events:
+            lines.append(f"  {self.dropped_events} trace events dropped after {MAX_TRACE_EVENTS}")
+        return "\n".join(lines)
+
+    # --- Chrome trace ---
+
+    def _us(self, t: float) -> float:
+        return (t - self.origin) * 1e6
+
+    def _trace(self, event: dict) -> None:
+        if len(self.trace_events) >= MAX_TRACE_EVENTS:
+            self.dropped_events += 1
+            return
+        event["pid"] = os.getpid()
+        event["tid"] = threading.get_ident()
+        self.trace_events.append(event)
+
+    def write_trace(self, path: str) -> None:
+        """Write the recorded spans and frames as Chrome trace-event JSON."""
+        meta = [{"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": self.tool}}]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": meta + self.trace_events, "displayTimeUnit": "ms"}, f)
+
+    # --- Qt ---
+
+    def watch_paint(self, *widgets) -> None:
+        """Time the paintEvent of each widget as the paint stage."""
+        # Qt is loaded by the caller already; nothing is imported here until now
+        from PyQt6.QtCore import QTimer
+
+        for widget in widgets:
+            original = widget.paintEvent
+            label = f"{type(widget).__name__}.paintEvent"
+
+            def paint_event(event, original=original, label=label):
+                if not self.enabled:
+                    return original(event)
+                self._begin(label, "paint")
+                try:
+                    return original(event)
+                finally:
+                    self._end()
+                    if self._frame is not None and not self._painted:
+                        # Runs after the rest of this repaint pass
+                        QTimer.singleShot(0, self.close_pending)
+                    self.painted()
+            widget.paintEvent = paint_event
+
+    def attach(self, window, app, paint_widgets: Sequence, trace_path: Optional[str] = None) -> None:
+        """
+        Enable the profiler for a Qt window: watch the given widgets' paints, add
+        the frame-time overlay (F12 toggles it), and print the report, and write
+        the trace if trace_path is given, when the application quits.
+        """
+        from PyQt6.QtCore import Qt
+        from PyQt6.QtGui import QFont, QKeySequence, QShortcut
+        from PyQt6.QtWidgets import QLabel
+
+        self.enable(trace=trace_path is not None)
+        self.watch_paint(*paint_widgets)
+
+        overlay = QLabel(self.overlay_text(), window)
+        overlay.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        overlay.setStyleSheet("background: rgba(0, 0, 0, 170); color: #7CFC00; padding: 4px;")
+        overlay.setFont(QFont("monospace", 9))
+        overlay.move(8, 8)
+        overlay.adjustSize()
+        overlay.raise_()
+        overlay.show()
+        self._overlay = overlay
+        self._overlay_shown = 0.0
+
+        def refresh(frame):
+            # At most 10 updates a second, so the overlay does not become the hot path
+            now = time.perf_counter()
+            if overlay.isVisible() and now - self._overlay_shown >= 0.1:
+                self._overlay_shown = now
+                overlay.setText(self.overlay_text())
+                overlay.adjustSize()
+        self.on_frame = refresh
+
+        self._overlay_toggle = QShortcut(QKeySequence("F12"), window)
+        self._overlay_toggle.activated.connect(lambda: overlay.setVisible(not overlay.isVisible()))
+
+        def finish():
+            print(self.report(), file=sys.stderr)
+            if trace_path:
+                self.write_trace(trace_path)
+                print(f"Trace written to {trace_path}", file=sys.stderr)
+        app.aboutToQuit.connect(finish)
@@ -0,0 +1,242 @@
+"""
+Hysteresis Model for the Hysteresis Plotter
+
+Defines the tanh stress-strain hysteresis loop and a lookup table of loops
+precomputed over the integer slider grid.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Slider ranges (integer positions) for Ms, Hc, a and E, matching the GUI.
+SLIDER_RANGES = {
+    "ms": (1, 20),      # Ms = value / 10
+    "hc": (100, 1000),  # Hc = value / 10
+    "a": (200, 2000),   # a  = value / 10
+    "e": (100, 300),    # E in GPa
+}
+SLIDER_ORDER = ("ms", "hc", "a", "e")
+
+SliderKey = Tuple[int, int, int, int]
+
+
+def calculate_hysteresis_loop(Ms, Hc, a, k, C_max=-250, T_max=550, num_points=200):
+    """
+    Calculates the x and y coordinates for a stress-strain hysteresis loop using a tanh model.
+
+    Args:
+        Ms (float): Yield strength (peak stress extent).
+        Hc (float): Plastic slip (permanent deformation offset).
+        a (float): Transition sharpness (yielding abruptness).
+        k (float): Elastic compliance (derived from Young's Modulus).
+        C_max (float): Maximum compression stress.
+        T_max (float): Maximum tension stress.
+        num_points (int): Number of points for each branch of the loop.
+
+    Returns:
+        tuple: A tuple containing two numpy arrays (x_loop, y_loop) representing strain and stress.
+    """
+    # Prevent division by zero if 'a' is zero
+    if a == 0:
+        a = 1e-9
+
+    # Generate the stress values (y-axis) for the two branches
+    y_asc = np.linspace(C_max, T_max, num_points)  # Ascending branch (compression → tension)
+    y_desc = np.linspace(T_max, C_max, num_points) # Descending branch (tension → compression)
+
+    # Calculate the strain values (x-axis) for each branch
+    x_asc = Ms * np.tanh((y_asc + Hc) / a) + k * y_asc  # Loading curve
+    x_desc = Ms * np.tanh((y_desc - Hc) / a) + k * y_desc  # Unloading curve
+
+    # Concatenate the branches to form a closed loop
+    x_loop = np.concatenate([x_asc, x_desc])
+    y_loop = np.concatenate([y_asc, y_desc])
+
+    return x_loop, y_loop
+
+
+def calculate_hysteresis_loops(Ms, Hc, a, k, C_max=-250, T_max=550, num_points=200):
+    """
+    Vectorized form of calculate_hysteresis_loop for many parameter sets.
+
+    Args:
+        Ms, Hc, a, k (array_like): Parameter arrays of equal length N.
+        C_max (float): Maximum compression stress.
+        T_max (float): Maximum tension stress.
+        num_points (int): Number of points for each branch of the loop.
+
+    Returns:
+        tuple: (x_loops, y_loop) where x_loops has shape (N, 2 * num_points) and
+        y_loop, shared by every loop, has shape (2 * num_points,).
+    """
+    Ms = np.asarray(Ms, dtype=float)[:, None]
+    Hc = np.asarray(Hc, dtype=float)[:, None]
+    a = np.where(np.asarray(a, dtype=float) == 0, 1e-9, np.asarray(a, dtype=float))[:, None]
+    k = np.asarray(k, dtype=float)[:, None]
+
+    y_asc = np.linspace(C_max, T_max, num_points)
+    y_loop = np.concatenate([y_asc, y_asc[::-1]])
+    # +Hc on the ascending branch, -Hc on the descending branch
+    offset = np.concatenate([np.ones(num_points), -np.ones(num_points)])
+
+    x_loops = Ms * np.tanh((y_loop + offset * Hc) / a) + k * y_loop
+    return x_loops, y_loop
+
+
+def params_from_sliders(ms_val, hc_val, a_val, e_val):
+    """
+    Convert raw integer slider positions into model parameters.
+
+    Works on scalars or NumPy arrays.
+
+    Returns:
+        tuple: (Ms, Hc, a, k) with k = 100 / (E_GPa * 1000).
+    """
+    e_mpa = np.asarray(e_val, dtype=float) * 1000
+    k = np.divide(100.0, e_mpa, out=np.zeros_like(e_mpa), where=e_mpa > 0)
+    if k.ndim == 0:
+        k = float(k)
+    return ms_val / 10.0, hc_val / 10.0, a_val / 10.0, k
+
+
+class LoopCache:
+    """
+    LRU-bounded lookup table of hysteresis loops keyed by integer slider positions.
+
+    Loops are filled lazily: a miss computes the requested loop together with
+    every other loop along the same slider axis in one vectorized batch, so
+    scrubbing a slider afterwards is a pure table lookup. All loops share one
+    stress array, so only the strain array is stored per entry.
+    """
+
+    def __init__(self, max_entries: int = 4096, C_max: float = -250, T_max: float = 550,
+                 num_points: int = 200):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.max_entries = max_entries
+        self.C_max = C_max
+        self.T_max = T_max
+        self.num_points = num_points
+        self.y_loop = calculate_hysteresis_loops([1], [0], [1], [0], C_max, T_max, num_points)[1]
+        self._loops: "OrderedDict[SliderKey, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._loops)
+
+    def __contains__(self, key) -> bool:
+        return tuple(key) in self._loops
+
+    def get(self, key: Iterable[int], prefetch_axis: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Look up the loop for a slider key, computing it on a miss.
+
+        Args:
+            key: (ms, hc, a, e) integer slider positions.
+            prefetch_axis: On a miss, also fill every position along this slider
+                axis (one of SLIDER_ORDER) with the other sliders held fixed, or
+                the max_entries positions nearest the key if the axis is longer.
+
+        Returns:
+            tuple: (x_loop, y_loop) strain and stress arrays.
+        """
+        key = tuple(int(v) for v in key)
+        x = self._loops.get(key)
+        if x is not None:
+            self._loops.move_to_end(key)
+            self.hits += 1
+            return x, self.y_loop
+
+        self.misses += 1
+        if prefetch_axis is not None:
+            # The positions nearest the key, no more than the cache holds, stored farthest
+            # first so that the requested loop is the last to be evicted
+            idx = SLIDER_ORDER.index(prefetch_axis)
+            keys = sorted(self.axis_keys(key, prefetch_axis), key=lambda k: abs(k[idx] - key[idx]))
+            self.prefetch(keys[:self.max_entries][::-1])
+        else:
+            self.prefetch([key])
+        return self._loops[key], self.y_loop
+
+    def neighbours(self, key: Iterable[int], axis: str, offsets: Iterable[int]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Loops at neighbouring positions of one slider, e.g. for ghost overlays.
+
+        Offsets that fall outside the slider range are skipped.
+        """
+        key = tuple(int(v) for v in key)
+        idx = SLIDER_ORDER.index(axis)
+        lo, hi = SLIDER_RANGES[axis]
+        keys = []
+        for off in offsets:
+            pos = key[idx] + off
+            if lo <= pos <= hi:
+                keys.append(key[:idx] + (pos,) + key[idx + 1:])
+        self.prefetch([k for k in keys if k not in self._loops])
+        return [self.get(k) for k in keys]
+
+    @staticmethod
+    def axis_keys(key: SliderKey, axis: str) -> List[SliderKey]:
+        """All slider keys along one axis through the given key."""
+        idx = SLIDER_ORDER.index(axis)
+        lo, hi = SLIDER_RANGES[axis]
+        return [key[:idx] + (pos,) + key[idx + 1:] for pos in range(lo, hi + 1)]
+
+    def prefetch(self, keys: Iterable[SliderKey]) -> None:
+        """Compute and store the loops for all missing keys in one vectorized batch."""
+        missing = [tuple(k) for k in keys if tuple(k) not in self._loops]
+        if not missing:
+            return
+        raw = np.asarray(missing, dtype=float)
+        Ms, Hc, a, k = params_from_sliders(raw[:, 0], raw[:, 1], raw[:, 2], raw[:, 3])
+        x_loops, _ = calculate_hysteresis_loops(Ms, Hc, a, k, self.C_max, self.T_max, self.num_points)
+        for key, x in zip(missing, x_loops):
+            self._store(key, x)
+
+    def _store(self, key: SliderKey, x: np.ndarray) -> None:
+        self._loops[key] = x
+        self._loops.move_to_end(key)
+        while len(self._loops) > self.max_entries:
+            self._loops.popitem(last=False)
+
+    def clear(self) -> None:
+        self._loops.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._loops), "hits": self.hits, "misses": self.misses}
+
+    def save(self, path: str) -> None:
+        """Persist the cached loops (most recently used last) to an .npz file."""
+        keys = np.asarray(list(self._loops.keys()), dtype=np.int32).reshape(-1, 4)
+        x = np.asarray(list(self._loops.values())).reshape(len(keys), 2 * self.num_points)
+        np.savez_compressed(
+            path, keys=keys, x=x,
+            meta=np.array([self.C_max, self.T_max, self.num_points], dtype=float),
+        )
+
+    def load(self, path: str) -> int:
+        """
+        Load loops from an .npz file written by save().
+
+        Files computed for a different stress range or point count are ignored.
+
+        Returns:
+            int: Number of loops loaded.
+        """
+        if not os.path.exists(path):
+            return 0
+        with np.load(path) as data:
+            meta = data["meta"]
+            if not np.allclose(meta, [self.C_max, self.T_max, self.num_points]):
+                return 0
+            keys, x = data["keys"], data["x"]
+        for key, row in zip(keys, x):
+            self._store(tuple(int(v) for v in key), row)
+        return len(keys)
@@ -0,0 +1,184 @@
+"""
+Volume, Area and Mass Estimates for the Mech Scaler Tool
+
+Measures a mesh once in model units, then scales the result to any print
+height: volume with scale³, surface area with scale². A single closed shell
+with consistently oriented faces gets its exact volume from the signed
+volumes of the tetrahedra its triangles span with the centroid; any other
+mesh (holes, flipped faces, several possibly overlapping parts) is measured
+on its filled voxel volume.
+
+Masses are estimated for FDM printing, as a perimeter shell of wall_mm plus
+partial infill of the rest, and for brick building, as 1x1 brick
+equivalents of the built volume.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .skeleton_fit import DEFAULT_RESOLUTION, grid_cache_key, grid_cache_path, load_grid, voxelize
+
+# Filament densities in g/cm³
+FILAMENT_DENSITY = {
+    "PLA": 1.24,
+    "PETG": 1.27,
+    "ABS": 1.04,
+}
+FILAMENT_DIAMETER_MM = 1.75
+
+# Default FDM settings: perimeter shell thickness and infill fraction of the interior
+DEFAULT_WALL_MM = 1.2
+DEFAULT_INFILL = 0.15
+
+# A 1x1 brick: 8 x 8 mm footprint, 9.6 mm tall, about 0.43 g
+BRICK_VOLUME_MM3 = 8.0 * 8.0 * 9.6
+BRICK_MASS_G = 0.43
+
+# Triangles per chunk, bounding temporary memory
+CHUNK = 1 << 20
+
+
+@dataclass
+class MeshMeasures:
+    """
+    Volume and surface area of a mesh in model units. method is "closed mesh"
+    for the exact signed volume, "voxels" for the voxel estimate, or "none"
+    for a mesh without faces.
+    """
+    volume: float
+    area: float
+    method: str
+
+    def volume_mm3(self, scale: float) -> float:
+        """Volume at scale mm per model unit."""
+        return self.volume * scale ** 3
+
+    def area_mm2(self, scale: float) -> float:
+        """Surface area at scale mm per model unit."""
+        return self.area * scale ** 2
+
+
+@dataclass
+class PrintEstimate:
+    """Material of an FDM print: volume in mm³, mass in g and filament length in m."""
+    volume_mm3: float
+    mass_g: float
+    filament_m: float
+
+
+def surface_area(vertices: np.ndarray, triangles: np.ndarray) -> float:
+    """Total area of the triangles."""
+    total = 0.0
+    for start in range(0, len(triangles), CHUNK):
+        a, b, c = np.moveaxis(vertices[triangles[start:start + CHUNK]], 1, 0)
+        total += 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1).sum()
+    return float(total)
+
+
+def signed_volume(vertices: np.ndarray, triangles: np.ndarray) -> float:
+    """
+    Volume enclosed by the triangles, positive for outward (counter-clockwise)
+    faces. Only meaningful for a closed mesh; see is_closed().
+    """
+    # Relative to the centroid, so large coordinates do not cancel out
+    centred = vertices - vertices.mean(axis=0)
+    total = 0.0
+    for start in range(0, len(triangles), CHUNK):
+        a, b, c = np.moveaxis(centred[triangles[start:start + CHUNK]], 1, 0)
+        total += np.einsum('ij,ij->', a, np.cross(b, c))
+    return float(total) / 6.0
+
+
+def is_closed(triangles: np.ndarray) -> bool:
+    """
+    True if every edge is shared by exactly two triangles that run it in
+    opposite directions: a closed, consistently oriented surface.
+    """
+    if not len(triangles):
+        return False
+    n = np.int64(triangles.max()) + 1
+    starts = triangles.reshape(-1).astype(np.int64)
+    ends = np.roll(triangles, -1, axis=1).reshape(-1).astype(np.int64)
+    directed = np.sort(starts * n + ends)
+    if np.any(directed[1:] == directed[:-1]):
+        return False
+    reverse = np.sort(ends * n + starts)
+    return bool(np.array_equal(directed, reverse))
+
+
+def shell_count(triangles: np.ndarray) -> int:
+    """Number of connected pieces of the mesh (vertices linked by triangles); unused vertices are ignored."""
+    if not len(triangles):
+        return 0
+    parent = np.arange(np.int64(triangles.max()) + 1)
+    while True:
+        # Hook the root of every corner onto the lowest root of its triangle
+        roots = parent[triangles]
+        lowest = roots.min(axis=1)
+        hooked = parent.copy()
+        for corner in range(3):
+            np.minimum.at(hooked, roots[:, corner], lowest)
+        # Pointer jumping until every vertex points at its root
+        while True:
+            jumped = hooked[hooked]
+            if np.array_equal(jumped, hooked):
+                break
+            hooked = jumped
+        if np.array_equal(hooked, parent):
+            break
+        parent = hooked
+    return len(np.unique(parent[triangles]))
+
+
+def measure_mesh(vertices: np.ndarray, triangles: np.ndarray, obj_path: Optional[str] = None,
+                 resolution: int = DEFAULT_RESOLUTION) -> MeshMeasures:
+    """
+    Volume and surface area of a mesh in model units.
+
+    Args:
+        vertices: (n, 3) vertices.
+        triangles: (t, 3) vertex indices.
+        obj_path: OBJ file of the mesh; the voxel estimate then reuses its
+            voxel cache if it is up to date (see skeleton_fit.cached_grid).
+            The cache is never written here.
+        resolution: Voxels along the longest axis for the voxel estimate.
+    """
+    if not len(triangles):
+        return MeshMeasures(0.0, 0.0, "none")
+    area = surface_area(vertices, triangles)
+    if is_closed(triangles) and shell_count(triangles) == 1:
+        return MeshMeasures(abs(signed_volume(vertices, triangles)), area, "closed mesh")
+    grid = None
+    if obj_path is not None and os.path.exists(obj_path):
+        grid = load_grid(grid_cache_path(obj_path), grid_cache_key(obj_path, resolution))
+    if grid is None:
+        grid = voxelize(vertices, triangles, resolution)
+    # Voxels on the boundary are about half inside the surface
+    solid = grid.solid
+    interior = solid.copy()
+    for axis in range(3):
+        interior &= np.roll(solid, 1, axis) & np.roll(solid, -1, axis)
+    boundary = np.count_nonzero(solid & ~interior)
+    return MeshMeasures(float(np.count_nonzero(solid) - 0.5 * boundary) * grid.pitch ** 3, area, "voxels")
+
+
+def print_estimate(measures: MeshMeasures, scale: float, material: str = "PLA",
+                   wall_mm: float = DEFAULT_WALL_MM, infill: float = DEFAULT_INFILL) -> PrintEstimate:
+    """
+    Filament used by an FDM print at scale mm per model unit: a shell of
+    wall_mm under the whole surface plus infill of the remaining interior.
+    """
+    volume = measures.volume_mm3(scale)
+    shell = min(measures.area_mm2(scale) * wall_mm, volume)
+    used = shell + infill * (volume - shell)
+    filament_area = np.pi * (FILAMENT_DIAMETER_MM / 2.0) ** 2
+    return PrintEstimate(used, used * FILAMENT_DENSITY[material] / 1000.0, used / filament_area / 1000.0)
+
+
+def brick_estimate(measures: MeshMeasures, scale: float) -> Tuple[float, float]:
+    """(1x1 brick equivalents, mass in g) of the model built solid at scale mm per model unit."""
+    bricks = measures.volume_mm3(scale) / BRICK_VOLUME_MM3
+    return bricks, bricks * BRICK_MASS_G
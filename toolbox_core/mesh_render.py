@@ -0,0 +1,296 @@
+"""
+Software Rendering for the Mech Scaler Tool
+
+Draws a mesh from any direction into an RGB image with NumPy alone, for the
+orbit view. A frame is one matrix product of all vertices with the view
+rotation, back-face culling, and a scanline z-buffer: the pixel rows of all
+triangles, then the pixel runs of all rows, are expanded as flat arrays, and
+each covered pixel keeps the nearest triangle through a single np.minimum.at
+over keys packing depth above triangle index. Edges are placed identically
+by both triangles sharing them, in double precision so that they agree with
+the corners, and a pixel centre on an edge belongs to the triangle on its
+right, so closed meshes show no cracks. Pixels are shaded by the facing of
+their triangle towards the viewer.
+
+Meshes much finer than the pixels are first simplified by vertex clustering
+on a grid about one pixel wide, computed once per zoom octave: a closed
+million-triangle mesh 300 pixels tall renders in about 45 ms on one core.
+Back faces are culled only for a single closed shell; any other mesh draws
+them too, which takes about twice as long.
+
+Views are orthographic, like the side and front views: screen X is the
+rotated model X, screen Y the rotated model Y (up), and depth the rotated
+model Z (towards the viewer).
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+# The mesh colour (#8888ff) of the side and front views
+MESH_COLOR = (136, 136, 255)
+
+# Lambert shading under a light at the viewer: AMBIENT + (1 - AMBIENT) * cos(angle)
+AMBIENT = 0.35
+
+# Level of detail: vertices closer than this many pixels are merged before rendering
+DETAIL_PX = 1.0
+
+# Simplified meshes kept per renderer, one per zoom octave
+MAX_LEVELS = 4
+
+_EMPTY = np.iinfo(np.uint64).max
+
+
+def orbit_matrix(yaw_deg: float, pitch_deg: float) -> np.ndarray:
+    """
+    Rotation (3, 3) from model to view coordinates. Yaw turns the model about
+    its vertical axis (0 = side view, 90 = front view); pitch then tilts it
+    towards the viewer, so positive angles look down on it.
+    """
+    yaw, pitch = np.radians(yaw_deg), np.radians(pitch_deg)
+    cy, sy, cp, sp = np.cos(yaw), np.sin(yaw), np.cos(pitch), np.sin(pitch)
+    turn = np.array([[cy, 0.0, sy], [0.0, 1.0, 0.0], [-sy, 0.0, cy]])
+    tilt = np.array([[1.0, 0.0, 0.0], [0.0, cp, -sp], [0.0, sp, cp]])
+    return tilt @ turn
+
+
+def orbit_project(points: np.ndarray, center: np.ndarray, matrix: np.ndarray, px_per_unit: float,
+                  origin: Tuple[float, float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Canvas coordinates (px, py) and depth (model units towards the viewer)
+    of (n, 3) model points viewed through matrix, with center at origin.
+    """
+    view = (np.asarray(points, dtype=float).reshape(-1, 3) - center) @ matrix.T
+    return origin[0] + view[:, 0] * px_per_unit, origin[1] - view[:, 1] * px_per_unit, view[:, 2]
+
+
+def orbit_unproject(px: float, py: float, depth: float, center: np.ndarray, matrix: np.ndarray,
+                    px_per_unit: float, origin: Tuple[float, float]) -> np.ndarray:
+    """Model point under a canvas point at the given depth, inverse of orbit_project()."""
+    view = np.array([(px - origin[0]) / px_per_unit, (origin[1] - py) / px_per_unit, depth])
+    return center + matrix.T @ view
+
+
+class MeshRenderer:
+    """
+    A mesh prepared for rendering: vertices centred on the bounding box
+    centre, and unit face normals for shading.
+
+    Args:
+        vertices: (n, 3) vertices, Y up.
+        triangles: (t, 3) vertex indices.
+        closed: The mesh is a closed, consistently oriented surface (see
+            mesh_measure.is_closed); only then are faces turned away from
+            the viewer skipped without testing their pixels.
+    """
+
+    def __init__(self, vertices: np.ndarray, triangles: np.ndarray, closed: bool = False):
+        mins, maxs = vertices.min(axis=0), vertices.max(axis=0)
+        self.center = (mins + maxs) / 2
+        # Coordinates and corners one row per axis and per corner, so every gather reads contiguous memory
+        self.points = np.ascontiguousarray((vertices - self.center).T, dtype=np.float32)
+        self.corners = np.ascontiguousarray(np.asarray(triangles).reshape(-1, 3).T, dtype=np.int32)
+        self.normals, volume = _face_normals(self.points, self.corners)
+        # Depth never leaves the bounding sphere, whatever the rotation
+        self.radius = float(np.linalg.norm(maxs - mins)) / 2 or 1.0
+        # +1 for outward faces, -1 for inward (the sign of the enclosed volume); 0 renders both sides
+        self.facing = int(np.sign(volume)) if closed else 0
+        # Simplified meshes by cell size exponent, most recent last
+        self._levels = {}
+
+    def level(self, cell: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (points, corners, normals) of the mesh simplified on a grid of about
+        cell model units (see simplify()); the cell is rounded up to a power
+        of two, so zooming re-simplifies only once per doubling. The full mesh
+        is kept where simplifying would save little.
+        """
+        exponent = int(np.ceil(np.log2(cell)))
+        if exponent not in self._levels:
+            if len(self._levels) >= MAX_LEVELS:
+                del self._levels[next(iter(self._levels))]
+            points, triangles = simplify(self.points.T, self.corners.T, 2.0 ** exponent)
+            if len(triangles) > 0.9 * self.corners.shape[1]:
+                self._levels[exponent] = (self.points, self.corners, self.normals)
+            else:
+                points = np.ascontiguousarray(points.T, dtype=np.float32)
+                corners = np.ascontiguousarray(triangles.T, dtype=np.int32)
+                self._levels[exponent] = (points, corners, _face_normals(points, corners)[0])
+        return self._levels[exponent]
+
+    def project(self, points: np.ndarray, matrix: np.ndarray, px_per_unit: float,
+                origin: Tuple[float, float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Canvas coordinates (px, py) and depth (model units towards the viewer)
+        of (n, 3) model points, with the bounding box centre at origin.
+        """
+        return orbit_project(points, self.center, matrix, px_per_unit, origin)
+
+    def unproject(self, px: float, py: float, depth: float, matrix: np.ndarray, px_per_unit: float,
+                  origin: Tuple[float, float]) -> np.ndarray:
+        """Model point under a canvas point at the given depth, inverse of project()."""
+        return orbit_unproject(px, py, depth, self.center, matrix, px_per_unit, origin)
+
+    def render(self, matrix: np.ndarray, width: int, height: int, px_per_unit: float,
+               origin: Optional[Tuple[float, float]] = None, color: Tuple[int, int, int] = MESH_COLOR,
+               background: Tuple[int, int, int] = (224, 224, 224), opacity: float = 1.0,
+               detail_px: Optional[float] = DETAIL_PX) -> np.ndarray:
+        """
+        RGB image (height, width, 3) of the mesh viewed through matrix (see
+        orbit_matrix()), px_per_unit pixels per model unit, with the bounding
+        box centre at origin (default: the image centre). opacity blends the
+        shaded mesh over the background. Vertices closer than about detail_px
+        pixels are merged first (see level()); None renders every triangle.
+        """
+        if origin is None:
+            origin = (width / 2, height / 2)
+        if width <= 0 or height <= 0:
+            return np.zeros((max(height, 0), max(width, 0), 3), dtype=np.uint8)
+        points, corners, normals = (self.level(detail_px / px_per_unit) if detail_px
+                                    else (self.points, self.corners, self.normals))
+
+        # One transform for every vertex; pixel centres land on integer coordinates
+        x, y, z = (matrix * np.array([[px_per_unit], [-px_per_unit], [1.0]])).astype(np.float32) @ points
+        x += np.float32(origin[0] - 0.5)
+        y += np.float32(origin[1] - 0.5)
+
+        # A triangle covers the pixel rows from its top corner (inclusive) to its bottom one
+        # (exclusive), and within them columns likewise; most triangles of a fine mesh fall
+        # between pixel centres and are dropped here
+        i0, i1, i2 = corners
+        x0, x1, x2 = np.take(x, i0), np.take(x, i1), np.take(x, i2)
+        visible = (np.clip(np.ceil(np.maximum(np.maximum(x0, x1), x2)), 0, width)
+                   > np.clip(np.ceil(np.minimum(np.minimum(x0, x1), x2)), 0, width))
+        y0, y1, y2 = np.take(y, i0), np.take(y, i1), np.take(y, i2)
+        first = np.clip(np.ceil(np.minimum(np.minimum(y0, y1), y2)), 0, height).astype(np.int32)
+        rows = np.clip(np.ceil(np.maximum(np.maximum(y0, y1), y2)), 0, height).astype(np.int32) - first
+        visible &= rows > 0
+        # Facing of every triangle towards the viewer, for back-face culling and shading
+        towards = normals @ matrix[2].astype(np.float32)
+        if self.facing:
+            visible &= self.facing * towards > 0
+        face = np.flatnonzero(visible).astype(np.int32)
+        a, b, c, ya, yb, yc = (v[face] for v in (i0, i1, i2, y0, y1, y2))
+
+        # Corners from top to bottom, swapping indices arithmetically
+        for upper, lower in ((0, 1), (1, 2), (0, 1)):
+            corner, level = [a, b, c], [ya, yb, yc]
+            step = (level[lower] < level[upper]) * (corner[lower] - corner[upper])
+            corner[upper], corner[lower] = corner[upper] + step, corner[lower] - step
+            level[upper], level[lower] = np.minimum(level[upper], level[lower]), np.maximum(level[upper], level[lower])
+            a, b, c = corner
+            ya, yb, yc = level
+        xa, xb, xc = np.take(x, a), np.take(x, b), np.take(x, c)
+        first = np.clip(np.ceil(ya), 0, height).astype(np.int32)
+        rows = np.clip(np.ceil(yc), 0, height).astype(np.int32) - first
+        upper_rows = np.clip(np.ceil(yb), 0, height).astype(np.int32) - first
+
+        # Each edge as the line x = offset + y * slope. Both are symmetric in the edge's ends, so the
+        # two triangles on an edge place it identically; a pixel centre on an edge belongs to the
+        # triangle to its right. Products of the float32 corners are exact in double precision, so
+        # the line also agrees with the corners: in float32 the offset cancels to within a few
+        # thousandths of a pixel, enough to give pixels to slivers dropped above and leave holes
+        def edge(xu, yu, xv, yv):
+            xu, yu, xv, yv = (t.astype(float) for t in (xu, yu, xv, yv))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return (xu * yv - xv * yu) / (yv - yu), (xv - xu) / (yv - yu)
+        long_offset, long_slope = edge(xa, ya, xc, yc)
+        # Upper short edges, then lower ones: rows below the middle corner use the second half
+        short_offset, short_slope = (np.concatenate(pair) for pair in zip(edge(xa, ya, xb, yb), edge(xb, yb, xc, yc)))
+
+        owner, k = _expand(rows)
+        row = first[owner] + k
+        short = owner + len(face) * (k >= upper_rows[owner])
+        x_long = long_offset[owner] + row * long_slope[owner]
+        x_short = short_offset[short] + row * short_slope[short]
+        start = np.clip(np.ceil(np.minimum(x_long, x_short)), 0, width).astype(np.int32)
+        span = np.clip(np.ceil(np.maximum(x_long, x_short)), 0, width).astype(np.int32) - start
+
+        # Rows with pixels
+        run = np.flatnonzero(span)
+        owner, row, start, span = owner[run], row[run], start[run], span[run]
+
+        # Depth plane of each triangle through its top corner, in double precision since the
+        # gradients of slivers are steep
+        za = z[a].astype(float)
+        ab_x, ab_y, ab_z = xb - xa, yb - ya, z[b] - za
+        ac_x, ac_y, ac_z = xc - xa, yc - ya, z[c] - za
+        area = ab_x.astype(float) * ac_y - ab_y.astype(float) * ac_x
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Edge-on triangles get no pixels, whatever their depth
+            dz_dx = (ab_z * ac_y - ac_z * ab_y) / area
+            dz_dy = (ac_z * ab_x - ab_z * ac_x) / area
+        row_dz = dz_dx[owner]
+        row_z = za[owner] + (row - ya[owner]) * dz_dy[owner] + (start - xa[owner]) * row_dz
+        row_pixel = row * width + start
+
+        # Their pixels
+        pixel_row, offset = _expand(span)
+        depth = row_z[pixel_row] + offset * row_dz[pixel_row]
+
+        # Nearest first: depth in the high 32 bits of the key, the triangle's place in face in the low 32
+        near = np.clip((self.radius - depth) / (2 * self.radius) * 0xFFFFFFFE, 0, 0xFFFFFFFE).astype(np.uint64)
+        zbuffer = np.full(width * height, _EMPTY, dtype=np.uint64)
+        np.minimum.at(zbuffer, row_pixel[pixel_row] + offset, (near << np.uint64(32)) | owner[pixel_row].astype(np.uint64))
+
+        # Palette of the background and 255 shades; every pixel looks up the shade of its triangle
+        shades = AMBIENT + (1 - AMBIENT) * np.linspace(0.0, 1.0, 255)[:, None]
+        back = np.array(background, dtype=float)
+        palette = np.vstack([back, back + opacity * (shades * color - back)]).astype(np.uint8)
+        levels = np.append(1 + np.abs(towards[face]) * 254, 0).astype(np.uint8)
+        nearest = np.minimum(zbuffer & np.uint64(0xFFFFFFFF), np.uint64(len(face)))
+        return np.take(palette, levels.take(nearest), axis=0).reshape(height, width, 3)
+
+
+def simplify(vertices: np.ndarray, triangles: np.ndarray, cell: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vertex clustering: the vertices inside each cube of a grid of spacing
+    cell are merged into their mean, and triangles left with fewer than
+    three distinct corners are dropped. Returns (vertices, triangles).
+    """
+    keys = np.floor(vertices / cell).astype(np.int64)
+    keys -= keys.min(axis=0, initial=0)
+    dims = keys.max(axis=0, initial=0) + 1
+    cells, index = np.unique((keys[:, 0] * dims[1] + keys[:, 1]) * dims[2] + keys[:, 2], return_inverse=True)
+    counts = np.bincount(index, minlength=len(cells))
+    merged = np.column_stack([np.bincount(index, weights=vertices[:, axis], minlength=len(cells))
+                              for axis in range(3)]) / counts[:, None]
+    corners = index[triangles]
+    kept = (corners[:, 0] != corners[:, 1]) & (corners[:, 1] != corners[:, 2]) & (corners[:, 2] != corners[:, 0])
+    return merged, corners[kept]
+
+
+def _face_normals(points: np.ndarray, corners: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Unit normals (t, 3) of the triangles corners (3, t) over points (3, n),
+    zero for degenerate ones, and the signed volume they enclose (see
+    mesh_measure.signed_volume) from the same cross products.
+    """
+    (ax, ay, az), (bx, by, bz), (cx, cy, cz) = ([np.take(axis, corner) for axis in points] for corner in corners)
+    ux, uy, uz, vx, vy, vz = bx - ax, by - ay, bz - az, cx - ax, cy - ay, cz - az
+    normals = np.column_stack((uy * vz - uz * vy, uz * vx - ux * vz, ux * vy - uy * vx))
+    volume = float(np.einsum("ij,ij->", np.column_stack((ax, ay, az)), normals, dtype=float)) / 6
+    length = np.sqrt(np.einsum("ij,ij->i", normals, normals))[:, None]
+    return normals / np.where(length > 0, length, 1), volume
+
+
+def _expand(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    counts[i] entries for every i, all counts positive: the owner i of each
+    entry and its index 0 .. counts[i] - 1 within the owner.
+    """
+    ends = np.cumsum(counts, dtype=np.int64)
+    total = int(ends[-1]) if len(ends) else 0
+    if total == len(counts):
+        # One entry each, as for the rows and pixels of most triangles of a fine mesh
+        return np.arange(total, dtype=np.int32), np.zeros(total, dtype=np.int32)
+    owner = np.zeros(total, dtype=np.int32)
+    owner[ends[:-1]] = 1
+    np.cumsum(owner, out=owner)
+    return owner, np.arange(total, dtype=np.int32) - (ends - counts).astype(np.int32)[owner]
+
+
+def to_ppm(image: np.ndarray) -> bytes:
+    """Binary PPM of an RGB image, as Tk's PhotoImage(data=..., format="PPM") reads it."""
+    return b"P6 %d %d 255\n" % (image.shape[1], image.shape[0]) + np.ascontiguousarray(image).tobytes()
@@ -0,0 +1,302 @@
+"""
+Cross-Section Slicing for the Mech Scaler Tool
+
+Horizontal slices of a mesh at given heights (Y up), each with its outline
+loops and area, for building the model layer by layer. All layers come out
+of one vectorized pass: every triangle is tested only against the layers
+its Y extent spans, found by binary search over the sorted layer heights,
+and the crossing segments are chained into loops through the mesh edges
+they cross, so neighbouring triangles always meet exactly.
+
+Vertices at the same position are merged first, since exporters often
+split them at UV seams. A vertex on a slice plane counts as below it. Loops follow the face
+orientation: outer outlines run counter-clockwise in the X-Z plane and holes
+clockwise, so a layer's area is the sum of its loops' signed areas (a mesh
+with inward faces is turned around as a whole). A mesh with holes can leave
+open chains; they are returned but add no area.
+
+Example:
+    python -m toolbox_core.mesh_slicer mechscaler/model.obj --height-cm 60 --svg slices
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+import numpy as np
+
+from .scaling_model import load_mesh, model_bounds, scale_factor
+
+# Brick and plate heights in mm
+BRICK_HEIGHT_MM = 9.6
+PLATE_HEIGHT_MM = 3.2
+
+
+@dataclass
+class Layer:
+    """
+    One slice: its height, closed outline loops and open chains as (k, 2)
+    arrays of (x, z) points, and the enclosed area. Loops do not repeat
+    their first point.
+    """
+    height: float
+    area: float = 0.0
+    loops: List[np.ndarray] = field(default_factory=list)
+    open_chains: List[np.ndarray] = field(default_factory=list)
+
+
+def _segments(vertices: np.ndarray, triangles: np.ndarray, heights: np.ndarray):
+    """
+    Crossing segments of all layers: layer index, start and end points (x, z)
+    and the mesh edges they start and end on, as dense ids.
+    """
+    y = vertices[:, 1]
+    xz = vertices[:, [0, 2]]
+    ty = y[triangles]
+    # A triangle crosses the layers with lowest y <= h < highest y
+    first = np.searchsorted(heights, ty.min(axis=1), side='left')
+    count = np.searchsorted(heights, ty.max(axis=1), side='left') - first
+    tri = np.repeat(np.arange(len(triangles)), count)
+    offsets = np.repeat(np.cumsum(count) - count, count)
+    layer = first[tri] + np.arange(len(tri)) - offsets
+
+    corners = triangles[tri]
+    above = ty[tri] > heights[layer][:, None]
+    following = np.roll(above, -1, axis=1)
+    # Exactly one edge of the triangle goes down through the plane and one up
+    rows = np.arange(len(tri))
+    down = np.argmax(above & ~following, axis=1)
+    up = np.argmax(~above & following, axis=1)
+
+    def crossing(k):
+        a = corners[rows, k]
+        b = corners[rows, (k + 1) % 3]
+        # Interpolated from the lower vertex index, so both faces of an edge agree
+        p, q = np.minimum(a, b), np.maximum(a, b)
+        t = (heights[layer] - y[p]) / (y[q] - y[p])
+        low = xz[p]
+        return low + t[:, None] * (xz[q] - low), p.astype(np.int64) * len(vertices) + q
+
+    start, start_edge = crossing(down)
+    end, end_edge = crossing(up)
+    edges, dense = np.unique(np.concatenate((start_edge, end_edge)), return_inverse=True)
+    dense = dense.ravel()
+    stride = np.int64(len(edges))
+    return layer, start, end, layer * stride + dense[:len(tri)], layer * stride + dense[len(tri):]
+
+
+def _chain(start_key: np.ndarray, end_key: np.ndarray):
+    """
+    Order of the segments (sorted by start_key) that lists every chain or
+    loop from its head: (order, chain id per ordered segment, closed flag
+    per segment).
+    """
+    n = len(start_key)
+    pos = np.minimum(np.searchsorted(start_key, end_key), n - 1)
+    succ = np.where(start_key[pos] == end_key, pos, -1)
+
+    index = np.arange(n)
+    # Pointer doubling: lowest segment of each loop, and where each chain ends.
+    # Done once a round changes no loop's lowest segment and no more
+    # segments see the end of their chain.
+    jump = np.where(succ >= 0, succ, index)
+    lowest = index.copy()
+    ended = -1
+    while True:
+        merged = np.minimum(lowest, lowest[jump])
+        jump = jump[jump]
+        count = np.count_nonzero(succ[jump] < 0)
+        if count == ended and np.array_equal(merged, lowest):
+            break
+        lowest, ended = merged, count
+    closed = succ[jump] >= 0
+
+    # Open every loop before its lowest segment, then rank all chains
+    cut = closed & (succ == lowest)
+    succ = np.where(cut, -1, succ)
+    jump = np.where(succ >= 0, succ, index)
+    to_end = (succ >= 0).astype(np.int64)
+    while True:
+        further = jump[jump]
+        if np.array_equal(further, jump):
+            break
+        to_end = to_end + to_end[jump]
+        jump = further
+    order = np.lexsort((-to_end, jump))
+    return order, jump[order], closed
+
+
+def _slice(vertices: np.ndarray, triangles: np.ndarray, heights: np.ndarray) -> List[Layer]:
+    layers = [Layer(float(h)) for h in heights]
+    if not len(triangles) or not len(heights):
+        return layers
+    layer, start, end, start_key, end_key = _segments(vertices, triangles, heights)
+    if not len(layer):
+        return layers
+    # Layer by layer, so the chaining below gathers from nearby memory
+    by_start = np.argsort(start_key, kind='stable')
+    layer, start, end = layer[by_start], start[by_start], end[by_start]
+    start_key, end_key = start_key[by_start], end_key[by_start]
+    order, chain, closed = _chain(start_key, end_key)
+
+    # Shoelace over the segments of closed loops
+    cross = 0.5 * (start[:, 0] * end[:, 1] - end[:, 0] * start[:, 1])
+    areas = np.bincount(layer[closed], weights=-cross[closed], minlength=len(heights))
+    for lay, area in zip(layers, areas):
+        lay.area = float(area)
+
+    firsts = np.concatenate(([0], np.flatnonzero(np.diff(chain)) + 1))
+    lasts = np.append(firsts[1:], len(order))
+    points = start[order]
+    for a, b, head, tail in zip(firsts.tolist(), lasts.tolist(), order[firsts].tolist(), order[lasts - 1].tolist()):
+        lay = layers[layer[head]]
+        if closed[head]:
+            lay.loops.append(points[a:b])
+        else:
+            lay.open_chains.append(np.vstack((points[a:b], end[tail])))
+    return layers
+
+
+def _weld(vertices: np.ndarray, triangles: np.ndarray):
+    """Vertices with identical coordinates merged; triangles that collapse are dropped."""
+    rows = np.ascontiguousarray(vertices, dtype=float)
+    _, first, inverse = np.unique(rows.view(np.dtype((np.void, rows.itemsize * 3))).ravel(),
+                                       return_index=True, return_inverse=True)
+    # Keep the mesh's own vertex order, which keeps the gathers below cache friendly
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    triangles = rank[inverse.ravel()][triangles]
+    keep = (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])
+    return rows[first[order]], triangles[keep]
+
+
+def _slice_chunk(args):
+    """Process pool entry point: one run of consecutive layers."""
+    return _slice(*args)
+
+
+def slice_mesh(vertices: np.ndarray, triangles: np.ndarray, heights: Sequence[float], workers: int = 1) -> List[Layer]:
+    """
+    Slices of a mesh at ascending heights, in the mesh's units.
+
+    Args:
+        vertices: (n, 3) vertices, Y up.
+        triangles: (t, 3) vertex indices.
+        heights: Ascending Y values of the slice planes.
+        workers: Processes slicing runs of consecutive layers; 1 runs in this process.
+    """
+    heights = np.asarray(heights, dtype=float)
+    vertices, triangles = _weld(vertices, triangles)
+    if workers <= 1 or len(heights) < 2 * workers:
+        return _outward(_slice(vertices, triangles, heights))
+
+    # Triangles sorted by their lowest point; each run of layers gets those starting below its top
+    ty = vertices[:, 1][triangles]
+    by_low = np.argsort(ty.min(axis=1), kind='stable')
+    low = ty.min(axis=1)[by_low]
+    high = ty.max(axis=1)[by_low]
+    tasks = []
+    for part in np.array_split(heights, 4 * workers):
+        if not len(part):
+            continue
+        stop = np.searchsorted(low, part[-1], side='right')
+        # In mesh order, so loops start and sum exactly as without workers
+        active = np.sort(by_low[:stop][high[:stop] > part[0]])
+        used, local = np.unique(triangles[active], return_inverse=True)
+        tasks.append((vertices[used], local.reshape(-1, 3), part))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _outward([layer for part in pool.map(_slice_chunk, tasks) for layer in part])
+
+
+def _outward(layers: List[Layer]) -> List[Layer]:
+    """Reverse every loop if the mesh faces inward (negative total area)."""
+    if sum(layer.area for layer in layers) < 0:
+        for layer in layers:
+            layer.area = -layer.area
+            layer.loops = [loop[::-1] for loop in layer.loops]
+            layer.open_chains = [chain[::-1] for chain in layer.open_chains]
+    return layers
+
+
+def scaled_layers(vertices: np.ndarray, triangles: np.ndarray, target_height_mm: float,
+                  spacing_mm: float = BRICK_HEIGHT_MM, workers: int = 1) -> List[Layer]:
+    """
+    Slices of the model printed target_height_mm tall, one through the middle
+    of every spacing_mm layer from the base up. Coordinates are in mm from the
+    bounding box minimum.
+    """
+    mins, maxs = model_bounds(vertices)
+    scale = scale_factor(target_height_mm, mins, maxs)
+    count = int(np.ceil(target_height_mm / spacing_mm - 1e-9))
+    heights = (np.arange(count) + 0.5) * spacing_mm
+    return slice_mesh((vertices - mins) * scale, triangles, heights, workers)
+
+
+# --- Export ---
+
+def write_csv(layers: Sequence[Layer], path: str) -> None:
+    """One row per layer: index, height, area, loop and open chain counts."""
+    with open(path, "w") as f:
+        f.write("layer,height_mm,area_mm2,loops,open_chains\n")
+        for i, layer in enumerate(layers):
+            f.write(f"{i},{layer.height:.3f},{layer.area:.2f},{len(layer.loops)},{len(layer.open_chains)}\n")
+
+
+def write_svg(layers: Sequence[Layer], directory: str, prefix: str = "layer") -> List[str]:
+    """
+    One SVG per layer, in mm, all on the same X-Z frame so they stack. Returns
+    the file paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    points = [p for layer in layers for p in layer.loops + layer.open_chains]
+    if points:
+        stacked = np.vstack(points)
+        lo, hi = stacked.min(axis=0), stacked.max(axis=0)
+    else:
+        lo, hi = np.zeros(2), np.ones(2)
+    width, depth = hi - lo
+    paths = []
+    for i, layer in enumerate(layers):
+        shapes = []
+        for loop in layer.loops:
+            shapes.append("M " + " L ".join(f"{x:.2f},{z:.2f}" for x, z in loop - lo) + " Z")
+        outline = f'<path d="{" ".join(shapes)}" fill="#8888ff" fill-rule="evenodd" stroke="black" stroke-width="0.3"/>'
+        chains = "".join(
+            f'<polyline points="{" ".join(f"{x:.2f},{z:.2f}" for x, z in chain - lo)}" fill="none" stroke="red" stroke-width="0.3"/>'
+            for chain in layer.open_chains)
+        path = os.path.join(directory, f"{prefix}_{i:03d}.svg")
+        with open(path, "w") as f:
+            f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.2f}mm" height="{depth:.2f}mm" '
+                    f'viewBox="0 0 {width:.2f} {depth:.2f}">\n'
+                    f'<title>Layer {i}: {layer.height:.1f} mm, {layer.area:.0f} mm2</title>\n'
+                    f'{outline if shapes else ""}{chains}\n</svg>\n')
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slice an OBJ model into horizontal layers at a print height.")
+    parser.add_argument("obj", help="OBJ mesh, Y up")
+    parser.add_argument("--height-cm", type=float, default=60.0, help="Model height in cm (default: 60)")
+    parser.add_argument("--spacing", type=float, default=BRICK_HEIGHT_MM,
+                        help=f"Layer spacing in mm (default: {BRICK_HEIGHT_MM}, one brick; {PLATE_HEIGHT_MM} for plates)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; more than 1 uses a process pool (default: 1)")
+    parser.add_argument("--svg", metavar="DIR", help="Write one outline SVG per layer into DIR")
+    parser.add_argument("-o", "--output", default="layers.csv", help="Per-layer summary CSV (default: layers.csv)")
+    args = parser.parse_args()
+
+    vertices, _, triangles = load_mesh(args.obj)
+    layers = scaled_layers(vertices, triangles, args.height_cm * 10, args.spacing, args.workers)
+    write_csv(layers, args.output)
+    print(f"{len(layers)} layers, largest {max((layer.area for layer in layers), default=0.0) / 100:.1f} cm2 -> {args.output}")
+    if args.svg:
+        write_svg(layers, args.svg)
+        print(f"Outlines written to {args.svg}")
+
+
+if __name__ == "__main__":
+    main()
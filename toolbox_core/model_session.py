@@ -0,0 +1,160 @@
+"""
+Multi-Model Sessions for the Mech Scaler Tool
+
+Several variants of one model side by side. Every OBJ file is parsed once
+per process: meshes are kept in a shared cache keyed by path, size and
+modification time, and the files not cached yet are parsed concurrently in
+worker processes. Cached arrays are read-only, since every session sees the
+same ones.
+
+Skeletons are stored as bounding box ratios, so a skeleton placed on one
+model is retargeted onto the others by copying its ratios; the bone table
+then compares the lengths of every bone on every model printed at the same
+height.
+
+Example:
+    python -m toolbox_core.model_session mechscaler/a.obj mechscaler/b.obj --height-cm 60
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .scaling_model import (
+    DEFAULT_BONES, DEFAULT_SKELETON_RATIOS, Skeleton, load_mesh, model_bounds, read_skeleton_config,
+    scale_factor, skeleton_config_path, write_skeleton_config,
+)
+
+# (vertices, edges, triangles) as returned by load_mesh()
+Mesh = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+# Absolute path -> (file stamp, mesh)
+_MESHES: Dict[str, Tuple[str, Mesh]] = {}
+
+
+def _stamp(obj_path: str) -> str:
+    stat = os.stat(obj_path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def load_meshes(paths: Sequence[str], workers: Optional[int] = None) -> List[Mesh]:
+    """
+    Meshes of OBJ files as load_mesh() returns them, in order. Files
+    unchanged since they were last loaded come from the shared cache; the
+    others are parsed once each, in up to workers processes (default: one
+    per core). Raises FileNotFoundError if a file does not exist.
+    """
+    keys = [os.path.abspath(path) for path in paths]
+    stamps = {key: _stamp(key) for key in keys}
+    missing = [key for key in stamps if _MESHES.get(key, ("",))[0] != stamps[key]]
+    workers = min(len(missing), workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            meshes = list(pool.map(load_mesh, missing))
+    else:
+        meshes = [load_mesh(key) for key in missing]
+    for key, mesh in zip(missing, meshes):
+        for array in mesh:
+            array.flags.writeable = False
+        _MESHES[key] = (stamps[key], mesh)
+    return [_MESHES[key][1] for key in keys]
+
+
+@dataclass
+class SessionModel:
+    """One model of a session with its skeleton, as bounding box ratios."""
+    path: str
+    vertices: np.ndarray
+    edges: np.ndarray
+    triangles: np.ndarray
+    ratios: Dict[str, Tuple[float, ...]]
+
+    @property
+    def name(self) -> str:
+        return os.path.splitext(os.path.basename(self.path))[0]
+
+    def bone_lengths_mm(self, target_height_mm: float, bones=DEFAULT_BONES) -> Dict[str, float]:
+        """Length of every bone in mm with the model printed target_height_mm tall."""
+        mins, maxs = model_bounds(self.vertices)
+        if maxs[1] == mins[1]:
+            return {bone: 0.0 for bone, _, _ in bones}
+        skeleton = Skeleton(self.ratios, bones)
+        lengths = skeleton.lengths(skeleton.positions(mins, maxs)) * scale_factor(target_height_mm, mins, maxs)
+        return dict(zip(skeleton.bone_names, lengths.tolist()))
+
+    def save_skeleton(self) -> str:
+        """Write the skeleton to skeleton_<stem>.json next to the OBJ file; returns its path."""
+        path = skeleton_config_path(self.path)
+        write_skeleton_config(path, self.ratios)
+        return path
+
+
+class ModelSession:
+    """
+    Models loaded together, in order; the first is the reference of the
+    bone table.
+    """
+
+    def __init__(self, paths: Sequence[str] = (), workers: Optional[int] = None):
+        self.models: List[SessionModel] = []
+        self.add(paths, workers)
+
+    def add(self, paths: Sequence[str], workers: Optional[int] = None) -> List[SessionModel]:
+        """
+        Load models (see load_meshes()), each with the skeleton of its
+        skeleton_<stem>.json if there is one, else the default skeleton.
+        """
+        added = []
+        for path, (vertices, edges, triangles) in zip(paths, load_meshes(paths, workers)):
+            config = skeleton_config_path(path)
+            ratios = read_skeleton_config(config) if os.path.exists(config) else dict(DEFAULT_SKELETON_RATIOS)
+            added.append(SessionModel(path, vertices, edges, triangles, ratios))
+        self.models.extend(added)
+        return added
+
+    def retarget(self, ratios: Dict[str, Sequence[float]], targets: Optional[Sequence[SessionModel]] = None) -> None:
+        """Give every target (default: every model) the skeleton ratios; joints not in ratios are kept."""
+        for model in self.models if targets is None else targets:
+            model.ratios = {**model.ratios, **{name: tuple(value) for name, value in ratios.items()}}
+
+    def bone_table(self, target_height_mm: float, bones=DEFAULT_BONES) -> Dict[str, List[float]]:
+        """Length in mm of every bone on every model, in model order, all printed target_height_mm tall."""
+        lengths = [model.bone_lengths_mm(target_height_mm, bones) for model in self.models]
+        return {bone: [row[bone] for row in lengths] for bone, _, _ in bones}
+
+
+def format_bone_table(names: Sequence[str], table: Dict[str, List[float]]) -> str:
+    """Bone lengths in cm, with every model after the first also as the difference from it."""
+    width = max([14] + [len(name) for name in names])
+    lines = [f"{'Bone':<12}" + "".join(f" {name:>{width}}" for name in names)]
+    for bone, lengths in table.items():
+        cells = [f"{lengths[0] / 10:.1f}"] + [f"{mm / 10:.1f} ({(mm - lengths[0]) / 10:+.1f})" for mm in lengths[1:]]
+        lines.append(f"{bone:<12}" + "".join(f" {cell:>{width}}" for cell in cells))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the skeletons of several OBJ models bone by bone.")
+    parser.add_argument("obj", nargs="+", help="OBJ meshes, Y up; the first is the reference")
+    parser.add_argument("--height-cm", type=float, default=60.0, help="Print height of every model in cm (default: 60)")
+    parser.add_argument("--skeleton", help="Skeleton config to retarget onto every model "
+                                           "(default: each model's own skeleton_<stem>.json)")
+    parser.add_argument("--write", action="store_true", help="Save the retargeted skeleton next to every model")
+    parser.add_argument("--workers", type=int, help="Processes parsing the OBJ files (default: one per core)")
+    args = parser.parse_args()
+
+    session = ModelSession(args.obj, args.workers)
+    if args.skeleton:
+        session.retarget(read_skeleton_config(args.skeleton))
+    print(format_bone_table([model.name for model in session.models], session.bone_table(args.height_cm * 10)))
+    if args.write:
+        for model in session.models:
+            print(f"Wrote {model.save_skeleton()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Monte Carlo Uncertainty Engine
+
+Propagates input tolerances through a vectorized model by drawing large
+batches of samples (GUM Supplement 1 style). Draws are evaluated in chunks so
+memory stays bounded at 10^6-10^7 draws: each chunk contributes mergeable
+moments and counts in a fixed-bin histogram, from which the coverage interval
+is read. Chunks can run on a process pool, and the spread of the per-chunk
+estimates gives the convergence diagnostics of GUM S1 7.9.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+import numpy as np
+
+
+@dataclass
+class Normal:
+    """Gaussian input, e.g. a calibrated value with standard uncertainty std."""
+    mean: float
+    std: float
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return rng.normal(self.mean, self.std, n)
+
+
+@dataclass
+class Rectangular:
+    """Uniform input over mean ± half_width, e.g. a manufacturer's tolerance."""
+    mean: float
+    half_width: float
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return rng.uniform(self.mean - self.half_width, self.mean + self.half_width, n)
+
+
+@dataclass
+class Triangular:
+    """Symmetric triangular input over mean ± half_width."""
+    mean: float
+    half_width: float
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        if self.half_width == 0:
+            return np.full(n, float(self.mean))
+        return rng.triangular(self.mean - self.half_width, self.mean, self.mean + self.half_width, n)
+
+
+@dataclass
+class ConvergenceDiagnostics:
+    """Spread of the per-chunk estimates (GUM S1 7.9) against the numerical tolerance."""
+    batches: int
+    se_mean: float  # Standard deviation of the chunk means / sqrt(batches)
+    se_std: float
+    se_low: float
+    se_high: float
+    tolerance: float  # Half a unit in the last significant digit of std
+    converged: bool  # True when twice every standard error is within tolerance
+
+
+@dataclass
+class UncertaintyResult:
+    """Monte Carlo estimate of one model output."""
+    name: str
+    draws: int
+    mean: float
+    std: float  # Standard uncertainty
+    low: float  # Probabilistically symmetric coverage interval
+    high: float
+    coverage: float
+    expanded: float  # Half-width of the coverage interval
+    coverage_factor: float  # expanded / std
+    diagnostics: ConvergenceDiagnostics
+
+
+def draw_inputs(inputs: Dict[str, object], rng: np.random.Generator, n: int) -> Dict[str, np.ndarray]:
+    """n samples of every input distribution."""
+    return {name: dist.sample(rng, n) for name, dist in inputs.items()}
+
+
+def _evaluate(model: Callable, inputs, rng, n) -> Dict[str, np.ndarray]:
+    outputs = model(draw_inputs(inputs, rng, n))
+    if not isinstance(outputs, dict):
+        outputs = {"y": outputs}
+    return {name: np.broadcast_to(np.asarray(v, dtype=float), (n,)) for name, v in outputs.items()}
+
+
+def _chunk_stats(outputs: Dict[str, np.ndarray], edges: Dict[str, np.ndarray], coverage: float):
+    """Mergeable statistics of one chunk: moments, histogram counts and the chunk's own estimates."""
+    p = ((1 - coverage) / 2, (1 + coverage) / 2)
+    stats = {}
+    for name, y in outputs.items():
+        e = edges[name]
+        # Bin 0 is underflow and bin len(e) overflow
+        counts = np.bincount(np.searchsorted(e, y, side='right'), minlength=len(e) + 1)
+        low, high = np.quantile(y, p)
+        stats[name] = {
+            "n": len(y), "mean": float(np.mean(y)), "m2": float(np.var(y) * len(y)),
+            "counts": counts, "low": float(low), "high": float(high),
+        }
+    return stats
+
+
+def _run_chunks(args):
+    """Process pool entry point: evaluate a list of chunks with their own seeds."""
+    model, inputs, seeds, sizes, edges, coverage = args
+    return [
+        _chunk_stats(_evaluate(model, inputs, np.random.default_rng(seed), n), edges, coverage)
+        for seed, n in zip(seeds, sizes)
+    ]
+
+
+def _histogram_edges(y: np.ndarray, bins: int) -> np.ndarray:
+    """Bin edges spanning the pilot sample range widened by half its width each side."""
+    lo, hi = float(np.min(y)), float(np.max(y))
+    span = hi - lo
+    if span == 0:
+        span = abs(lo) * 1e-9 or 1e-12
+    return np.linspace(lo - span / 2, hi + span / 2, bins + 1)
+
+
+def _histogram_quantile(counts: np.ndarray, edges: np.ndarray, q: float) -> float:
+    """Quantile from underflow/bin/overflow counts, linear within a bin; NaN if it lies outside the bins."""
+    total = counts.sum()
+    target = q * total
+    cumulative = np.cumsum(counts)
+    i = int(np.searchsorted(cumulative, target))
+    if i == 0 or i > len(edges) - 1:
+        return float('nan')
+    below = cumulative[i - 1]
+    frac = (target - below) / counts[i] if counts[i] else 0.0
+    return float(edges[i - 1] + frac * (edges[i] - edges[i - 1]))
+
+
+def _tolerance(std: float, significant_digits: int) -> float:
+    """Half a unit in the last of significant_digits digits of std."""
+    if not np.isfinite(std) or std == 0:
+        return 0.0
+    return 0.5 * 10 ** (math.floor(math.log10(abs(std))) - significant_digits + 1)
+
+
+def _summarise(name: str, chunks: List[dict], edges: np.ndarray, coverage: float,
+               significant_digits: int) -> UncertaintyResult:
+    n = np.array([c["n"] for c in chunks], dtype=float)
+    means = np.array([c["mean"] for c in chunks])
+    m2 = np.array([c["m2"] for c in chunks])
+    total = n.sum()
+    mean = float(np.sum(n * means) / total)
+    # Chan et al. merge of the chunk second moments
+    var = float((m2.sum() + np.sum(n * (means - mean) ** 2)) / (total - 1)) if total > 1 else 0.0
+    std = math.sqrt(var)
+
+    counts = np.sum([c["counts"] for c in chunks], axis=0)
+    low = _histogram_quantile(counts, edges, (1 - coverage) / 2)
+    high = _histogram_quantile(counts, edges, (1 + coverage) / 2)
+    expanded = (high - low) / 2
+
+    h = len(chunks)
+    stds = np.sqrt(m2 / np.maximum(n - 1, 1))
+    lows = np.array([c["low"] for c in chunks])
+    highs = np.array([c["high"] for c in chunks])
+
+    def se(values):
+        return float(np.std(values, ddof=1) / math.sqrt(h)) if h > 1 else float('inf')
+
+    se_values = (se(means), se(stds), se(lows), se(highs))
+    tol = _tolerance(std, significant_digits)
+    diagnostics = ConvergenceDiagnostics(
+        batches=h, se_mean=se_values[0], se_std=se_values[1], se_low=se_values[2], se_high=se_values[3],
+        tolerance=tol, converged=bool(h > 1 and all(2 * s <= tol for s in se_values)),
+    )
+    return UncertaintyResult(
+        name=name, draws=int(total), mean=mean, std=std, low=low, high=high, coverage=coverage,
+        expanded=expanded, coverage_factor=expanded / std if std > 0 else float('nan'), diagnostics=diagnostics,
+    )
+
+
+def monte_carlo(model: Callable[[Dict[str, np.ndarray]], object], inputs: Dict[str, object],
+                draws: int = 1_000_000, chunk: int = 1 << 18, workers: int = 1, seed=None,
+                coverage: float = 0.95, adaptive: bool = False, max_draws: int = 10_000_000,
+                significant_digits: int = 2, bins: int = 1 << 14) -> Dict[str, UncertaintyResult]:
+    """
+    Propagate input distributions through a vectorized model.
+
+    Args:
+        model: Takes a dict of input sample arrays and returns an output array or a
+            dict of named output arrays. Must be picklable (module level or a
+            functools.partial of one) when workers > 1.
+        inputs: Distribution per input name (Normal, Rectangular, Triangular or
+            anything with sample(rng, n)).
+        draws: Total draws, rounded up to whole chunks. Ignored when adaptive.
+        chunk: Draws per chunk; bounds memory and sets the batch size of the
+            convergence diagnostics.
+        workers: Processes evaluating chunks; 1 runs in this process.
+        seed: Seed for reproducible draws; each chunk gets its own spawned stream.
+        coverage: Coverage probability of the interval, e.g. 0.95.
+        adaptive: Keep adding chunks until every output has converged or
+            max_draws is reached (GUM S1 7.9).
+        max_draws: Draw limit of the adaptive mode.
+        significant_digits: Digits of the standard uncertainty that must be stable.
+        bins: Histogram bins per output for the coverage interval.
+
+    Returns:
+        dict: UncertaintyResult per output name.
+    """
+    seed_seq = np.random.SeedSequence(seed)
+    # A pilot chunk fixes the histogram range and is kept as the first batch
+    pilot = _evaluate(model, inputs, np.random.default_rng(seed_seq.spawn(1)[0]), chunk)
+    edges = {name: _histogram_edges(y, bins) for name, y in pilot.items()}
+    chunks = [_chunk_stats(pilot, edges, coverage)]
+    del pilot
+
+    limit = max_draws if adaptive else draws
+    per_round = max(workers, 1) * (4 if workers > 1 else 1)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while len(chunks) * chunk < limit:
+            remaining = -(-(limit - len(chunks) * chunk) // chunk)
+            k = min(per_round, remaining)
+            seeds = seed_seq.spawn(k)
+            if pool is None:
+                chunks.extend(_run_chunks((model, inputs, seeds, [chunk] * k, edges, coverage)))
+            else:
+                tasks = [(model, inputs, [s], [chunk], edges, coverage) for s in seeds]
+                for part in pool.map(_run_chunks, tasks):
+                    chunks.extend(part)
+            if adaptive and all(
+                    _summarise(name, [c[name] for c in chunks], edges[name], coverage,
+                               significant_digits).diagnostics.converged
+                    for name in edges):
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return {name: _summarise(name, [c[name] for c in chunks], edges[name], coverage, significant_digits)
+            for name in edges}
+
+
+def format_report(results: Dict[str, UncertaintyResult], units: Dict[str, str] = None) -> str:
+    """Plain-text budget summary, one row per output."""
+    units = units or {}
+    lines = [f"{'Output':<24}{'Mean':>14}{'u':>12}{'U':>12}{'k':>7}{'Interval':>30}  Draws      Converged"]
+    for r in results.values():
+        label = f"{r.name} [{units[r.name]}]" if r.name in units else r.name
+        interval = f"[{r.low:.6g}, {r.high:.6g}]"
+        lines.append(
+            f"{label:<24}{r.mean:>14.6g}{r.std:>12.4g}{r.expanded:>12.4g}{r.coverage_factor:>7.3f}{interval:>30}"
+            f"  {r.draws:<10d} {'yes' if r.diagnostics.converged else 'no'}"
+            f" (2·se {2 * max(r.diagnostics.se_mean, r.diagnostics.se_std, r.diagnostics.se_low, r.diagnostics.se_high):.2g}"
+            f" vs δ {r.diagnostics.tolerance:.2g})")
+    return "\n".join(lines)
@@ -0,0 +1,295 @@
+"""
+Scaling Model for the Mech Scaler Tool
+
+GUI-free math behind MechScalerApp: OBJ meshes as vertex/edge arrays,
+skeleton joints placed by ratios of the model bounding box (as dicts, or as
+arrays in Skeleton for large rigs), bone lengths at a target print height,
+and the side/front view projections used for drawing and for dragging
+joints back into model space.
+"""
+
+import json
+import os
+import re
+import warnings
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Joint positions as (x, y, z) ratios 0.0-1.0 of the model bounding box
+DEFAULT_SKELETON_RATIOS = {
+    "Hip": (0.45, 0.45, 0.5),
+    "Knee": (0.55, 0.25, 0.5),
+    "Ankle": (0.45, 0.05, 0.5),
+    "Shoulder": (0.60, 0.70, 0.5),
+    "Elbow": (0.65, 0.55, 0.5),
+    "Wrist": (0.75, 0.50, 0.5),
+    "Head": (0.85, 0.85, 0.5),
+    "NeckBase": (0.65, 0.75, 0.5),
+    "TailBase": (0.35, 0.45, 0.5),
+    "TailMid": (0.20, 0.30, 0.5),
+    "TailTip": (0.05, 0.10, 0.5),
+}
+
+# (bone, start joint, end joint)
+DEFAULT_BONES = (
+    ("Femur", "Hip", "Knee"),
+    ("Tibia", "Knee", "Ankle"),
+    ("Spine", "Hip", "Shoulder"),
+    ("Neck", "Shoulder", "Head"),
+    ("Humerus", "Shoulder", "Elbow"),
+    ("Radius", "Elbow", "Wrist"),
+    ("Tail Upper", "Hip", "TailMid"),
+    ("Tail Lower", "TailMid", "TailTip"),
+)
+
+STUD_MM = 8.0  # LEGO stud pitch
+
+# Side view models start this far (px) right of the view origin
+SIDE_MARGIN = 50
+
+
+def _parse_obj(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vertices (n, 3), the concatenated 0-based vertex indices of all faces, and each face's vertex count."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    # Runs of consecutive "v" and "f" lines are parsed as whole blocks of text
+    text = np.frombuffer(data, dtype=np.uint8)
+    starts = np.concatenate(([0], np.flatnonzero(text == ord('\n')) + 1))
+    starts = starts[starts < len(data) - 1]
+    spaced = np.isin(text[starts + 1], (ord(' '), ord('\t')))
+    kind = np.where(spaced, (text[starts] == ord('v')) + 2 * (text[starts] == ord('f')), 0)
+    runs = np.flatnonzero(np.diff(kind, prepend=-1))
+    bounds = np.append(starts, len(data))
+    blocks = {1: [], 2: []}
+    for first, end in zip(runs.tolist(), np.append(runs[1:], len(kind)).tolist()):
+        if kind[first]:
+            blocks[kind[first]].append(data[bounds[first]:bounds[end]])
+
+    vertex_lines = int(np.count_nonzero(kind == 1))
+    vertices = _parse_numbers(b'\n'.join(blocks[1]).replace(b'v', b' '), float)
+    if len(vertices) != 3 * vertex_lines:
+        # Extra components (w, vertex colours) or unreadable lines: first three values per line
+        vertices = []
+        for line in b'\n'.join(blocks[1]).splitlines():
+            try:
+                vertices.append([float(x) for x in line.split()[1:4]])
+            except ValueError:
+                continue
+        vertices = [v for v in vertices if len(v) == 3]
+
+    # v, v/vt, v//vn or v/vt/vn; OBJ indices are 1-based
+    faces = b'\n'.join(blocks[2]).replace(b'f', b' ')
+    if b'/' in faces:
+        faces = re.sub(rb'/\S*', b'', faces)
+    indices = _parse_numbers(faces, np.int64) - 1
+    face_lines = int(np.count_nonzero(kind == 2))
+    if len(indices) == 3 * face_lines:
+        sizes = np.full(face_lines, 3, dtype=np.int64)
+    else:
+        sizes = np.array([len(line.split()) for line in faces.splitlines() if line.strip()], dtype=np.int64)
+        if sizes.sum() != len(indices):
+            raise ValueError(f"{path}: unreadable face")
+
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    return vertices, indices, sizes
+
+
+def _parse_numbers(text: bytes, dtype) -> np.ndarray:
+    """Whitespace-separated numbers, or none at all if any of them is unreadable."""
+    with warnings.catch_warnings():
+        # Older NumPy warns and returns the numbers before the unreadable one
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=dtype, sep=' ')
+        except (ValueError, DeprecationWarning):
+            return np.zeros(0, dtype=dtype)
+
+
+def _face_edges(indices: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """Unique undirected edges (m, 2) of the faces, each closing back to its first vertex."""
+    ends = np.cumsum(sizes)
+    following = np.arange(1, len(indices) + 1)
+    following[ends[sizes > 0] - 1] = (ends - sizes)[sizes > 0]
+    nexts = indices[following]
+    if not len(indices):
+        return np.column_stack((indices, nexts))
+    # One integer per edge sorts like the (low, high) rows, and far faster
+    low = indices.min()
+    span = indices.max() - low + 1
+    keys = (np.minimum(indices, nexts) - low) * span + (np.maximum(indices, nexts) - low)
+    keys.sort()
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    return np.column_stack((keys // span + low, keys % span + low))
+
+
+def _fan_triangles(indices: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """Triangles (m, 3) of the faces, each fanned from its first vertex."""
+    counts = np.maximum(sizes - 2, 0)
+    face = np.repeat(np.arange(len(sizes)), counts)
+    first = (np.cumsum(sizes) - sizes)[face]
+    k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    return np.column_stack((indices[first], indices[first + k], indices[first + k + 1])).reshape(-1, 3)
+
+
+def load_obj(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vertices (n, 3) and unique undirected edges (m, 2) of an OBJ file.
+
+    Faces contribute one edge per side, closing back to the first vertex;
+    edges shared between faces are kept once. Vertex indices are 0-based.
+    Raises FileNotFoundError if the file does not exist.
+    """
+    vertices, indices, sizes = _parse_obj(path)
+    return vertices, _face_edges(indices, sizes)
+
+
+def load_mesh(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vertices (n, 3), unique edges (m, 2) as in load_obj(), and triangles (t, 3)
+    of an OBJ file; faces with more than three vertices are fanned from
+    their first vertex.
+    """
+    vertices, indices, sizes = _parse_obj(path)
+    return vertices, _face_edges(indices, sizes), _fan_triangles(indices, sizes)
+
+
+def skeleton_config_path(obj_path: str) -> str:
+    """Skeleton config next to an OBJ file: rpo.obj -> skeleton_rpo.json."""
+    stem = os.path.splitext(os.path.basename(obj_path))[0]
+    return os.path.join(os.path.dirname(obj_path), f"skeleton_{stem}.json")
+
+
+def read_skeleton_config(path: str, ratios: Optional[Dict[str, Sequence[float]]] = None) -> Dict[str, Tuple[float, ...]]:
+    """
+    Joint ratios from a skeleton config, over ratios (default:
+    DEFAULT_SKELETON_RATIOS). Joints missing from the file keep their ratios,
+    unknown joints are ignored, and (x, y) entries of older 2D configs get
+    z = 0.5.
+    """
+    result = dict(DEFAULT_SKELETON_RATIOS if ratios is None else ratios)
+    with open(path, 'r') as f:
+        for name, value in json.load(f).items():
+            if name in result:
+                result[name] = (value[0], value[1], 0.5) if len(value) == 2 else tuple(value)
+    return result
+
+
+def write_skeleton_config(path: str, ratios: Dict[str, Sequence[float]]) -> None:
+    with open(path, 'w') as f:
+        json.dump({name: list(value) for name, value in ratios.items()}, f, indent=4)
+
+
+def sample_edges(edges: np.ndarray, limit: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """At most limit edges, drawn at random without replacement when there are more."""
+    if len(edges) <= limit:
+        return edges
+    rng = np.random.default_rng() if rng is None else rng
+    return edges[np.sort(rng.choice(len(edges), limit, replace=False))]
+
+
+def model_bounds(vertices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Bounding box minima and maxima (x, y, z) of a vertex array."""
+    return vertices.min(axis=0), vertices.max(axis=0)
+
+
+def scale_factor(target_height_mm, mins: np.ndarray, maxs: np.ndarray):
+    """Model units to mm for a model printed target_height_mm tall (Y up)."""
+    return target_height_mm / (maxs[1] - mins[1])
+
+
+def joint_positions(ratios: Dict[str, Sequence[float]], mins: np.ndarray, maxs: np.ndarray) -> Dict[str, np.ndarray]:
+    """Joint coordinates in model units from their bounding box ratios."""
+    names = list(ratios)
+    points = mins + np.array([ratios[n] for n in names], dtype=float).reshape(-1, 3) * (maxs - mins)
+    return dict(zip(names, points))
+
+
+def bone_lengths(joints: Dict[str, np.ndarray], bones: Iterable[Tuple[str, str, str]] = DEFAULT_BONES) -> Dict[str, float]:
+    """3D length of every bone in model units."""
+    bones = list(bones)
+    if not bones:
+        return {}
+    starts = np.array([joints[s] for _, s, _ in bones])
+    ends = np.array([joints[e] for _, _, e in bones])
+    return dict(zip((b for b, _, _ in bones), np.linalg.norm(ends - starts, axis=1)))
+
+
+class Skeleton:
+    """
+    A rig as arrays: joint ratios (n, 3) with index mapping each joint name
+    to its row, and bones (m, 2) as pairs of joint rows. Positions and bone
+    lengths of the whole rig are one vectorized step, however many joints
+    it has.
+    """
+
+    def __init__(self, ratios: Dict[str, Sequence[float]] = DEFAULT_SKELETON_RATIOS,
+                 bones: Iterable[Tuple[str, str, str]] = DEFAULT_BONES):
+        self.names = list(ratios)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.ratios = np.array([ratios[n] for n in self.names], dtype=float).reshape(-1, 3)
+        bones = list(bones)
+        self.bone_names = [bone for bone, _, _ in bones]
+        self.bones = np.array([(self.index[s], self.index[e]) for _, s, e in bones], dtype=np.int64).reshape(-1, 2)
+
+    def to_ratios(self) -> Dict[str, Tuple[float, ...]]:
+        """Joint ratios by name, as skeleton configs store them."""
+        return {name: tuple(row) for name, row in zip(self.names, self.ratios.tolist())}
+
+    def update(self, ratios: Dict[str, Sequence[float]]) -> None:
+        """Set the ratios of the named joints; joints not in the rig are ignored."""
+        for name, value in ratios.items():
+            if name in self.index:
+                self.ratios[self.index[name]] = value
+
+    def positions(self, mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+        """Joint coordinates (n, 3) in model units."""
+        return mins + self.ratios * (maxs - mins)
+
+    def lengths(self, points: np.ndarray) -> np.ndarray:
+        """3D length (m,) of every bone between joint coordinates points (n, 3)."""
+        d = points[self.bones[:, 1]] - points[self.bones[:, 0]]
+        return np.sqrt(np.einsum('ij,ij->i', d, d))
+
+    def bones_at(self, joint: int) -> np.ndarray:
+        """Rows of the bones starting or ending at joint row joint."""
+        return np.flatnonzero((self.bones == joint).any(axis=1))
+
+
+def project(points: np.ndarray, view: str, mins: np.ndarray, maxs: np.ndarray, scale: float,
+            pixels_per_mm: float, origin_x: float, floor_y: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Canvas coordinates of (n, 3) model points.
+
+    The side view shows length (X) against height and starts SIDE_MARGIN px
+    right of origin_x; the front view shows width (Z) centred on origin_x.
+    Y is up in the model and down on the canvas, with the model base on floor_y.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    px_per_unit = scale * pixels_per_mm
+    py = floor_y - (points[:, 1] - mins[1]) * px_per_unit
+    if view == "side":
+        px = origin_x + SIDE_MARGIN + (points[:, 0] - mins[0]) * px_per_unit
+    else:
+        z_center = (maxs[2] + mins[2]) / 2
+        px = origin_x + (points[:, 2] - z_center) * px_per_unit
+    return px, py
+
+
+def unproject(px: float, py: float, view: str, mins: np.ndarray, maxs: np.ndarray, scale: float,
+              pixels_per_mm: float, origin_x: float, floor_y: float) -> Tuple[float, float]:
+    """
+    Bounding box ratios under a canvas point, inverse of project().
+
+    Returns (horizontal, vertical): the X ratio in the side view or the Z ratio
+    in the front view, and the Y ratio. A flat axis maps to 0 (0.5 for Z).
+    """
+    px_per_unit = scale * pixels_per_mm
+    span = maxs - mins
+    ry = (floor_y - py) / px_per_unit / span[1] if span[1] else 0.0
+    if view == "side":
+        rh = (px - origin_x - SIDE_MARGIN) / px_per_unit / span[0] if span[0] else 0.0
+    else:
+        z = (maxs[2] + mins[2]) / 2 + (px - origin_x) / px_per_unit
+        rh = (z - mins[2]) / span[2] if span[2] else 0.5
+    return float(rh), float(ry)
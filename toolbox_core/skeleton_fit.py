@@ -0,0 +1,550 @@
+"""
+Automatic Skeleton Fitting for the Mech Scaler Tool
+
+Estimates the MechScalerApp joints from the mesh instead of hand-dragged
+bounding box ratios. The mesh is rotated about Y so its principal horizontal
+axis runs along the grid, voxelized and filled, and the joints are found by
+tracing connected cross-sections of the solid slice by slice:
+
+- legs: horizontal slices from each ground contact upward until the leg
+  merges with the body or the other leg (hip); the ankle sits where the foot
+  narrows and the knee at the largest bend of the leg's medial line
+- tail: slices across the principal axis from the hip to the end of the
+  longer low overhang; the tail base is where the cross-section halves,
+  the tip the last slice with an interior
+- torso, neck and head: horizontal slices from the hip upward; an arm
+  joining the torso in front marks the shoulder, the narrowest slice below
+  a wider head the neck
+- arms: horizontal slices from the shoulder downward; the elbow at the
+  largest bend, the wrist near the end
+
+Medial points come from the erosion depth of the voxel volume, so every
+joint lies on the medial axis of its cross-section, clipped to the bounding
+box. Joints that cannot be found keep their current ratios. Y must be up, as in MechScalerApp.
+
+Example:
+    python -m toolbox_core.skeleton_fit mechscaler/model.obj
+"""
+
+import argparse
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .scaling_model import (DEFAULT_SKELETON_RATIOS, load_mesh, model_bounds, read_skeleton_config,
+                            skeleton_config_path, write_skeleton_config)
+
+# Voxels along the longest aligned axis
+DEFAULT_RESOLUTION = 128
+
+# Triangles per voxelization chunk and sample points per batch, bounding temporary memory
+TRIANGLE_CHUNK = 1 << 20
+POINT_BATCH = 1 << 22
+
+
+@dataclass
+class VoxelGrid:
+    """
+    Filled voxel volume of a mesh in its aligned frame: u along the principal
+    horizontal axis, y up, w across. Voxel (i, j, k) spans origin + (i, j, k) * pitch
+    to one pitch beyond.
+    """
+    solid: np.ndarray
+    origin: np.ndarray
+    pitch: float
+    angle: float
+
+    def to_model(self, index: Sequence[float]) -> np.ndarray:
+        """Model coordinates of a (fractional) voxel index."""
+        u, y, w = self.origin + (np.asarray(index, dtype=float) + 0.5) * self.pitch
+        c, s = np.cos(self.angle), np.sin(self.angle)
+        return np.array([u * c - w * s, y, u * s + w * c])
+
+
+@dataclass
+class SkeletonFit:
+    """Joint ratios after fitting, the joints that were fitted, and why any were kept."""
+    ratios: Dict[str, Tuple[float, float, float]]
+    fitted: List[str] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+
+
+def principal_angle(vertices: np.ndarray, max_samples: int = 200_000) -> float:
+    """Rotation about Y (radians) taking the principal axis of the XZ footprint onto +X."""
+    step = max(len(vertices) // max_samples, 1)
+    xz = vertices[::step][:, [0, 2]]
+    xz = xz - xz.mean(axis=0)
+    _, vectors = np.linalg.eigh(xz.T @ xz)
+    ex, ez = vectors[:, -1]
+    if ex < 0:
+        ex, ez = -ex, -ez
+    return float(np.arctan2(ez, ex))
+
+
+def _aligned(points: np.ndarray, angle: float) -> np.ndarray:
+    c, s = np.cos(angle), np.sin(angle)
+    return np.column_stack((points[:, 0] * c + points[:, 2] * s, points[:, 1], points[:, 2] * c - points[:, 0] * s))
+
+
+def _barycentric(steps: int) -> np.ndarray:
+    """Weights (p, 3) of a triangular grid with steps subdivisions per side, without the corners."""
+    i, j = np.meshgrid(np.arange(steps + 1), np.arange(steps + 1), indexing='ij')
+    keep = (i + j <= steps) & (i < steps) & (j < steps) & (i + j > 0)
+    i, j = i[keep] / steps, j[keep] / steps
+    return np.column_stack((i, j, 1.0 - i - j))
+
+
+def voxelize(vertices: np.ndarray, triangles: Optional[np.ndarray] = None,
+             resolution: int = DEFAULT_RESOLUTION) -> VoxelGrid:
+    """
+    Filled voxel volume of a mesh, resolution voxels along its longest aligned axis.
+
+    The surface is marked from the vertices and from points sampled at most
+    half a voxel apart on every larger triangle. A voxel is solid when it is
+    on the surface or enclosed by surface along all three axes, which also
+    closes small holes in meshes that are not watertight.
+    """
+    angle = principal_angle(vertices)
+    aligned = _aligned(vertices, angle)
+    lo, hi = model_bounds(aligned)
+    pitch = float(max(hi - lo)) / resolution or 1.0
+    # One empty voxel of padding on every side
+    origin = lo - pitch
+    shape = tuple(np.floor((hi - lo) / pitch).astype(int) + 3)
+    surface = np.zeros(shape, dtype=bool)
+    flat = surface.reshape(-1)
+    strides = np.array([shape[1] * shape[2], shape[2], 1])
+
+    def mark(points):
+        # Points within the vertex bounds always fall inside the padded grid
+        flat[np.floor((points - origin) / pitch).astype(np.int64) @ strides] = True
+
+    mark(aligned)
+    if triangles is not None:
+        for start in range(0, len(triangles), TRIANGLE_CHUNK):
+            corners = aligned[triangles[start:start + TRIANGLE_CHUNK]]
+            longest = np.max(np.linalg.norm(corners - np.roll(corners, 1, axis=1), axis=2), axis=1)
+            steps = np.minimum(np.ceil(longest / (0.5 * pitch)), 4 * resolution).astype(np.int64)
+            # Triangles under half a voxel are covered by their vertices
+            for n in np.unique(steps[steps >= 2]):
+                weights = _barycentric(int(n))
+                group = corners[steps == n]
+                per_batch = max(POINT_BATCH // len(weights), 1)
+                for b in range(0, len(group), per_batch):
+                    mark((weights @ group[b:b + per_batch]).reshape(-1, 3))
+
+    return VoxelGrid(fill_interior(surface), origin, pitch, angle)
+
+
+def fill_interior(surface: np.ndarray) -> np.ndarray:
+    """Surface voxels plus every voxel with surface on both sides along all three axes."""
+    solid = surface.copy()
+    enclosed = np.ones_like(surface)
+    for axis in range(surface.ndim):
+        forward = np.logical_or.accumulate(surface, axis=axis)
+        backward = np.flip(np.logical_or.accumulate(np.flip(surface, axis), axis=axis), axis)
+        enclosed &= forward & backward
+    return solid | enclosed
+
+
+def _faces(ndim: int, axis: int):
+    """Index pairs selecting each voxel and its neighbour one step along axis."""
+    lo = [slice(None)] * ndim
+    hi = [slice(None)] * ndim
+    lo[axis] = slice(None, -1)
+    hi[axis] = slice(1, None)
+    return tuple(lo), tuple(hi)
+
+
+def erosion_depth(solid: np.ndarray) -> np.ndarray:
+    """Number of face-neighbour erosions each solid voxel survives, plus one; 0 outside."""
+    depth = np.zeros(solid.shape, dtype=np.int32)
+    current = solid.copy()
+    level = 0
+    while current.any():
+        level += 1
+        depth[current] = level
+        eroded = current.copy()
+        for axis in range(solid.ndim):
+            lo, hi = _faces(solid.ndim, axis)
+            eroded[lo] &= current[hi]
+            eroded[hi] &= current[lo]
+            edge = [slice(None)] * solid.ndim
+            for end in (0, -1):
+                edge[axis] = end
+                eroded[tuple(edge)] = False
+        current = eroded
+    return depth
+
+
+def label(mask: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Connected components of a boolean array (face neighbours): labels 1..count,
+    0 for the background.
+    """
+    size = mask.size
+    background = np.int64(size)
+    labels = np.where(mask, np.arange(size).reshape(mask.shape), background)
+    while True:
+        merged = labels.copy()
+        for axis in range(mask.ndim):
+            lo, hi = _faces(mask.ndim, axis)
+            np.minimum(merged[lo], labels[hi], out=merged[lo])
+            np.minimum(merged[hi], labels[lo], out=merged[hi])
+        merged[~mask] = background
+        # Pointer jumping: follow each label to its own label
+        flat = merged.ravel()
+        inside = flat < background
+        flat[inside] = flat[flat[inside]]
+        if np.array_equal(merged, labels):
+            break
+        labels = merged
+    roots, compact = np.unique(labels[mask], return_inverse=True)
+    result = np.zeros(mask.shape, dtype=np.int32)
+    result[mask] = compact.ravel() + 1
+    return result, len(roots)
+
+
+def _medial(depth: np.ndarray, region: np.ndarray) -> np.ndarray:
+    """Deepest voxel of a slice region, the one nearest the region's centroid on ties."""
+    coords = np.argwhere(region)
+    values = depth[region]
+    deepest = coords[values == values.max()]
+    centre = coords.mean(axis=0)
+    return deepest[np.argmin(((deepest - centre) ** 2).sum(axis=1))].astype(float)
+
+
+def _follow(labels: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """Union of the slice components overlapping the previous region."""
+    ids = np.unique(labels[previous])
+    ids = ids[ids > 0]
+    return np.isin(labels, ids) if len(ids) else np.zeros_like(previous)
+
+
+def _largest_bend(points: np.ndarray) -> int:
+    """Index of the interior point farthest from the chord of a side-view (u, y) polyline."""
+    start, end = points[0, :2], points[-1, :2]
+    chord = end - start
+    length = np.hypot(*chord)
+    if len(points) < 3 or length == 0:
+        return len(points) // 2
+    offsets = np.abs(chord[0] * (points[:, 1] - start[1]) - chord[1] * (points[:, 0] - start[0])) / length
+    best = int(np.argmax(offsets[1:-1])) + 1
+    # A straight limb bends at its middle
+    return best if offsets[best] >= 1.0 else len(points) // 2
+
+
+def _along(points: np.ndarray, fraction: float) -> int:
+    """Index of the polyline point at the given fraction of its length."""
+    steps = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    distance = np.concatenate(([0.0], np.cumsum(steps)))
+    return int(np.argmin(np.abs(distance - fraction * distance[-1])))
+
+
+class _Slices:
+    """Component labels of the slices of a volume along one axis, computed on first use."""
+
+    def __init__(self, solid: np.ndarray, depth: np.ndarray, axis: int):
+        self.solid = np.moveaxis(solid, axis, 0)
+        self.depth = np.moveaxis(depth, axis, 0)
+        self.labels: Dict[int, np.ndarray] = {}
+
+    def __len__(self):
+        return len(self.solid)
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        if index not in self.labels:
+            self.labels[index] = label(self.solid[index])[0]
+        return self.labels[index]
+
+
+def _trace(slices: _Slices, seed: np.ndarray, start: int, step: int, limit: Optional[int] = None):
+    """
+    Follow the components overlapping seed from slice start in direction step.
+    Returns the slice indices, regions, areas and medial points (slice coordinates).
+    """
+    indices, regions, areas, points = [], [], [], []
+    previous = seed
+    index = start
+    while 0 <= index < len(slices) and (limit is None or len(indices) < limit):
+        region = _follow(slices[index], previous)
+        if not region.any():
+            break
+        indices.append(index)
+        regions.append(region)
+        areas.append(int(region.sum()))
+        points.append(_medial(slices.depth[index], region))
+        previous = region
+        index += step
+    return indices, regions, areas, points
+
+
+def _trace_legs(horizontal: _Slices, ground: int, contact_layers: int):
+    """
+    Trace every ground contact upward. A trace ends where it merges with
+    another contact's trace or its cross-section jumps (the body).
+    Returns one dict per contact with its levels, areas, medial points and
+    whether it merged.
+    """
+    contact = horizontal.solid[ground:ground + contact_layers].any(axis=0)
+    contact_labels, count = label(contact)
+    if not count:
+        return []
+    sizes = np.bincount(contact_labels.ravel())[1:]
+    legs = [{"seed": contact_labels == k + 1, "levels": [], "areas": [], "points": [], "regions": [],
+             "merged": False, "done": False}
+            for k in range(count) if sizes[k] >= 0.05 * sizes.max()]
+
+    for y in range(ground, len(horizontal)):
+        labels = horizontal[y]
+        ids = {}
+        for i, leg in enumerate(legs):
+            if leg["done"]:
+                continue
+            found = np.unique(labels[leg["seed"]])
+            found = found[found > 0]
+            if not len(found):
+                leg["done"] = True
+            else:
+                ids[i] = set(found.tolist())
+        for i, found in ids.items():
+            leg = legs[i]
+            shared = any(found & other for j, other in ids.items() if j != i)
+            region = np.isin(labels, list(found))
+            area = int(region.sum())
+            jump = len(leg["areas"]) >= 3 and area > 2.5 * np.median(leg["areas"][-5:])
+            if shared or jump:
+                leg["merged"] = leg["done"] = True
+                continue
+            leg["levels"].append(y)
+            leg["areas"].append(area)
+            leg["regions"].append(region)
+            point = _medial(horizontal.depth[y], region)
+            leg["points"].append(np.array([point[0], y, point[1]]))
+            leg["seed"] = region
+        if all(leg["done"] for leg in legs):
+            break
+    return legs
+
+
+def fit_skeleton(vertices: np.ndarray, triangles: Optional[np.ndarray] = None,
+                 ratios: Optional[Dict[str, Sequence[float]]] = None, resolution: int = DEFAULT_RESOLUTION,
+                 grid: Optional[VoxelGrid] = None) -> SkeletonFit:
+    """
+    Joint ratios (of the vertex bounding box) fitted to a mesh.
+
+    Args:
+        vertices: (n, 3) vertices, Y up.
+        triangles: (t, 3) vertex indices; without them only the vertices are voxelized.
+        ratios: Current joint ratios, kept for joints that cannot be fitted
+            (default: DEFAULT_SKELETON_RATIOS).
+        resolution: Voxels along the longest aligned axis.
+        grid: A voxelization of the same mesh to reuse, e.g. from load_grid().
+    """
+    ratios = {name: tuple(float(v) for v in r) for name, r in (ratios or DEFAULT_SKELETON_RATIOS).items()}
+    fit = SkeletonFit(dict(ratios))
+    grid = grid if grid is not None else voxelize(vertices, triangles, resolution)
+    solid = grid.solid
+    if not solid.any():
+        fit.notes.append("empty mesh")
+        return fit
+    depth = erosion_depth(solid)
+    horizontal = _Slices(solid, depth, axis=1)
+    across = _Slices(solid, depth, axis=0)
+
+    levels = np.flatnonzero(solid.any(axis=(0, 2)))
+    ground, top = int(levels[0]), int(levels[-1])
+    height = top - ground + 1
+    contact_layers = max(1, int(round(0.03 * height)))
+
+    joints: Dict[str, np.ndarray] = {}
+
+    # --- Legs ---
+    legs = [leg for leg in _trace_legs(horizontal, ground, contact_layers)
+            if leg["merged"] and len(leg["levels"]) >= max(3, 0.1 * height)]
+    if not legs:
+        fit.notes.append("no leg rising from the ground into the body; joints kept")
+        return fit
+    leg = max(legs, key=lambda leg: (len(leg["levels"]), np.mean(leg["areas"])))
+    chain = np.array(leg["points"])
+    areas = np.array(leg["areas"])
+    radius = np.sqrt(areas[-1] / np.pi)
+    joints["Hip"] = chain[-1] + (0.0, radius, 0.0)
+    # The ankle is where the foot narrows, within the lower part of the leg
+    narrow = np.flatnonzero(areas[:max(int(0.3 * len(areas)), 1)] <= 0.6 * areas[0])
+    ankle = int(narrow[0]) if len(narrow) else int(round(0.08 * (len(areas) - 1)))
+    joints["Ankle"] = chain[ankle]
+    knee = ankle + _largest_bend(chain[ankle:])
+    joints["Knee"] = chain[knee]
+    hip_u, hip_y = joints["Hip"][0], joints["Hip"][1]
+
+    # --- Tail ---
+    # The tail is the longer overhang from the hip within the lower body
+    band = solid[:, ground:int(hip_y + 0.5 * (hip_y - ground)) + 1, :].any(axis=(1, 2))
+    occupied = np.flatnonzero(band)
+    tail_dir = -1 if hip_u - occupied[0] >= occupied[-1] - hip_u else 1
+    start = int(round(hip_u))
+    section = across.solid[start]
+    coords = np.argwhere(section)
+    nearest = coords[np.argmin(((coords - joints["Hip"][[1, 2]]) ** 2).sum(axis=1))]
+    seed = across[start] == across[start][tuple(nearest)]
+    indices, regions, tail_areas, points = _trace(across, seed, start, tail_dir)
+    if len(indices) >= 3:
+        tail = np.array([[u, y, w] for u, (y, w) in zip(indices, points)])
+        halved = np.flatnonzero(np.array(tail_areas) <= 0.5 * tail_areas[0])
+        base = int(halved[0]) if len(halved) else int(round(0.15 * (len(tail) - 1)))
+        base = min(base, len(tail) - 2)
+        # The end cap is all surface, so its medial point can sit on an edge; the tip is the
+        # last slice with interior depth (the last slice for a tail one voxel thin)
+        inner = [k for k, (u, region) in enumerate(zip(indices, regions)) if across.depth[u][region].max() > 1]
+        tip = max(inner[-1] if inner else len(tail) - 1, base + 1)
+        joints["TailBase"] = tail[base]
+        joints["TailMid"] = tail[base + _along(tail[base:tip + 1], 0.5)]
+        joints["TailTip"] = tail[tip]
+    else:
+        fit.notes.append("no tail behind the hip; tail joints kept")
+
+    # --- Torso, arms, neck and head ---
+    head_dir = -tail_dir
+    start = leg["levels"][-1] + 1
+    torso_levels, torso_regions, torso_areas, torso_points = _trace(horizontal, leg["regions"][-1], start, 1)
+    torso = np.array([[u, y, w] for y, (u, w) in zip(torso_levels, torso_points)])
+    arms = []
+    for k in range(1, len(torso_levels)):
+        y = torso_levels[k]
+        below = horizontal[y - 1]
+        joined = np.unique(below[torso_regions[k] & ~torso_regions[k - 1]])
+        for component in joined[joined > 0]:
+            seed = below == component
+            arm_levels, _, arm_areas, arm_points = _trace(horizontal, seed, y - 1, -1)
+            reaches_ground = arm_levels[-1] <= ground + contact_layers
+            in_front = (arm_points[0][0] - torso[k - 1][0]) * head_dir > 0
+            if not reaches_ground and in_front and len(arm_levels) >= max(3, 0.06 * height):
+                arm = np.array([[u, ay, w] for ay, (u, w) in zip(arm_levels, arm_points)])
+                arms.append((len(arm_levels), k, arm, arm_areas[0]))
+    shoulder_k = None
+    if arms:
+        _, shoulder_k, arm, arm_area = max(arms, key=lambda a: a[0])
+        joints["Shoulder"] = arm[0] + (0.0, np.sqrt(arm_area / np.pi), 0.0)
+        wrist = _along(arm, 0.85)
+        joints["Wrist"] = arm[wrist]
+        joints["Elbow"] = arm[_largest_bend(arm[:wrist + 1])]
+    else:
+        fit.notes.append("no arm joining the torso in front; arm joints kept")
+
+    # The neck is the slice narrowest relative to the widest slice above it
+    first = shoulder_k if shoulder_k is not None else len(torso_levels) // 2
+    torso_areas = np.array(torso_areas, dtype=float)
+    scores = [(torso_areas[k] / torso_areas[k + 1:].max(), k) for k in range(first, len(torso_levels) - 3)]
+    if scores and min(scores)[0] < 0.8:
+        neck = min(scores)[1]
+        head = neck + 1 + int(np.argmax(torso_areas[neck + 1:]))
+        joints["Head"] = torso[head]
+        # The neck base is where the torso has narrowed halfway to the neck
+        halfway = 0.5 * (torso_areas[first] + torso_areas[neck])
+        narrowed = np.flatnonzero(torso_areas[first:neck + 1] <= halfway)
+        joints["NeckBase"] = torso[first + int(narrowed[0]) if len(narrowed) else (first + neck) // 2]
+    else:
+        fit.notes.append("no neck above the shoulders; head joints kept")
+
+    mins, maxs = model_bounds(vertices)
+    span = np.where(maxs > mins, maxs - mins, 1.0)
+    for name, index in joints.items():
+        if name in fit.ratios:
+            # Voxel centres can lie up to half a voxel outside the vertex bounding box
+            ratio = np.clip((grid.to_model(index) - mins) / span, 0.0, 1.0)
+            fit.ratios[name] = tuple(round(float(r), 4) for r in ratio)
+            fit.fitted.append(name)
+    return fit
+
+
+# --- Voxel cache ---
+
+def save_grid(path: str, grid: VoxelGrid, key: str) -> None:
+    """Store a voxelization with the key it belongs to (e.g. mesh file size, mtime and resolution)."""
+    with open(path, "wb") as f:
+        np.savez(f, solid=np.packbits(grid.solid), shape=np.array(grid.solid.shape), origin=grid.origin,
+                 pitch=grid.pitch, angle=grid.angle, key=key)
+
+
+def load_grid(path: str, key: str) -> Optional[VoxelGrid]:
+    """The voxelization stored at path, or None if it is missing, unreadable or for another key."""
+    try:
+        with np.load(path) as data:
+            if str(data["key"]) != key:
+                return None
+            shape = tuple(int(n) for n in data["shape"])
+            solid = np.unpackbits(data["solid"], count=int(np.prod(shape))).astype(bool).reshape(shape)
+            return VoxelGrid(solid, data["origin"], float(data["pitch"]), float(data["angle"]))
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def grid_cache_key(obj_path: str, resolution: int) -> str:
+    stat = os.stat(obj_path)
+    return f"{os.path.abspath(obj_path)}:{stat.st_size}:{stat.st_mtime_ns}:{resolution}"
+
+
+def grid_cache_path(obj_path: str) -> str:
+    """Voxel cache next to the skeleton config: skeleton_<stem>.voxels.npz."""
+    return os.path.splitext(skeleton_config_path(obj_path))[0] + ".voxels.npz"
+
+
+def cached_grid(obj_path: str, vertices: np.ndarray, triangles: Optional[np.ndarray],
+                resolution: int = DEFAULT_RESOLUTION) -> VoxelGrid:
+    """Voxelization of an OBJ file's mesh, reused from its cache file while the file is unchanged."""
+    path = grid_cache_path(obj_path)
+    key = grid_cache_key(obj_path, resolution)
+    grid = load_grid(path, key)
+    if grid is None:
+        grid = voxelize(vertices, triangles, resolution)
+        try:
+            save_grid(path, grid, key)
+        except OSError:
+            pass
+    return grid
+
+
+def format_report(fit: SkeletonFit) -> str:
+    lines = [f"{'Joint':<10} {'x':>7} {'y':>7} {'z':>7}"]
+    for name, (x, y, z) in fit.ratios.items():
+        lines.append(f"{name:<10} {x:>7.3f} {y:>7.3f} {z:>7.3f}  {'fitted' if name in fit.fitted else 'kept'}")
+    lines.extend(f"Note: {note}" for note in fit.notes)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the Mech Scaler skeleton to an OBJ mesh.")
+    parser.add_argument("obj", help="OBJ mesh, Y up")
+    parser.add_argument("--resolution", type=int, default=DEFAULT_RESOLUTION,
+                        help=f"Voxels along the longest axis (default: {DEFAULT_RESOLUTION})")
+    parser.add_argument("-o", "--output", help="Skeleton config to write (default: skeleton_<stem>.json next to the OBJ)")
+    parser.add_argument("--no-cache", action="store_true", help="Voxelize even if a cached grid exists")
+    args = parser.parse_args()
+
+    output = args.output or skeleton_config_path(args.obj)
+    ratios = read_skeleton_config(output) if os.path.exists(output) else dict(DEFAULT_SKELETON_RATIOS)
+
+    start = time.perf_counter()
+    vertices, _, triangles = load_mesh(args.obj)
+    loaded = time.perf_counter()
+    if args.no_cache:
+        grid = voxelize(vertices, triangles, args.resolution)
+    else:
+        grid = cached_grid(args.obj, vertices, triangles, args.resolution)
+    voxelized = time.perf_counter()
+    fit = fit_skeleton(vertices, triangles, ratios, args.resolution, grid=grid)
+    done = time.perf_counter()
+
+    print(format_report(fit))
+    print(f"Loaded {len(vertices)} vertices in {loaded - start:.2f} s, voxelized {grid.solid.shape} "
+          f"in {voxelized - loaded:.2f} s, fitted in {done - voxelized:.2f} s")
+    write_skeleton_config(output, fit.ratios)
+    print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
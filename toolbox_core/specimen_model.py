@@ -113,6 +113,37 @@ class TensileSpecimen:
         
         return x, y
     
+    def stress_distribution(self, force: float, num_points: int = 200) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Axial stress along the specimen profile.
+        
+        Nominal stress F/A at each profile point, with K_t applied in the
+        fillet transitions (simplified stress concentration).
+        
+        Returns:
+            x: Axial position (mm)
+            stress: Stress (MPa)
+        """
+        x, y = self.get_profile_coordinates(num_points)
+        stress = np.zeros_like(x)
+        kt = self.stress_concentration_factor()
+        
+        grip1_end = self.geometry.grip_length
+        transition1_end = grip1_end + self.geometry.fillet_radius
+        gauge_end = transition1_end + self.geometry.gauge_length
+        transition2_end = gauge_end + self.geometry.fillet_radius
+        
+        for i, (xi, yi) in enumerate(zip(x, y)):
+            area = np.pi * yi ** 2
+            if area > 0:
+                stress[i] = force / area
+                
+                # Apply stress concentration at transitions
+                if grip1_end < xi < transition1_end or gauge_end < xi < transition2_end:
+                    stress[i] *= kt
+        
+        return x, stress
+    
     def calculate_stress(self, force: float) -> float:
         """
         Calculate engineering stress in gauge section.
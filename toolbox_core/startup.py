@@ -0,0 +1,164 @@
+"""
+Startup Profiling for the Toolbox Applications
+
+Times a tool's startup from the first line of its script: each import and
+construction phase, the first paint, and the point the event loop is idle
+and the window responds to input (time-to-interactive), which is checked
+against a per-tool budget.
+
+Only the standard library is imported here, so the profiler can start before
+NumPy and the GUI stack and time their imports.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Time-to-interactive budgets in ms, measured from the first line of the tool's script
+STARTUP_BUDGETS_MS = {
+    "wheatstone_bridge": 600.0,
+    "live_monitor": 1000.0,
+    "tensile_analyzer": 1200.0,
+    "hysteresis_plotter": 900.0,
+    "chainlink_mechanics": 1000.0,
+    "mech_scaler": 500.0,
+}
+
+
+def _process_age() -> Optional[float]:
+    """
+    Seconds since the process was launched, or None where that is unknown.
+
+    For a PyInstaller one-file executable this is measured from the creation of
+    its unpack directory, so it includes extracting the bundle.
+    """
+    meipass = getattr(sys, "_MEIPASS", None)
+    if meipass:
+        try:
+            return max(time.time() - os.path.getctime(meipass), 0.0)
+        except OSError:
+            return None
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            start_ticks = float(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(uptime - start_ticks / os.sysconf("SC_CLK_TCK"), 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupProfiler:
+    """
+    Phase timings and milestones of one tool's startup.
+
+    Args:
+        tool: Key into STARTUP_BUDGETS_MS; also the report title.
+        budget_ms: Time-to-interactive budget, overriding STARTUP_BUDGETS_MS.
+    """
+
+    def __init__(self, tool: str, budget_ms: Optional[float] = None):
+        self.tool = tool
+        self.budget_ms = STARTUP_BUDGETS_MS.get(tool) if budget_ms is None else budget_ms
+        self.origin = time.perf_counter()
+        self.pre_script = _process_age()
+        self.phases: List[Tuple[str, float, float]] = []
+        self.marks: Dict[str, float] = {}
+
+    def set_tool(self, tool: str) -> None:
+        """Report as another tool, with its budget; for scripts that can open one of several windows."""
+        self.tool = tool
+        self.budget_ms = STARTUP_BUDGETS_MS.get(tool)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.origin) * 1000.0
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as one phase of the breakdown."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start, time.perf_counter()))
+
+    def mark(self, name: str) -> None:
+        """Record a milestone (first time only), e.g. 'first paint' or 'interactive'."""
+        self.marks.setdefault(name, self.elapsed_ms())
+
+    @property
+    def interactive_ms(self) -> Optional[float]:
+        return self.marks.get("interactive")
+
+    @property
+    def within_budget(self) -> bool:
+        ms = self.interactive_ms
+        return self.budget_ms is None or (ms is not None and ms <= self.budget_ms)
+
+    def report(self) -> str:
+        """Phase and milestone breakdown with the time-to-interactive verdict."""
+        lines = [f"Startup profile: {self.tool}"]
+        if self.pre_script is not None:
+            lines.append(f"  {'process launch to script':<32} {self.pre_script * 1000.0:>9.1f} ms (before t=0)")
+        for name, start, end in sorted(self.phases, key=lambda phase: phase[1]):
+            lines.append(f"  {name:<32} {(end - start) * 1000.0:>9.1f} ms   at {(start - self.origin) * 1000.0:>7.1f} ms")
+        for name, ms in self.marks.items():
+            lines.append(f"  {name:<32} {'':>9}      at {ms:>7.1f} ms")
+        ms = self.interactive_ms
+        if ms is None:
+            lines.append("Time-to-interactive not reached")
+        elif self.budget_ms is None:
+            lines.append(f"Time-to-interactive {ms:.1f} ms (no budget)")
+        else:
+            verdict = "PASS" if ms <= self.budget_ms else "OVER BUDGET"
+            lines.append(f"Time-to-interactive {ms:.1f} ms of {self.budget_ms:.0f} ms budget "
+                         f"({ms / self.budget_ms:.0%})  {verdict}")
+        return "\n".join(lines)
+
+    def finish(self) -> int:
+        """Print the report to stderr; exit status 0 within budget, 1 over it."""
+        print(self.report(), file=sys.stderr)
+        return 0 if self.within_budget else 1
+
+    def watch_qt(self, window, app) -> None:
+        """
+        Mark the first paint of a Qt window and the first idle event loop pass
+        after it, then quit the application.
+        """
+        # Qt is loaded by the caller already; nothing is imported here until now
+        from PyQt6.QtCore import QObject, QEvent, QTimer
+
+        profiler = self
+
+        def interactive():
+            profiler.mark("interactive")
+            app.quit()
+
+        class FirstPaint(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint and obj.isWidgetType() and (obj is window or window.isAncestorOf(obj)):
+                    profiler.mark("first paint")
+                    app.removeEventFilter(self)
+                    # Fires once the queued paint and layout events are drained
+                    QTimer.singleShot(0, interactive)
+                return False
+
+        self._paint_filter = FirstPaint()
+        app.installEventFilter(self._paint_filter)
+
+    def watch_tk(self, root) -> None:
+        """Tkinter counterpart of watch_qt: first <Expose> in root, then the next idle callback."""
+        def interactive():
+            self.mark("interactive")
+            root.quit()
+
+        def exposed(event):
+            if "first paint" not in self.marks:
+                self.mark("first paint")
+                root.after_idle(interactive)
+
+        root.bind("<Expose>", exposed, add="+")
+
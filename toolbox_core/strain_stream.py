@@ -0,0 +1,168 @@
+"""
+Strain Stream for the Wheatstone Bridge Tool
+
+Converts blocks of multi-channel bridge output (mV/V) from a data acquisition
+stream back into strain, with per-channel bridge setup, zero balance and shunt
+calibration, and keeps the result in a preallocated ring buffer whose contents
+are handed out as views rather than copies.
+
+Blocks are laid out as (samples, channels).
+"""
+
+from dataclasses import fields, replace
+from typing import Tuple
+
+import numpy as np
+
+from .bridge_model import BridgeConfig, output_mv_per_v, strain_from_output
+
+
+def channel_config(config: BridgeConfig, n_channels: int) -> BridgeConfig:
+    """Broadcast every BridgeConfig field to one value per channel."""
+    return BridgeConfig(**{
+        f.name: np.broadcast_to(np.asarray(getattr(config, f.name)), (n_channels,)).copy()
+        for f in fields(BridgeConfig)
+    })
+
+
+def _subset(config: BridgeConfig, idx) -> BridgeConfig:
+    return BridgeConfig(**{f.name: getattr(config, f.name)[idx] for f in fields(BridgeConfig)})
+
+
+class StrainInverter:
+    """
+    Per-channel inverse bridge model for streaming blocks.
+
+    Channels sharing a bridge type and shunt state are inverted together with
+    one call to the exact inverse, so a homogeneous channel set costs a single
+    vectorized pass per block.
+
+    Args:
+        config: Bridge setup; fields may be scalars or per-channel arrays.
+        n_channels: Number of channels in each block.
+    """
+
+    def __init__(self, config: BridgeConfig, n_channels: int):
+        self.n_channels = n_channels
+        self.config = channel_config(config, n_channels)
+        self.offset_mv_v = np.zeros(n_channels)  # Subtracted before inversion (zero balance)
+        self.gain = np.ones(n_channels)  # Applied after the offset (shunt calibration)
+        self._build_groups()
+
+    def _build_groups(self):
+        keys = np.stack([self.config.active_gauges, self.config.shunt_connected]).T
+        unique = np.unique(keys, axis=0)
+        self.groups = []
+        for key in unique:
+            idx = np.flatnonzero(np.all(keys == key, axis=1))
+            whole = len(idx) == self.n_channels
+            sub = _subset(self.config, idx)
+            # Scalar bridge type lets strain_from_output pick one kernel
+            sub.active_gauges = int(key[0])
+            self.groups.append((slice(None) if whole else idx, sub))
+
+    def set_config(self, config: BridgeConfig):
+        """Replace the bridge setup, e.g. after toggling the shunt on some channels."""
+        self.config = channel_config(config, self.n_channels)
+        self._build_groups()
+
+    def zero_balance(self, block_mv_v: np.ndarray):
+        """Set per-channel offsets so the mean of a zero-strain block reads zero strain."""
+        expected = output_mv_per_v(0.0, self.config)
+        self.offset_mv_v = np.mean(block_mv_v, axis=0) - expected / self.gain
+
+    def shunt_calibrate(self, shunted_mv_v: np.ndarray, unshunted_mv_v: np.ndarray):
+        """
+        Set per-channel gains and zero offsets from a measured shunt calibration step.
+
+        Args:
+            shunted_mv_v: Zero-strain block (or per-channel mean) with the shunt applied.
+            unshunted_mv_v: Zero-strain block (or per-channel mean) without the shunt.
+
+        Returns:
+            np.ndarray: Shunt-equivalent strain per channel, the value the
+            calibrated channels now read for the shunt step.
+        """
+        unshunted_mean = np.mean(np.atleast_2d(unshunted_mv_v), axis=0)
+        measured = np.mean(np.atleast_2d(shunted_mv_v), axis=0) - unshunted_mean
+        unshunted = replace(self.config, shunt_connected=np.zeros(self.n_channels, dtype=bool))
+        expected_zero = output_mv_per_v(0.0, unshunted)
+        expected = output_mv_per_v(0.0, replace(unshunted, shunt_connected=np.ones(self.n_channels, dtype=bool))) - expected_zero
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.gain = np.where(measured != 0, expected / measured, 1.0)
+        # The unshunted reading doubles as the zero balance for the new gains
+        self.offset_mv_v = unshunted_mean - expected_zero / self.gain
+        # What the unshunted conversion reads for the step; -Rg / (GF (Rg + Rs)) only for quarter bridges
+        return strain_from_output(expected_zero + expected, unshunted)
+
+    def invert(self, block_mv_v: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Strain (ratio) for a (samples, channels) block of bridge output.
+
+        Args:
+            block_mv_v: Bridge output in mV/V.
+            out: Optional (samples, channels) array to write into.
+
+        Returns:
+            np.ndarray: out, or a new array if out is None.
+        """
+        block = np.asarray(block_mv_v, dtype=float)
+        if out is None:
+            out = np.empty(block.shape)
+        corrected = (block - self.offset_mv_v) * self.gain
+        for idx, sub in self.groups:
+            out[:, idx] = strain_from_output(corrected[:, idx], sub)
+        return out
+
+
+class StrainRingBuffer:
+    """
+    Fixed-capacity (capacity, channels) strain history fed by mV/V blocks.
+
+    Blocks are inverted straight into the ring storage; readers get views of
+    the storage, split in two where the data wraps around.
+
+    Args:
+        capacity: Samples kept per channel.
+        inverter: StrainInverter for the incoming channels.
+    """
+
+    def __init__(self, capacity: int, inverter: StrainInverter):
+        self.capacity = capacity
+        self.inverter = inverter
+        self.data = np.zeros((capacity, inverter.n_channels))
+        self.total = 0  # Samples written since creation
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def push(self, block_mv_v: np.ndarray):
+        """Invert a (samples, channels) block into the buffer, overwriting the oldest samples."""
+        block = np.asarray(block_mv_v)
+        if len(block) > self.capacity:
+            self.total += len(block) - self.capacity
+            block = block[-self.capacity:]
+        start = self.total % self.capacity
+        first = min(len(block), self.capacity - start)
+        self.inverter.invert(block[:first], out=self.data[start:start + first])
+        if first < len(block):
+            self.inverter.invert(block[first:], out=self.data[:len(block) - first])
+        self.total += len(block)
+
+    def views(self, n: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The latest n samples (default: all stored) as (older, newer) views, oldest first.
+
+        The views alias the ring storage and are overwritten by later pushes.
+        """
+        n = len(self) if n is None else min(n, len(self))
+        end = self.total % self.capacity
+        start = end - n
+        if start >= 0:
+            return self.data[start:end], self.data[end:end]
+        return self.data[start:], self.data[:end]
+
+    def latest(self, n: int = None) -> np.ndarray:
+        """The latest n samples as one contiguous array (a view unless the data wraps)."""
+        older, newer = self.views(n)
+        return older if len(newer) == 0 else np.concatenate([older, newer])
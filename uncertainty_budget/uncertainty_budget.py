@@ -0,0 +1,180 @@
+"""
+Uncertainty Budgets for the Bridge and Tensile Tools
+
+Monte Carlo budgets (AS 1391 / ISO 6892-1 style) built on the Wheatstone
+bridge equations and the tensile specimen model:
+
+- bridge: tolerances on every arm resistance, gauge factor, shunt and lead
+  resistance propagated to the bridge output and to the strain an instrument
+  using the nominal values would indicate after zero balancing.
+- specimen: force and gauge diameter tolerances propagated through
+  TensileSpecimen.gauge_area and calculate_stress.
+
+Example:
+    python uncertainty_budget.py bridge --strain 1000 --gauge-tolerance 0.3 --draws 10000000 --workers 4
+    python uncertainty_budget.py specimen --force 50000 --diameter 12.5 --diameter-tolerance 0.01 --adaptive
+"""
+
+import argparse
+import os
+import sys
+from dataclasses import replace
+from functools import partial
+from typing import Dict
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolbox_core.bridge_model import (  # noqa: E402
+    BridgeConfig, arm_strains, resistances_from_arm_strains, bridge_ratio, excitation_factor, output_mv_per_v,
+    strain_from_output,
+    QUARTER_BRIDGE, HALF_BRIDGE, FULL_BRIDGE,
+)
+from toolbox_core.specimen_model import TensileSpecimen, GeometricProperties, MaterialProperties  # noqa: E402
+from toolbox_core.monte_carlo import Normal, Rectangular, monte_carlo, format_report  # noqa: E402
+
+
+def bridge_inputs(config: BridgeConfig, gauge_tolerance: float, completion_tolerance: float,
+                  gf_tolerance: float, shunt_tolerance: float, lead_tolerance: float) -> Dict[str, object]:
+    """
+    Rectangular input distributions of a bridge setup. Tolerances are relative
+    (fractions) except lead_tolerance, which is in Ω.
+    """
+    rb = config.base_resistance
+    active = config.active_gauges
+    gauge_arms = {"r1": True, "r2": active >= FULL_BRIDGE, "r3": active >= HALF_BRIDGE, "r4": active >= FULL_BRIDGE}
+    inputs = {
+        arm: Rectangular(rb, rb * (gauge_tolerance if is_gauge else completion_tolerance))
+        for arm, is_gauge in gauge_arms.items()
+    }
+    inputs["gauge_factor"] = Rectangular(config.gauge_factor, config.gauge_factor * gf_tolerance)
+    inputs["shunt_resistance"] = Rectangular(config.shunt_resistance, config.shunt_resistance * shunt_tolerance)
+    inputs["lead_resistance"] = Rectangular(config.lead_resistance, lead_tolerance)
+    return inputs
+
+
+def bridge_budget_model(samples: Dict[str, np.ndarray], strain: float, config: BridgeConfig):
+    """
+    Bridge output (mV/V) and indicated strain (µε) for sampled component
+    values, after zero balancing, and the offset (mV/V) that balancing removed.
+
+    Each draw is balanced as an instrument does before loading: its output at
+    zero strain, shunt open, is nulled to that of the nominal bridge. Arm
+    resistance tolerances then only enter through the bridge non-linearity.
+    """
+    gf = samples["gauge_factor"]
+    sampled = BridgeConfig(
+        base_resistance=config.base_resistance,
+        gauge_factor=gf,
+        active_gauges=config.active_gauges,
+        shunt_resistance=samples["shunt_resistance"],
+        shunt_connected=config.shunt_connected,
+        lead_resistance=np.maximum(samples["lead_resistance"], 0.0),
+        lead_wires=config.lead_wires,
+    )
+
+    def output(eps, setup: BridgeConfig):
+        # Arm resistance deviations enter as equivalent arm strains on the nominal resistance,
+        # so the lead wire and shunt handling of the bridge model applies unchanged
+        equivalent = [
+            (samples[arm] / config.base_resistance * (1.0 + gf * e) - 1.0) / gf
+            for arm, e in zip(("r1", "r2", "r3", "r4"), arm_strains(eps, config.active_gauges))
+        ]
+        arms = resistances_from_arm_strains(*equivalent, setup)
+        return bridge_ratio(*arms) * excitation_factor(*arms, setup) * 1000.0
+
+    offset = (output(0.0, replace(sampled, shunt_connected=False))
+              - output_mv_per_v(0.0, replace(config, shunt_connected=False)))
+    mv_v = output(strain, sampled) - offset
+    return {
+        "output_mv_v": mv_v,
+        "zero_offset_mv_v": offset,
+        "indicated_strain": strain_from_output(mv_v, config) * 1e6,
+    }
+
+
+def specimen_budget_model(samples: Dict[str, np.ndarray], material: MaterialProperties):
+    """Gauge area (mm²), engineering stress (MPa) and elastic strain (µε) for sampled force and diameter."""
+    specimen = TensileSpecimen(GeometricProperties(gauge_diameter=samples["diameter"]), material)
+    stress = specimen.calculate_stress(samples["force"])
+    return {
+        "gauge_area": specimen.gauge_area,
+        "stress": stress,
+        "elastic_strain": stress / samples["youngs_modulus"] * 1e6,
+    }
+
+
+BRIDGE_UNITS = {"output_mv_v": "mV/V", "zero_offset_mv_v": "mV/V", "indicated_strain": "µε"}
+SPECIMEN_UNITS = {"gauge_area": "mm²", "stress": "MPa", "elastic_strain": "µε"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo uncertainty budgets for bridge output and tensile results.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--draws", type=float, default=1e6, help="Monte Carlo draws (default: 1e6)")
+    common.add_argument("--chunk", type=int, default=1 << 18, help="Draws per chunk (default: 262144)")
+    common.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1)")
+    common.add_argument("--seed", type=int, default=None, help="Random seed for reproducible results")
+    common.add_argument("--coverage", type=float, default=0.95, help="Coverage probability (default: 0.95)")
+    common.add_argument("--adaptive", action="store_true",
+                        help="Add chunks until the results are stable to --digits significant digits")
+    common.add_argument("--max-draws", type=float, default=1e7, help="Adaptive draw limit (default: 1e7)")
+    common.add_argument("--digits", type=int, default=2, help="Significant digits for convergence (default: 2)")
+    sub = parser.add_subparsers(dest="budget", required=True)
+
+    bridge = sub.add_parser("bridge", parents=[common], help="Bridge output and indicated strain")
+    bridge.add_argument("--strain", type=float, default=1000.0, help="Applied strain in µε (default: 1000)")
+    bridge.add_argument("--bridge", choices=("quarter", "half", "full"), default="quarter")
+    bridge.add_argument("--resistance", type=float, default=120.0, help="Gauge resistance in Ω (default: 120)")
+    bridge.add_argument("--gauge-factor", type=float, default=2.0, help="Gauge factor (default: 2.0)")
+    bridge.add_argument("--shunt", type=float, default=20000.0, help="Shunt resistance in Ω (default: 20000)")
+    bridge.add_argument("--shunt-connected", action="store_true", help="Evaluate with the shunt connected")
+    bridge.add_argument("--lead-resistance", type=float, default=0.0, help="Lead resistance per wire in Ω")
+    bridge.add_argument("--lead-wires", type=int, choices=(2, 3), default=2)
+    bridge.add_argument("--gauge-tolerance", type=float, default=0.3, help="Gauge resistance tolerance in %% (default: 0.3)")
+    bridge.add_argument("--completion-tolerance", type=float, default=0.01,
+                        help="Completion resistor tolerance in %% (default: 0.01)")
+    bridge.add_argument("--gf-tolerance", type=float, default=1.0, help="Gauge factor tolerance in %% (default: 1.0)")
+    bridge.add_argument("--shunt-tolerance", type=float, default=0.1, help="Shunt tolerance in %% (default: 0.1)")
+    bridge.add_argument("--lead-tolerance", type=float, default=0.0, help="Lead resistance tolerance in Ω (default: 0)")
+
+    spec = sub.add_parser("specimen", parents=[common], help="Gauge area, stress and elastic strain")
+    spec.add_argument("--force", type=float, default=50000.0, help="Applied force in N (default: 50000)")
+    spec.add_argument("--force-uncertainty", type=float, default=0.5,
+                      help="Force standard uncertainty in %% of reading (default: 0.5)")
+    spec.add_argument("--diameter", type=float, default=12.5, help="Gauge diameter in mm (default: 12.5)")
+    spec.add_argument("--diameter-tolerance", type=float, default=0.01,
+                      help="Diameter measurement tolerance in mm (default: 0.01)")
+    spec.add_argument("--modulus", type=float, default=200e3, help="Young's modulus in MPa (default: 200000)")
+    spec.add_argument("--modulus-tolerance", type=float, default=2.0, help="Modulus tolerance in %% (default: 2)")
+    args = parser.parse_args()
+
+    if args.budget == "bridge":
+        config = BridgeConfig(
+            base_resistance=args.resistance, gauge_factor=args.gauge_factor,
+            active_gauges={"quarter": QUARTER_BRIDGE, "half": HALF_BRIDGE, "full": FULL_BRIDGE}[args.bridge],
+            shunt_resistance=args.shunt, shunt_connected=args.shunt_connected,
+            lead_resistance=args.lead_resistance, lead_wires=args.lead_wires,
+        )
+        inputs = bridge_inputs(config, args.gauge_tolerance / 100, args.completion_tolerance / 100,
+                               args.gf_tolerance / 100, args.shunt_tolerance / 100, args.lead_tolerance)
+        model = partial(bridge_budget_model, strain=args.strain * 1e-6, config=config)
+        units = BRIDGE_UNITS
+    else:
+        inputs = {
+            "force": Normal(args.force, args.force * args.force_uncertainty / 100),
+            "diameter": Rectangular(args.diameter, args.diameter_tolerance),
+            "youngs_modulus": Rectangular(args.modulus, args.modulus * args.modulus_tolerance / 100),
+        }
+        model = partial(specimen_budget_model, material=MaterialProperties())
+        units = SPECIMEN_UNITS
+
+    results = monte_carlo(model, inputs, draws=int(args.draws), chunk=args.chunk, workers=args.workers,
+                          seed=args.seed, coverage=args.coverage, adaptive=args.adaptive,
+                          max_draws=int(args.max_draws), significant_digits=args.digits)
+    print(format_report(results, units))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Live Multi-Channel Strain Monitor for the Wheatstone Bridge Tool
+
+Shows many bridge channels streamed from a local source: a recorded file
+replayed at its sample rate, or a TCP socket carrying interleaved
+little-endian float32 mV/V frames. A synthetic generator behind a local
+socket pair stands in for hardware.
+
+Decoding and inversion to strain run on a worker thread into a fixed-size
+ring buffer; the plot is refreshed by a timer at the display rate from a
+min/max-decimated window, drawn as a handful of NaN-separated curves, so the
+redraw cost stays flat as the channel count grows.
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QApplication
+from PyQt6.QtCore import QThread, QTimer
+import pyqtgraph as pg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolbox_core.bridge_model import BridgeConfig, output_mv_per_v  # noqa: E402
+from toolbox_core.strain_stream import StrainInverter, StrainRingBuffer  # noqa: E402
+
+# Channels share this many curve items (one per colour) however many there are
+TRACE_COLORS = ("#00c8ff", "#00ff7f", "#ffd700", "#ff6f61", "#c38bff", "#ff9f1c", "#7fdbda", "#f5f5f5")
+
+
+class FileReplaySource:
+    """
+    Replays a recorded (samples, channels) mV/V array at its sample rate.
+
+    Args:
+        path: .npy file, or raw interleaved little-endian float32 (any other extension).
+        channels: Channel count for raw files; ignored for .npy.
+        rate: Sample rate in Hz.
+        loop: Restart from the beginning at the end of the file.
+        block_seconds: Replay block length.
+    """
+
+    def __init__(self, path: str, channels: int, rate: float, loop: bool = True, block_seconds: float = 0.01):
+        if path.lower().endswith(".npy"):
+            data = np.load(path, mmap_mode='r')
+            self.data = data.reshape(len(data), -1)
+        else:
+            self.data = np.memmap(path, dtype='<f4', mode='r').reshape(-1, channels)
+        self.channels = self.data.shape[1]
+        self.rate = rate
+        self.loop = loop
+        self.block = max(int(rate * block_seconds), 1)
+        self.position = 0
+        self.sent = 0
+        self.start = None
+
+    def read_block(self):
+        """Next block of mV/V samples, paced to real time; None at the end of the file."""
+        if self.start is None:
+            self.start = time.perf_counter()
+        if self.position >= len(self.data):
+            if not self.loop:
+                return None
+            self.position = 0
+        wait = (self.sent + self.block) / self.rate - (time.perf_counter() - self.start)
+        if wait > 0:
+            time.sleep(wait)
+        block = np.asarray(self.data[self.position:self.position + self.block], dtype=float)
+        self.position += len(block)
+        self.sent += len(block)
+        return block
+
+    def close(self):
+        pass
+
+
+class SocketSource:
+    """
+    Reads interleaved little-endian float32 mV/V frames from a connected socket.
+
+    Partial frames are kept until the rest of the frame arrives.
+    """
+
+    def __init__(self, sock: socket.socket, channels: int, recv_bytes: int = 1 << 16):
+        self.sock = sock
+        self.sock.settimeout(0.5)
+        self.channels = channels
+        self.recv_bytes = recv_bytes
+        self.pending = b""
+        self.frame_bytes = 4 * channels
+
+    @classmethod
+    def connect(cls, host: str, port: int, channels: int):
+        return cls(socket.create_connection((host, port)), channels)
+
+    def read_block(self):
+        """Next block of whole frames (possibly empty on timeout); None once the peer closes."""
+        try:
+            chunk = self.sock.recv(self.recv_bytes)
+        except socket.timeout:
+            return np.empty((0, self.channels))
+        except OSError:
+            return None
+        if not chunk:
+            return None
+        data = self.pending + chunk
+        usable = len(data) - len(data) % self.frame_bytes
+        self.pending = data[usable:]
+        return np.frombuffer(data[:usable], dtype='<f4').reshape(-1, self.channels)
+
+    def close(self):
+        self.sock.close()
+
+
+def demo_source(channels: int, rate: float, config: BridgeConfig = BridgeConfig()) -> SocketSource:
+    """
+    Socket stand-in for a DAQ: a generator thread writes synthetic bridge output to
+    one end of a local socket pair and the returned SocketSource reads the other.
+    """
+    reader, writer = socket.socketpair()
+    block = max(int(rate * 0.01), 1)
+    freqs = np.linspace(0.5, 5.0, channels)
+    amps = np.linspace(200e-6, 2000e-6, channels)
+
+    def generate():
+        start = time.perf_counter()
+        sent = 0
+        try:
+            while True:
+                t = (sent + np.arange(block)[:, None]) / rate
+                strain = amps * np.sin(2 * np.pi * freqs * t) + 20e-6 * np.random.standard_normal((block, channels))
+                writer.sendall(output_mv_per_v(strain, config).astype('<f4').tobytes())
+                sent += block
+                wait = sent / rate - (time.perf_counter() - start)
+                if wait > 0:
+                    time.sleep(wait)
+        except OSError:
+            writer.close()
+
+    threading.Thread(target=generate, daemon=True).start()
+    return SocketSource(reader, channels)
+
+
+class StreamWorker(QThread):
+    """Pulls blocks from a source and inverts them into the shared ring buffer."""
+
+    def __init__(self, source, ring: StrainRingBuffer, lock: threading.Lock):
+        super().__init__()
+        self.source = source
+        self.ring = ring
+        self.lock = lock
+        self.running = True
+
+    def run(self):
+        while self.running:
+            block = self.source.read_block()
+            if block is None:
+                break
+            if len(block):
+                with self.lock:
+                    self.ring.push(block)
+        self.source.close()
+
+    def stop(self):
+        self.running = False
+        self.wait()
+
+
+def minmax_decimate(data: np.ndarray, points: int) -> np.ndarray:
+    """
+    Reduce (samples, channels) to at most 2*points rows of alternating bucket minima
+    and maxima, so peaks survive decimation. The result never shares memory with data.
+    """
+    step = len(data) // points
+    if step < 2:
+        return data.copy()
+    buckets = data[len(data) - step * points:].reshape(points, step, -1)
+    out = np.empty((2 * points, data.shape[1]))
+    out[0::2] = buckets.min(axis=1)
+    out[1::2] = buckets.max(axis=1)
+    return out
+
+
+class LiveMonitor(QMainWindow):
+    """
+    Stacked strain traces (µε) of every channel over a sliding time window.
+
+    Args:
+        source: FileReplaySource, SocketSource or anything with read_block/close.
+        config: Bridge setup; fields may be per-channel arrays.
+        rate: Sample rate in Hz.
+        window_seconds: Visible history.
+        display_points: Decimated points drawn per channel.
+        spacing: Vertical offset between channel traces (µε).
+    """
+
+    def __init__(self, source, config: BridgeConfig, rate: float, window_seconds: float = 2.0,
+                 display_points: int = 1000, spacing: float = 5000.0):
+        super().__init__()
+        self.channels = source.channels
+        self.setWindowTitle(f"Wheatstone Bridge Live Monitor ({self.channels} channels)")
+        self.resize(1280, 720)
+        self.rate = rate
+        self.window = max(int(window_seconds * rate), 2)
+        self.display_points = display_points
+        self.spacing = spacing
+
+        self.lock = threading.Lock()
+        self.ring = StrainRingBuffer(self.window, StrainInverter(config, self.channels))
+        self.last_total = 0
+        self.last_stats = (time.perf_counter(), 0)
+
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        layout = QVBoxLayout(main_widget)
+        self.plot_widget = pg.PlotWidget()
+        self.plot_widget.setBackground('k')
+        self.plot_widget.setLabel('bottom', "Time", units='s')
+        self.plot_widget.showGrid(x=True, y=False, alpha=0.3)
+        self.plot_widget.getAxis('left').setTicks([[(i * spacing, f"CH{i + 1}") for i in range(self.channels)]])
+        self.plot_widget.setXRange(-window_seconds, 0, padding=0)
+        self.plot_widget.setYRange(-spacing, self.channels * spacing, padding=0)
+        self.plot_widget.setMouseEnabled(x=False, y=True)
+        layout.addWidget(self.plot_widget)
+        self.curves = [
+            self.plot_widget.plot(pen=pg.mkPen(color, width=1), connect='finite', skipFiniteCheck=True)
+            for color in TRACE_COLORS[:min(self.channels, len(TRACE_COLORS))]
+        ]
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.worker = StreamWorker(source, self.ring, self.lock)
+        self.worker.start()
+
+        # Redraw at the display refresh rate, independent of the stream rate
+        screen = QApplication.primaryScreen()
+        refresh = screen.refreshRate() if screen is not None and screen.refreshRate() > 0 else 60.0
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.redraw)
+        self.timer.start(max(int(1000 / refresh), 1))
+
+    def redraw(self):
+        with self.lock:
+            total = self.ring.total
+            if total == self.last_total:
+                return
+            # Decimated inside the lock: the result is a copy, so the worker can keep writing the ring
+            window = minmax_decimate(self.ring.latest(), self.display_points)
+        self.last_total = total
+
+        n = len(window)
+        t = (np.arange(n) - (n - 1)) * (min(total, self.window) / self.rate / n)
+        traces = window * 1e6 + np.arange(self.channels) * self.spacing
+
+        # One NaN-separated curve per colour: channel c goes to curve c % len(curves)
+        n_curves = len(self.curves)
+        for k, curve in enumerate(self.curves):
+            block = traces[:, k::n_curves]
+            y = np.full((block.shape[1], n + 1), np.nan)
+            y[:, :n] = block.T
+            x = np.empty_like(y)
+            x[:, :n] = t
+            x[:, n] = np.nan
+            curve.setData(x.ravel(), y.ravel())
+
+        now = time.perf_counter()
+        then, count = self.last_stats
+        if now - then >= 1.0:
+            self.status_label.setText(
+                f"{self.channels} channels | {(total - count) / (now - then):,.0f} samples/s per channel | "
+                f"window {self.window / self.rate:.1f} s")
+            self.last_stats = (now, total)
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.worker.stop()
+        super().closeEvent(event)
+
+
+def open_source(spec: str, channels: int, rate: float, config: BridgeConfig):
+    """Source from a command line spec: 'demo', 'tcp://host:port' or a file path."""
+    if spec == "demo":
+        return demo_source(channels, rate, config)
+    if spec.startswith("tcp://"):
+        host, port = spec[len("tcp://"):].rsplit(":", 1)
+        return SocketSource.connect(host, int(port), channels)
+    return FileReplaySource(spec, channels, rate)
@@ -3,14 +3,17 @@
 
 a = Analysis(
     ['../wheatstone_bridge.py'],
-    pathex=[],
+    pathex=['../..'],
     binaries=[],
     datas=[],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=['Qt6Pdf', 'Qt6Network', 'Qt6Test', 'opengl32sw'],
+    # The one-file exe unpacks everything on every launch: leave out what the tool never imports
+    excludes=['Qt6Pdf', 'Qt6Network', 'Qt6Test', 'opengl32sw', 'tkinter',
+              'pyqtgraph.examples', 'pyqtgraph.opengl', 'pyqtgraph.jupyter', 'pyqtgraph.flowchart',
+              'pyqtgraph.console', 'pyqtgraph.dockarea'],
     noarchive=False,
     optimize=0,
 )
@@ -0,0 +1,275 @@
+"""
+Shunt Calibration Batch Verifier for the Wheatstone Bridge Tool
+
+Finds shunt calibration steps in recorded multi-channel bridge output and
+checks each channel's measured step against the bridge model.
+
+Recordings (samples, channels) in mV/V are reduced to exact block means while
+streaming from a memory map, so hour-long files need little memory. Steps are
+detected on the block means with a vectorized edge detector: the difference
+between the mean of the following and the preceding window, thresholded at
+half the expected step. Each shunt-on edge paired with the next shunt-off edge
+is one event; its step is the plateau level minus the mean of the baselines
+before and after, which cancels slow drift.
+
+Example:
+    python shunt_verifier.py recording.f32 --channels 32 --rate 10000 --shunt 100000 \\
+        --channel-config channels.csv --tolerance 0.5 -o report.csv
+"""
+
+import argparse
+import os
+import sys
+from dataclasses import dataclass, fields, replace
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolbox_core.bridge_model import (  # noqa: E402
+    BridgeConfig, output_mv_per_v, shunt_equivalent_strain, strain_from_output, QUARTER_BRIDGE,
+)
+from toolbox_core.strain_stream import channel_config  # noqa: E402
+
+
+REPORT_COLUMNS = (
+    "channel", "events", "measured_step_mv_v", "expected_step_mv_v",
+    "measured_strain", "expected_strain", "equivalent_strain", "error_percent", "passed",
+)
+
+
+@dataclass
+class ShuntEvent:
+    """One detected shunt calibration, in block indices."""
+    channel: int
+    on: int
+    off: int
+    step_mv_v: float
+    step_strain: float
+
+
+def load_recording(path: str, channels: int = None) -> np.ndarray:
+    """Memory-map a .npy recording or raw interleaved little-endian float32 (samples, channels) mV/V."""
+    if path.lower().endswith(".npy"):
+        data = np.load(path, mmap_mode='r')
+        return data.reshape(len(data), -1)
+    if not channels:
+        raise ValueError("Raw recordings need the channel count")
+    return np.memmap(path, dtype='<f4', mode='r').reshape(-1, channels)
+
+
+def block_means(data: np.ndarray, block: int, chunk_blocks: int = 16384) -> np.ndarray:
+    """Mean of every whole block of samples per channel, read chunk by chunk."""
+    n_blocks = len(data) // block
+    means = np.empty((n_blocks, data.shape[1]))
+    for start in range(0, n_blocks, chunk_blocks):
+        stop = min(start + chunk_blocks, n_blocks)
+        chunk = np.asarray(data[start * block:stop * block], dtype=np.float64)
+        means[start:stop] = chunk.reshape(stop - start, block, -1).mean(axis=1)
+    return means
+
+
+def edge_strength(means: np.ndarray, window: int) -> np.ndarray:
+    """
+    Mean of the next window minus mean of the previous window at every block boundary.
+
+    Returns:
+        np.ndarray: Same shape as means, zero within one window of either end.
+    """
+    n = len(means)
+    cumulative = np.zeros((n + 1, means.shape[1]))
+    np.cumsum(means, axis=0, out=cumulative[1:])
+    strength = np.zeros_like(means)
+    if n >= 2 * window:
+        t = np.arange(window, n - window + 1)
+        after = cumulative[t + window] - cumulative[t]
+        before = cumulative[t] - cumulative[t - window]
+        strength[window:n - window + 1] = (after - before) / window
+    return strength
+
+
+def find_edges(strength: np.ndarray, threshold: float):
+    """
+    Peak of every run where |strength| exceeds the threshold.
+
+    Returns:
+        tuple: (indices, signs) of the detected edges in time order.
+    """
+    above = np.abs(strength) > threshold
+    if not above.any():
+        return np.array([], dtype=int), np.array([], dtype=int)
+    flips = np.flatnonzero(np.diff(above.astype(np.int8)))
+    starts = np.concatenate([[0] if above[0] else [], flips[~above[flips]] + 1]).astype(int)
+    ends = np.concatenate([flips[above[flips]] + 1, [len(above)] if above[-1] else []]).astype(int)
+    magnitude = np.abs(strength)
+    peaks = np.array([s + int(np.argmax(magnitude[s:e])) for s, e in zip(starts, ends)], dtype=int)
+    return peaks, np.sign(strength[peaks]).astype(int)
+
+
+def detect_events(means: np.ndarray, expected_step: np.ndarray, window: int, settle: int,
+                  config: BridgeConfig) -> List[ShuntEvent]:
+    """
+    Shunt events of every channel from block means.
+
+    Args:
+        means: (blocks, channels) block means in mV/V.
+        expected_step: Expected shunt step per channel (mV/V, signed).
+        window: Edge detector window (blocks).
+        settle: Blocks skipped either side of an edge when averaging levels.
+        config: Per-channel bridge setup without the shunt, for conversion to strain.
+    """
+    off_config = replace(config, shunt_connected=np.zeros(means.shape[1], dtype=bool))
+    strength = edge_strength(means, window)
+    events = []
+    for ch in range(means.shape[1]):
+        x = means[:, ch]
+        edges, signs = find_edges(strength[:, ch], abs(expected_step[ch]) / 2)
+        on_sign = int(np.sign(expected_step[ch]))
+        cfg = replace(off_config, **{f.name: getattr(off_config, f.name)[ch] for f in fields(BridgeConfig)})
+        for i in range(len(edges) - 1):
+            if signs[i] != on_sign or signs[i + 1] != -on_sign:
+                continue
+            on, off = edges[i], edges[i + 1]
+            plateau = x[on + settle:off - settle]
+            if len(plateau) == 0:
+                continue
+            # Baselines as long as the plateau, stopping at neighbouring edges
+            prev_edge = edges[i - 1] + settle if i > 0 else 0
+            next_edge = edges[i + 2] - settle if i + 2 < len(edges) else len(x)
+            before = x[max(prev_edge, on - settle - len(plateau)):max(on - settle, 0)]
+            after = x[off + settle:min(next_edge, off + settle + len(plateau))]
+            if len(before) == 0 and len(after) == 0:
+                continue
+            baseline = np.mean([np.mean(b) for b in (before, after) if len(b)])
+            level = float(np.mean(plateau))
+            step_strain = float(strain_from_output(level, cfg) - strain_from_output(baseline, cfg))
+            events.append(ShuntEvent(ch, int(on), int(off), level - baseline, step_strain))
+    return events
+
+
+def verify_shunt_calibration(data: np.ndarray, rate: float, config: BridgeConfig, tolerance: float = 0.5,
+                             block_seconds: float = 0.001, window_seconds: float = 0.02,
+                             settle_seconds: float = 0.05):
+    """
+    Detect shunt steps in a recording and check them against the bridge model.
+
+    Args:
+        data: (samples, channels) bridge output in mV/V, e.g. from load_recording.
+        rate: Sample rate (Hz).
+        config: Bridge setup with the shunt resistance; fields may be per-channel arrays.
+        tolerance: Allowed deviation of the measured strain step from the model (%).
+        block_seconds: Block length of the mean reduction.
+        window_seconds: Edge detector window.
+        settle_seconds: Time excluded after each edge before averaging levels.
+
+    Returns:
+        tuple: (report, events) with report columns keyed by REPORT_COLUMNS, one
+        row per channel, strains as ratios. Channels with no event fail.
+    """
+    n_channels = data.shape[1]
+    cfg = channel_config(config, n_channels)
+    off = replace(cfg, shunt_connected=np.zeros(n_channels, dtype=bool))
+    on = replace(cfg, shunt_connected=np.ones(n_channels, dtype=bool))
+    zero_off = output_mv_per_v(0.0, off)
+    expected_step = output_mv_per_v(0.0, on) - zero_off
+    # The reading an instrument converting without the shunt should show for it
+    expected_strain = strain_from_output(zero_off + expected_step, off)
+
+    block = max(int(round(rate * block_seconds)), 1)
+    block_rate = rate / block
+    window = max(int(round(window_seconds * block_rate)), 1)
+    settle = max(int(round(settle_seconds * block_rate)), window)
+    means = block_means(data, block)
+    events = detect_events(means, expected_step, window, settle, cfg)
+
+    counts = np.zeros(n_channels, dtype=int)
+    step_mv = np.zeros(n_channels)
+    step_strain = np.zeros(n_channels)
+    for e in events:
+        counts[e.channel] += 1
+        step_mv[e.channel] += e.step_mv_v
+        step_strain[e.channel] += e.step_strain
+    with np.errstate(divide='ignore', invalid='ignore'):
+        step_mv = np.where(counts > 0, step_mv / counts, np.nan)
+        step_strain = np.where(counts > 0, step_strain / counts, np.nan)
+        error = (step_strain - expected_strain) / np.abs(expected_strain) * 100.0
+
+    report = {
+        "channel": np.arange(1, n_channels + 1),
+        "events": counts,
+        "measured_step_mv_v": step_mv,
+        "expected_step_mv_v": expected_step,
+        "measured_strain": step_strain,
+        "expected_strain": expected_strain,
+        "equivalent_strain": np.broadcast_to(shunt_equivalent_strain(cfg), (n_channels,)),
+        "error_percent": error,
+        "passed": (counts > 0) & (np.abs(error) <= tolerance),
+    }
+    return report, events
+
+
+def load_channel_config(path: str, defaults: BridgeConfig, n_channels: int) -> BridgeConfig:
+    """
+    Per-channel bridge setup from a CSV with a header naming BridgeConfig fields
+    (e.g. base_resistance,gauge_factor,shunt_resistance), one row per channel.
+    Missing columns take the defaults.
+    """
+    table = np.genfromtxt(path, delimiter=",", names=True)
+    table = np.atleast_1d(table)
+    if len(table) != n_channels:
+        raise ValueError(f"{path} has {len(table)} rows for {n_channels} channels")
+    config = channel_config(defaults, n_channels)
+    return replace(config, **{name: table[name] for name in table.dtype.names if hasattr(config, name)})
+
+
+def format_report(report: Dict[str, np.ndarray]) -> str:
+    lines = [f"{'Ch':>3} {'Events':>6} {'Measured µε':>12} {'Expected µε':>12} {'-Rg/GF(Rg+Rs) µε':>17} {'Error %':>8}  Result"]
+    for i in range(len(report["channel"])):
+        lines.append(
+            f"{report['channel'][i]:>3} {report['events'][i]:>6} {report['measured_strain'][i] * 1e6:>12.2f} "
+            f"{report['expected_strain'][i] * 1e6:>12.2f} {report['equivalent_strain'][i] * 1e6:>17.2f} "
+            f"{report['error_percent'][i]:>8.3f}  {'PASS' if report['passed'][i] else 'FAIL'}")
+    passed = int(np.count_nonzero(report["passed"]))
+    lines.append(f"{passed}/{len(report['channel'])} channels passed")
+    return "\n".join(lines)
+
+
+def write_csv(report: Dict[str, np.ndarray], path: str) -> None:
+    """Write the per-channel report as CSV; strains as ratios, NaN where no event was found."""
+    data = np.column_stack([np.asarray(report[name], dtype=float) for name in REPORT_COLUMNS])
+    fmt = ["%d", "%d"] + ["%.6g"] * 6 + ["%d"]
+    np.savetxt(path, data, fmt=fmt, delimiter=",", header=",".join(REPORT_COLUMNS), comments="")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify shunt calibration steps in a multi-channel bridge recording.")
+    parser.add_argument("recording", help=".npy file or raw interleaved little-endian float32 mV/V samples")
+    parser.add_argument("--channels", type=int, help="Channel count (raw recordings)")
+    parser.add_argument("--rate", type=float, required=True, help="Sample rate in Hz")
+    parser.add_argument("--resistance", type=float, default=120.0, help="Gauge resistance in Ω (default: 120)")
+    parser.add_argument("--gauge-factor", type=float, default=2.0, help="Gauge factor (default: 2.0)")
+    parser.add_argument("--shunt", type=float, default=20000.0, help="Shunt resistance in Ω (default: 20000)")
+    parser.add_argument("--channel-config", metavar="CSV",
+                        help="Per-channel setup, one row per channel with BridgeConfig field names as header")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed step error in %% (default: 0.5)")
+    parser.add_argument("--window", type=float, default=0.02, help="Edge detector window in s (default: 0.02)")
+    parser.add_argument("--settle", type=float, default=0.05, help="Settling time excluded after edges in s (default: 0.05)")
+    parser.add_argument("-o", "--output", help="Write the report as CSV")
+    args = parser.parse_args()
+
+    data = load_recording(args.recording, args.channels)
+    config = BridgeConfig(base_resistance=args.resistance, gauge_factor=args.gauge_factor,
+                          active_gauges=QUARTER_BRIDGE, shunt_resistance=args.shunt)
+    if args.channel_config:
+        config = load_channel_config(args.channel_config, config, data.shape[1])
+
+    report, events = verify_shunt_calibration(data, args.rate, config, tolerance=args.tolerance,
+                                              window_seconds=args.window, settle_seconds=args.settle)
+    print(format_report(report))
+    if args.output:
+        write_csv(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,39 @@
 import sys
 import math
-from PyQt6.QtWidgets import (
-    QApplication,
-    QMainWindow,
-    QWidget,
-    QVBoxLayout,
-    QHBoxLayout,
-    QSlider,
-    QLabel,
-    QLineEdit,
-    QGridLayout,
-    QPushButton,
-    QRadioButton,
-    QButtonGroup,
-    QGroupBox,
-)
-from PyQt6.QtCore import Qt, QRectF
-from PyQt6.QtGui import QColor, QPainter, QPen, QBrush, QFont
-
+import argparse
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolbox_core.hotpath import HotPathProfiler  # noqa: E402
+from toolbox_core.startup import StartupProfiler  # noqa: E402
+
+STARTUP = StartupProfiler("wheatstone_bridge")
+HOTPATH = HotPathProfiler("wheatstone_bridge")
+
+with STARTUP.phase("import PyQt6"):
+    from PyQt6.QtWidgets import (
+        QApplication,
+        QMainWindow,
+        QWidget,
+        QVBoxLayout,
+        QHBoxLayout,
+        QSlider,
+        QLabel,
+        QLineEdit,
+        QGridLayout,
+        QPushButton,
+        QRadioButton,
+        QButtonGroup,
+        QGroupBox,
+        QStyle,
+        QStyleOptionSlider,
+    )
+    from PyQt6.QtCore import Qt, QRectF, QSize
+    from PyQt6.QtGui import QColor, QPainter, QPen, QBrush, QFont, QPixmap, QPainterPath, QLinearGradient
+
+with STARTUP.phase("import toolbox_core + NumPy"):
+    from toolbox_core.bridge_model import BridgeConfig, bridge_response, QUARTER_BRIDGE, HALF_BRIDGE, FULL_BRIDGE
 
 class WheatstoneBridgeApp(QMainWindow):
     def __init__(self):
@@ -38,8 +54,11 @@ class WheatstoneBridgeApp(QMainWindow):
         self.gauge_length = 80.0
         self.total_strain_ratio = 0.0 # Ratio (-0.1 to 0.1)
 
+        # Bridge setup read from the input widgets; only rebuilt when an input changes
+        self.bridge_config = BridgeConfig()
+
         self.init_ui()
-        self.update_calculations()
+        self.update_config()
 
     def init_ui(self):
         main_widget = QWidget()
@@ -70,11 +89,14 @@ class WheatstoneBridgeApp(QMainWindow):
         self.gauge_1_rb = QRadioButton("1 Active Gauge (R1)")
         self.gauge_1_rb.setChecked(True)
         self.gauge_2_rb = QRadioButton("2 Active Gauges (R1, R3)")
+        self.gauge_4_rb = QRadioButton("4 Active Gauges (Full Bridge)")
         self.gauge_group_btns = QButtonGroup()
         self.gauge_group_btns.addButton(self.gauge_1_rb)
         self.gauge_group_btns.addButton(self.gauge_2_rb)
+        self.gauge_group_btns.addButton(self.gauge_4_rb)
         gauges_layout.addWidget(self.gauge_1_rb)
         gauges_layout.addWidget(self.gauge_2_rb)
+        gauges_layout.addWidget(self.gauge_4_rb)
         gauges_group.setLayout(gauges_layout)
         left_panel.addWidget(gauges_group)
 
@@ -96,6 +118,17 @@ class WheatstoneBridgeApp(QMainWindow):
         gf_layout.addWidget(QLabel("Gauge Factor:"), 0, 0)
         self.gf_input = QLineEdit("2.0")
         gf_layout.addWidget(self.gf_input, 0, 1)
+        gf_layout.addWidget(QLabel("Lead Resistance (Ω/wire):"), 1, 0)
+        self.lead_input = QLineEdit("0.0")
+        gf_layout.addWidget(self.lead_input, 1, 1)
+        self.lead_3wire_rb = QRadioButton("3-Wire Leads")
+        self.lead_2wire_rb = QRadioButton("2-Wire Leads")
+        self.lead_2wire_rb.setChecked(True)
+        self.lead_group_btns = QButtonGroup()
+        self.lead_group_btns.addButton(self.lead_2wire_rb)
+        self.lead_group_btns.addButton(self.lead_3wire_rb)
+        gf_layout.addWidget(self.lead_2wire_rb, 2, 0)
+        gf_layout.addWidget(self.lead_3wire_rb, 2, 1)
         gf_group.setLayout(gf_layout)
         left_panel.addWidget(gf_group)
         
@@ -113,7 +146,7 @@ class WheatstoneBridgeApp(QMainWindow):
         self.balance_label = QLabel("Bridge Balance: 0.00 %")
         self.balance_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         slider_layout.addWidget(self.balance_label)
-        self.balance_slider = QSlider(Qt.Orientation.Horizontal)
+        self.balance_slider = BalanceSlider(self)
         # Range for -10.00% to +10.00% strain
         self.balance_slider.setRange(-1000, 1000) 
         self.balance_slider.setValue(0)
@@ -144,11 +177,13 @@ class WheatstoneBridgeApp(QMainWindow):
         right_panel.addStretch()
 
         # Connections
-        self.res_group_btns.buttonClicked.connect(self.update_calculations)
-        self.gauge_group_btns.buttonClicked.connect(self.update_calculations)
-        self.shunt_input.textChanged.connect(self.update_calculations)
+        self.res_group_btns.buttonClicked.connect(self.update_config)
+        self.gauge_group_btns.buttonClicked.connect(self.update_config)
+        self.shunt_input.textChanged.connect(self.update_config)
         self.shunt_btn.clicked.connect(self.toggle_shunt)
-        self.gf_input.textChanged.connect(self.update_calculations)
+        self.gf_input.textChanged.connect(self.update_config)
+        self.lead_input.textChanged.connect(self.update_config)
+        self.lead_group_btns.buttonClicked.connect(self.update_config)
         self.balance_slider.valueChanged.connect(self.update_slider)
         self.spec_width_input.textChanged.connect(self.update_specimen)
         self.spec_height_input.textChanged.connect(self.update_specimen)
@@ -162,99 +197,55 @@ class WheatstoneBridgeApp(QMainWindow):
         self.balance_slider.setValue(0)
         self.strain_percent = 0.0
             
-        self.update_calculations()
+        self.update_config()
 
-    def update_calculations(self):
+    def update_config(self):
+        """Reads the input widgets into the bridge model configuration."""
         try:
             self.base_resistance = 120.0 if self.res_120_rb.isChecked() else 350.0
             self.shunt_value = float(self.shunt_input.text() or 20000)
             self.gauge_factor = float(self.gf_input.text() or 2.0)
-            self.active_gauges = 1 if self.gauge_1_rb.isChecked() else 2
-            
-            # The slider represents strain in percent (%)
-            strain = self.strain_percent / 100.0  # e.g., 0.01 for 1%
-            
-            # Calculate actual resistances
-            # R1 is always active
-            self.r1 = self.base_resistance * (1.0 + self.gauge_factor * strain)
-            if self.is_shunt_connected:
-                self.r1 = (self.r1 * self.shunt_value) / (self.r1 + self.shunt_value)
-            
-            self.r2 = self.base_resistance
-            
-            if self.active_gauges == 2:
-                # R3 is the second active gauge (half bridge)
-                # As R1 and R3 are in opposite arms, they add up.
-                self.r3 = self.base_resistance * (1.0 + self.gauge_factor * strain)
+            if self.gauge_1_rb.isChecked():
+                self.active_gauges = QUARTER_BRIDGE
+            elif self.gauge_2_rb.isChecked():
+                self.active_gauges = HALF_BRIDGE
             else:
-                self.r3 = self.base_resistance
-            
-            self.r4 = self.base_resistance
-
-            # Bridge Output: Vout/Vin = R3/(R2+R3) - R4/(R1+R4)
-            vout_vin = (self.r3 / (self.r2 + self.r3)) - (self.r4 / (self.r1 + self.r4))
-            # Convert to mV/V
-            mv_v = vout_vin * 1000.0
-            
-            # Calculate Total Displayed Strain
-            # If shunt is connected, it adds an equivalent strain: eps_eq = -Rg / (GF * (Rg + Rs))
-            # Display the sum of slider strain and shunt induced strain
-            total_strain_ratio = strain
-            if self.is_shunt_connected:
-                induced_strain = -self.base_resistance / (self.gauge_factor * (self.base_resistance + self.shunt_value))
-                total_strain_ratio += induced_strain
-            
-            total_strain_percent = total_strain_ratio * 100.0
-            self.total_strain_ratio = total_strain_ratio
-            
-            # Update labels or tooltips
-            self.balance_label.setText(f"Bridge Output: {mv_v:.4f} mV/V | Strain: {total_strain_percent:.4f}%")
-            
-            # Update slider color
-            self.update_slider_style(self.balance_slider.value())
-            
-            self.bridge_view.update()
-            self.specimen_view.update()
+                self.active_gauges = FULL_BRIDGE
+            lead_resistance = float(self.lead_input.text() or 0.0)
         except ValueError:
-            pass
+            return
+
+        self.bridge_config = BridgeConfig(
+            base_resistance=self.base_resistance,
+            gauge_factor=self.gauge_factor,
+            active_gauges=self.active_gauges,
+            shunt_resistance=self.shunt_value,
+            shunt_connected=self.is_shunt_connected,
+            lead_resistance=lead_resistance,
+            lead_wires=3 if self.lead_3wire_rb.isChecked() else 2,
+        )
+        self.update_calculations()
 
-    def update_slider_style(self, value):
-        # value > 0: section between center and handle is green.
-        # value < 0: section between center and handle is red.
-              
-        pct = (value + 1000) / 2000.0 * 100
-        center_pct = 50.0
+    @HOTPATH.handler
+    def update_calculations(self):
+        # The slider represents strain in percent (%)
+        strain = self.strain_percent / 100.0  # e.g., 0.01 for 1%
+
+        # Arm resistances, bridge output and shunt-induced strain from the bridge model.
+        # With the shunt connected the strain is the one its output indicates for this bridge type
+        with HOTPATH.span("bridge_response"):
+            result = bridge_response(strain, self.bridge_config)
+        self.r1, self.r2, self.r3, self.r4 = (float(r) for r in (result.r1, result.r2, result.r3, result.r4))
+        mv_v = float(result.mv_v)
+        self.total_strain_ratio = float(result.total_strain)
+        total_strain_percent = self.total_strain_ratio * 100.0
         
-        if value > 0:
-            # Green between 50% and pct%
-            gradient = f"qlineargradient(x1:0, y1:0, x2:1, y2:0, \
-                stop:0 gray, stop:0.499 gray, \
-                stop:0.5 green, stop:{pct/100.0} green, \
-                stop:{pct/100.0 + 0.001} gray, stop:1 gray)"
-        elif value < 0:
-            # Red between pct% and 50%
-            gradient = f"qlineargradient(x1:0, y1:0, x2:1, y2:0, \
-                stop:0 gray, stop:{pct/100.0} gray, \
-                stop:{pct/100.0 + 0.001} red, stop:0.5 red, \
-                stop:0.501 gray, stop:1 gray)"
-        else:
-            gradient = "gray"
-
-        self.balance_slider.setStyleSheet(f"""
-            QSlider::groove:horizontal {{
-                background: {gradient};
-                height: 8px;
-                border-radius: 4px;
-            }}
-            QSlider::handle:horizontal {{
-                background: lightgray;
-                border: 1px solid #5c5c5c;
-                width: 18px;
-                height: 18px;
-                margin: -5px 0;
-                border-radius: 9px;
-            }}
-        """)
+        # Update labels or tooltips
+        with HOTPATH.span("labels", "plot"):
+            self.balance_label.setText(f"Bridge Output: {mv_v:.4f} mV/V | Strain: {total_strain_percent:.4f}%")
+        
+        self.bridge_view.update()
+        self.specimen_view.update()
 
     def update_slider(self, value):
         # value is -1000 to 1000, representing -10.00% to 10.00%
@@ -271,116 +262,248 @@ class WheatstoneBridgeApp(QMainWindow):
         except ValueError:
             pass
 
+class BalanceSlider(QSlider):
+    """
+    Horizontal slider whose groove is filled between the centre and the handle:
+    green for positive values, red for negative ones.
+
+    The stylesheet is applied once for the groove/handle geometry; the fill is
+    painted directly and the plain groove comes from a pixmap cached per size,
+    so dragging only costs a repaint.
+    """
+    STYLE = """
+        QSlider::groove:horizontal {
+            background: gray;
+            height: 8px;
+            border-radius: 4px;
+        }
+        QSlider::handle:horizontal {
+            background: lightgray;
+            border: 1px solid #5c5c5c;
+            width: 18px;
+            height: 18px;
+            margin: -5px 0;
+            border-radius: 9px;
+        }
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(Qt.Orientation.Horizontal, parent)
+        self.setStyleSheet(self.STYLE)
+        self.groove_pixmap = QPixmap()
+
+    def groove_background(self, size: QSize) -> QPixmap:
+        if self.groove_pixmap.size() != size:
+            self.groove_pixmap = QPixmap(size)
+            self.groove_pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(self.groove_pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor("gray"))
+            painter.drawRoundedRect(QRectF(0, 0, size.width(), size.height()), 4, 4)
+            painter.end()
+        return self.groove_pixmap
+
+    def paintEvent(self, event):
+        opt = QStyleOptionSlider()
+        self.initStyleOption(opt)
+        style = self.style()
+        groove = style.subControlRect(QStyle.ComplexControl.CC_Slider, opt, QStyle.SubControl.SC_SliderGroove, self)
+        handle = style.subControlRect(QStyle.ComplexControl.CC_Slider, opt, QStyle.SubControl.SC_SliderHandle, self)
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.drawPixmap(groove.topLeft(), self.groove_background(groove.size()))
+
+        value = self.value()
+        if value != 0:
+            span = groove.width() - handle.width()
+            zero_x = groove.left() + handle.width() / 2 + QStyle.sliderPositionFromValue(
+                self.minimum(), self.maximum(), 0, span)
+            handle_x = handle.center().x()
+            clip = QPainterPath()
+            clip.addRoundedRect(QRectF(groove), 4, 4)
+            painter.setClipPath(clip)
+            painter.fillRect(QRectF(min(zero_x, handle_x), groove.top(), abs(handle_x - zero_x), groove.height()),
+                             QColor("green") if value > 0 else QColor("red"))
+            painter.setClipping(False)
+
+        painter.setPen(QPen(QColor("#5c5c5c"), 1))
+        painter.setBrush(QColor("lightgray"))
+        painter.drawEllipse(QRectF(handle).adjusted(0.5, 0.5, -0.5, -0.5))
+
+def layer_pixmap(widget: QWidget) -> QPixmap:
+    """Transparent pixmap covering the widget at the screen's device pixel ratio."""
+    dpr = widget.devicePixelRatioF()
+    pixmap = QPixmap(int(widget.width() * dpr), int(widget.height() * dpr))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    return pixmap
+
 class BridgeCanvas(QWidget):
+    """
+    Bridge circuit diagram. The wires, resistor bodies, shunt and terminal labels
+    are cached in a pixmap that is rebuilt only on resize or when the bridge type
+    or shunt state changes; each repaint draws the cache plus the arm values.
+    """
+    RESISTOR_SIZE = (65, 30)
+
     def __init__(self, parent):
         super().__init__(parent)
         self.app = parent
         self.setMinimumSize(400, 400)
+        self.static_layer = None
+        self.static_key = None
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
+    def resizeEvent(self, event):
+        self.static_layer = None
+        super().resizeEvent(event)
+
+    def resistor_frames(self):
+        """(label, centre x, centre y, text angle) of R1-R4 for the current size."""
         w, h = self.width(), self.height()
         cx, cy = w / 2, h / 2
         size = min(w, h) * 0.7
         half_size = size / 2
 
-        # Nodes
+        # Nodes: excitation at top/bottom, output at left/right.
+        # R1 is between Top and Left, R2 between Top and Right,
+        # R3 between Bottom and Right, R4 between Bottom and Left.
         p_top = (cx, cy - half_size)
         p_right = (cx + half_size, cy)
         p_bottom = (cx, cy + half_size)
         p_left = (cx - half_size, cy)
 
-        # Drawing Bridge Lines
-        pen = QPen(Qt.GlobalColor.white, 2)
-        painter.setPen(pen)
-        
-        # R1 (Top Left): p_top to p_left
-        # R2 (Top Right): p_top to p_right
-        # R3 (Bottom Right): p_bottom to p_right
-        # R4 (Bottom Left): p_bottom to p_left
-        
-        # Order: R1(TL), R2(TR), R3(BR), R4(BL)
-        # Nodes: Excitation at Top/Bottom. Output at Left/Right.
-        # R1 is between Top and Left.
-        # R2 is between Top and Right.
-        # R3 is between Bottom and Right.
-        # R4 is between Bottom and Left.
-        
-        def draw_resistor(p1, p2, label, value, active=False, shunt=False):
-            mid_x = (p1[0] + p2[0]) / 2
-            mid_y = (p1[1] + p2[1]) / 2
-            
-            # Rectangle for resistor
-            rw, rh = 65, 30
-            
-            # Calculate angle
+        frames = []
+        for label, p1, p2 in (("R1", p_top, p_left), ("R2", p_top, p_right),
+                              ("R3", p_bottom, p_right), ("R4", p_bottom, p_left)):
             angle = math.degrees(math.atan2(p2[1] - p1[1], p2[0] - p1[0]))
-            
-            # R1 is TL: p_top to p_left. p2(left) is p1(top) + (-half, half)
-            # R4 is BL: p_bottom to p_left. p2(left) is p1(bottom) + (-half, -half)
-            # Check the angle. If text is upside down, flip it.
-            text_angle = angle
-            if abs(text_angle) > 90:
-                text_angle += 180
+            # If text is upside down, flip it
+            if abs(angle) > 90:
+                angle += 180
+            frames.append((label, (p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2, angle))
+        return (p_top, p_right, p_bottom, p_left), frames
+
+    def build_static_layer(self):
+        (p_top, p_right, p_bottom, p_left), frames = self.resistor_frames()
+        active_gauges = self.app.active_gauges
+        active = {
+            "R1": True,
+            "R2": active_gauges == FULL_BRIDGE,
+            "R3": active_gauges >= HALF_BRIDGE,
+            "R4": active_gauges == FULL_BRIDGE,
+        }
+
+        pixmap = layer_pixmap(self)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
+        # Lines
+        painter.setPen(QPen(QColor(150, 150, 150), 2))
+        painter.drawLine(int(p_top[0]), int(p_top[1]), int(p_left[0]), int(p_left[1]))
+        painter.drawLine(int(p_top[0]), int(p_top[1]), int(p_right[0]), int(p_right[1]))
+        painter.drawLine(int(p_bottom[0]), int(p_bottom[1]), int(p_right[0]), int(p_right[1]))
+        painter.drawLine(int(p_bottom[0]), int(p_bottom[1]), int(p_left[0]), int(p_left[1]))
+
+        # Resistor bodies
+        rw, rh = self.RESISTOR_SIZE
+        for label, mid_x, mid_y, angle in frames:
             painter.save()
             painter.translate(mid_x, mid_y)
-            painter.rotate(text_angle)
-            
-            # Resistor body
+            painter.rotate(angle)
             rect = QRectF(-rw/2, -rh/2, rw, rh)
-            painter.setPen(QPen(QColor(0, 255, 0) if active else QColor(255, 255, 255), 2))
+            painter.setPen(QPen(QColor(0, 255, 0) if active[label] else QColor(255, 255, 255), 2))
             painter.setBrush(QBrush(QColor(50, 50, 50)))
             painter.drawRect(rect)
-            
-            # Label and Value
-            painter.setPen(QPen(QColor(255, 255, 255), 1))
-            painter.setFont(QFont("Segoe UI", 8))
-            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, f"{label}\n{value:.1f}Ω")
-            
-            if shunt:
+
+            if label == "R1" and self.app.is_shunt_connected:
                 # Draw a parallel line for shunt
                 painter.setPen(QPen(QColor(255, 255, 0), 1, Qt.PenStyle.DashLine))
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+                painter.setFont(QFont("Segoe UI", 8))
                 painter.drawArc(int(-rw), int(-rh*1.5), int(rw*2), int(rh*3), 0, 180*16)
                 painter.drawText(int(-rw/2), int(-rh*1.5), "Shunt")
-            
             painter.restore()
 
-        # Lines
-        painter.setPen(QPen(QColor(150, 150, 150), 2))
-        painter.drawLine(int(p_top[0]), int(p_top[1]), int(p_left[0]), int(p_left[1]))
-        painter.drawLine(int(p_top[0]), int(p_top[1]), int(p_right[0]), int(p_right[1]))
-        painter.drawLine(int(p_bottom[0]), int(p_bottom[1]), int(p_right[0]), int(p_right[1]))
-        painter.drawLine(int(p_bottom[0]), int(p_bottom[1]), int(p_left[0]), int(p_left[1]))
-
-        draw_resistor(p_top, p_left, "R1", self.app.r1, active=True, shunt=self.app.is_shunt_connected)
-        draw_resistor(p_top, p_right, "R2", self.app.r2)
-        draw_resistor(p_bottom, p_right, "R3", self.app.r3, active=(self.app.active_gauges == 2))
-        draw_resistor(p_bottom, p_left, "R4", self.app.r4)
-
         # Excitation/Output indicators
         painter.setPen(QPen(Qt.GlobalColor.red, 2))
         painter.drawText(int(p_top[0]-10), int(p_top[1]-10), "V+")
         painter.drawText(int(p_bottom[0]-10), int(p_bottom[1]+20), "V-")
-        
+
         painter.setPen(QPen(Qt.GlobalColor.cyan, 2))
         painter.drawText(int(p_left[0]-30), int(p_left[1]), "Out-")
         painter.drawText(int(p_right[0]+5), int(p_right[1]), "Out+")
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        key = (self.app.active_gauges, self.app.is_shunt_connected)
+        if self.static_layer is None or key != self.static_key:
+            self.static_layer = self.build_static_layer()
+            self.static_key = key
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.drawPixmap(0, 0, self.static_layer)
+
+        # Label and Value
+        _, frames = self.resistor_frames()
+        values = {"R1": self.app.r1, "R2": self.app.r2, "R3": self.app.r3, "R4": self.app.r4}
+        rw, rh = self.RESISTOR_SIZE
+        painter.setPen(QPen(QColor(255, 255, 255), 1))
+        painter.setFont(QFont("Segoe UI", 8))
+        for label, mid_x, mid_y, angle in frames:
+            painter.save()
+            painter.translate(mid_x, mid_y)
+            painter.rotate(angle)
+            painter.drawText(QRectF(-rw/2, -rh/2, rw, rh), Qt.AlignmentFlag.AlignCenter, f"{label}\n{values[label]:.1f}Ω")
+            painter.restore()
 
 class SpecimenCanvas(QWidget):
+    """
+    Strained specimen with gauge length markers. The cylindrical shading is cached
+    at the unstrained size and stretched onto the strained outline; it is rebuilt
+    only on resize or when the specimen dimensions change.
+    """
     def __init__(self, parent):
         super().__init__(parent)
         self.app = parent
         self.setMinimumSize(200, 400)
+        self.shading = None
+        self.shading_key = None
+
+    def resizeEvent(self, event):
+        self.shading = None
+        super().resizeEvent(event)
+
+    def build_shading(self, width, height):
+        """Cylindrical shading (linear gradient) for a width x height specimen, darker at the edges."""
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(max(int(width * dpr), 1), max(int(height * dpr), 1))
+        pixmap.setDevicePixelRatio(dpr)
+        gradient = QLinearGradient(0, 0, width, 0)
+        base_color = QColor(100, 100, 100)
+        edge_color = QColor(40, 40, 40)
+        highlight_color = QColor(200, 200, 220)
+
+        # Add subtle tint based on strain (optional logic could go here)
+        # Red/Green tint could be added to highlight_color
+
+        gradient.setColorAt(0.0, edge_color)
+        gradient.setColorAt(0.2, base_color)
+        gradient.setColorAt(0.5, highlight_color)
+        gradient.setColorAt(0.8, base_color)
+        gradient.setColorAt(1.0, edge_color)
+
+        painter = QPainter(pixmap)
+        painter.fillRect(QRectF(0, 0, width, height), QBrush(gradient))
+        painter.end()
+        return pixmap
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        from PyQt6.QtGui import QLinearGradient
-        
+
         w, h = self.width(), self.height()
         
         # Current dimensions based on strain
@@ -404,25 +527,17 @@ class SpecimenCanvas(QWidget):
         sgl = current_gl_val * scale
         
         rect = QRectF((w - sw) / 2, (h - sh) / 2, sw, sh)
-        
-        # Cylindrical Shading (Linear Gradient)
-        # Suggestion: Darker at edges, lighter highlight in the center
-        gradient = QLinearGradient(rect.left(), 0, rect.right(), 0)
-        base_color = QColor(100, 100, 100)
-        edge_color = QColor(40, 40, 40)
-        highlight_color = QColor(200, 200, 220)
-        
-        # Add subtle tint based on strain (optional logic could go here)
-        # Red/Green tint could be added to highlight_color
-        
-        gradient.setColorAt(0.0, edge_color)
-        gradient.setColorAt(0.2, base_color)
-        gradient.setColorAt(0.5, highlight_color)
-        gradient.setColorAt(0.8, base_color)
-        gradient.setColorAt(1.0, edge_color)
-        
+
+        # The gradient runs across the width only, so the unstrained shading stretches exactly
+        key = (self.app.specimen_width, self.app.specimen_height)
+        if self.shading is None or key != self.shading_key:
+            self.shading = self.build_shading(self.app.specimen_width * scale, self.app.specimen_height * scale)
+            self.shading_key = key
+        if sw > 0 and sh > 0:
+            painter.drawPixmap(rect, self.shading, QRectF(self.shading.rect()))
+
         painter.setPen(QPen(QColor(200, 200, 200), 1))
-        painter.setBrush(QBrush(gradient))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawRect(rect)
         
         # Draw Gauge Length (Blue lines) - they move with strain
@@ -450,11 +565,54 @@ class SpecimenCanvas(QWidget):
         painter.restore()
 
 def main():
-    app = QApplication(sys.argv)
-    # Apply a dark theme or consistent style if needed
-    ex = WheatstoneBridgeApp()
+    parser = argparse.ArgumentParser(description="Wheatstone Bridge Tool")
+    parser.add_argument("--monitor", metavar="SOURCE",
+                        help="Open the live multi-channel monitor instead: 'demo', 'tcp://host:port', "
+                             "a .npy file or a raw float32 file of interleaved mV/V samples")
+    parser.add_argument("--channels", type=int, default=8, help="Monitor channel count (default: 8)")
+    parser.add_argument("--rate", type=float, default=10000.0, help="Monitor sample rate in Hz (default: 10000)")
+    parser.add_argument("--bridge", choices=("quarter", "half", "full"), default="quarter",
+                        help="Monitor bridge type for every channel (default: quarter)")
+    parser.add_argument("--gauge-factor", type=float, default=2.0, help="Monitor gauge factor (default: 2.0)")
+    parser.add_argument("--resistance", type=float, default=120.0, help="Monitor gauge resistance in Ω (default: 120)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print an import-time and first-paint breakdown, then exit "
+                             "(exit status 1 if time-to-interactive is over budget)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Time compute, plot and paint per update and show a frame-time overlay (F12 toggles it)")
+    parser.add_argument("--trace", metavar="JSON",
+                        help="Instrument and write a Chrome trace-event file on exit")
+    args, qt_args = parser.parse_known_args()
+    if args.monitor and (args.instrument or args.trace):
+        parser.error("--instrument and --trace apply to the bridge window, not --monitor")
+
+    with STARTUP.phase("QApplication"):
+        app = QApplication(sys.argv[:1] + qt_args)
+    if args.monitor:
+        STARTUP.set_tool("live_monitor")
+        with STARTUP.phase("import live_monitor"):
+            from live_monitor import LiveMonitor, open_source
+        config = BridgeConfig(
+            base_resistance=args.resistance,
+            gauge_factor=args.gauge_factor,
+            active_gauges={"quarter": QUARTER_BRIDGE, "half": HALF_BRIDGE, "full": FULL_BRIDGE}[args.bridge],
+        )
+        with STARTUP.phase("build window"):
+            ex = LiveMonitor(open_source(args.monitor, args.channels, args.rate, config), config, args.rate)
+    else:
+        # Apply a dark theme or consistent style if needed
+        with STARTUP.phase("build window"):
+            ex = WheatstoneBridgeApp()
+    if args.profile_startup:
+        STARTUP.watch_qt(ex, app)
+    if args.instrument or args.trace:
+        HOTPATH.attach(ex, app, (ex.bridge_view, ex.specimen_view, ex.balance_slider), trace_path=args.trace)
     ex.show()
-    sys.exit(app.exec())
+    status = app.exec()
+    if args.profile_startup:
+        ex.close()
+        status = STARTUP.finish()
+    sys.exit(status)
 
 if __name__ == "__main__":
     main()